@@ -1,10 +1,81 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
-from models.io_models import ScriptInput, EvaluationResponse, ParameterResult, OverallResult
-from graph.graph_builder import build_graph
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, TypeVar
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
+from config.app_config import app_config
+from graph.graph_builder import EVALUATION_MODES
+from models.io_models import (
+    ScriptInput,
+    EvaluationResponse,
+    BatchEvaluationRequest,
+    RevisionEvaluationRequest,
+    RevisionEvaluationResponse,
+)
+from services import tracing
+from services.batch_runner import BatchItem, BatchRunner, BatchSummary
+from services.call_policy import deadline_scope
+from services.revision_service import evaluate_revision
+from services.evaluation_service import (
+    app_graph,
+    get_graph,
+    resolve_mode,
+    new_evaluation_id,
+    evaluation_config,
+    evaluation_input,
+    discard_checkpoint,
+    build_evaluation_response,
+    to_parameter_result,
+    script_fingerprint,
+    get_cached_evaluation,
+    store_evaluation,
+    is_cacheable,
+    etag_for,
+    etag_matches,
+)
+from services.metrics import evaluations_cancelled
 
 router = APIRouter()
-app_graph = build_graph()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# nginx's status for a request the client closed before the response (nobody reads it)
+CLIENT_CLOSED_REQUEST = 499
+
+MODE_DESCRIPTION = "Evaluation mode: " + ", ".join(f'"{mode}"' for mode in EVALUATION_MODES) + " (default: EVALUATION_MODE)"
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _until_disconnect(request: Request, endpoint: str, work: Awaitable[T]) -> T:
+    """
+    Await `work` in a task that is cancelled if the client disconnects
+    first, so an abandoned request stops its graph run and aborts the
+    provider requests in flight (the checkpoints stay, so a retry with the
+    same X-Evaluation-Id resumes). Raises ClientDisconnect in that case.
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait((task, watcher), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+    if task.done() and not task.cancelled():
+        return task.result()
+    await asyncio.gather(task, return_exceptions=True)
+    evaluations_cancelled.inc(endpoint=endpoint)
+    logger.info("Client disconnected; cancelled %s", endpoint)
+    raise ClientDisconnect()
+
 
 @router.get("/graph-view", response_class=HTMLResponse)
 async def graph_view():
@@ -12,50 +83,301 @@ async def graph_view():
     return f"...html with {mermaid}..."
 
 @router.post("/evaluate", response_model=EvaluationResponse)
-async def evaluate(script: ScriptInput):
+async def evaluate(
+    script: ScriptInput,
+    request: Request,
+    response: Response,
+    mode: Optional[str] = Query(default=None, description=MODE_DESCRIPTION),
+    if_none_match: Optional[str] = Header(default=None),
+    x_evaluation_id: Optional[str] = Header(default=None),
+):
+    """
+    Evaluate a script. A request that fails part-way can be retried with
+    the X-Evaluation-Id header of the failed response: the graph resumes
+    from its checkpoint instead of re-running the finished nodes.
+    """
     try:
-        state_in = {
-            "title": script.title,
-            "logline": script.logline,
-            "genre": script.genre,
-            "content": script.content,
-        }
-        state_out = await app_graph.ainvoke(state_in)
-
-        # Debug: print state_out keys and overall_average_score
-        print(f"[ROUTES] state_out keys: {list(state_out.keys())}")
-        print(f"[ROUTES] overall_average_score: {state_out.get('overall_average_score')}")
-        print(f"[ROUTES] overall_verdict: {state_out.get('overall_verdict')}")
-
-        # Map parameter_results to ParameterResult format for API response
-        param_results = state_out.get("parameter_results", {})
-        parameters_response = {}
-        
-        for param_id, param_eval in param_results.items():
-            # param_eval is a ParameterEvaluation Pydantic model
-            parameters_response[param_id] = ParameterResult(
-                name=param_eval.parameter_name,
-                score=param_eval.raw_score,
-                reasoning=param_eval.reasoning,
-                suggestions=param_eval.evidence,  # Using evidence as suggestions
+        mode = resolve_mode(mode)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    with tracing.span("POST /api/evaluate", kind="server", **{"evaluation.mode": mode}) as root:
+        # Identical (normalised) submissions share one fingerprint; only memoized
+        # evaluations carry it as an ETag, so a degraded result never gets pinned
+        fingerprint = script_fingerprint(script, mode)
+        etag = etag_for(fingerprint)
+        root.set_attribute("evaluation.fingerprint", fingerprint)
+
+        cached = await get_cached_evaluation(fingerprint)
+        if cached is not None:
+            if etag_matches(if_none_match, etag):
+                # RFC 7232 §3.2: a matching If-None-Match on a POST is 412, not 304
+                root.set_attribute("http.status_code", 412)
+                return Response(status_code=412, headers={"ETag": etag})
+            root.set_attribute("evaluation.cache", "hit")
+            response.headers["ETag"] = etag
+            response.headers["X-Evaluation-Cache"] = "hit"
+            return cached
+
+        root.set_attribute("evaluation.cache", "miss")
+        evaluation_id = x_evaluation_id or new_evaluation_id()
+        response.headers["X-Evaluation-Id"] = evaluation_id
+        try:
+            config = evaluation_config(script, evaluation_id, mode)
+            graph_input, deadline = await evaluation_input(script, config)
+            with deadline_scope(deadline):
+                state_out = await _until_disconnect(
+                    request, "evaluate", get_graph(mode).ainvoke(graph_input, config)
+                )
+            await discard_checkpoint(config)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "evaluate.completed",
+                    extra={
+                        "state_keys": list(state_out.keys()),
+                        "overall_average_score": state_out.get("overall_average_score"),
+                        "overall_verdict": state_out.get("overall_verdict"),
+                    },
+                )
+
+            result = build_evaluation_response(script, state_out)
+            if is_cacheable(state_out) and await store_evaluation(fingerprint, result):
+                response.headers["ETag"] = etag
+            response.headers["X-Evaluation-Cache"] = "miss"
+            return result
+        except ClientDisconnect:
+            root.set_attribute("http.status_code", CLIENT_CLOSED_REQUEST)
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e), headers={"X-Evaluation-Id": evaluation_id})
+
+
+@router.post("/evaluate/revision", response_model=RevisionEvaluationResponse)
+async def evaluate_revision_route(
+    revision: RevisionEvaluationRequest,
+    request: Request,
+    response: Response,
+    x_evaluation_id: Optional[str] = Header(default=None),
+):
+    """
+    Evaluate a new draft, re-running only the parameters its changes since
+    `previous_fingerprint` can affect and reusing the previous results for
+    the rest (services/revision_service.py). Send the returned
+    `fingerprint` as `previous_fingerprint` with the next draft.
+    """
+    evaluation_id = x_evaluation_id or new_evaluation_id()
+    response.headers["X-Evaluation-Id"] = evaluation_id
+    with tracing.span("POST /api/evaluate/revision", kind="server"):
+        try:
+            return await _until_disconnect(
+                request,
+                "evaluate_revision",
+                evaluate_revision(revision.script, revision.previous_fingerprint, evaluation_id),
             )
+        except ClientDisconnect:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e), headers={"X-Evaluation-Id": evaluation_id})
 
-        # Build overall result from aggregated state
-        overall_result = OverallResult(
-            score=state_out.get("overall_average_score", 0.0),
-            verdict_band=state_out.get("overall_verdict", "poor"),
-            verdict_text=state_out.get("verdict_text", "Evaluation complete"),
-            top_strengths=state_out.get("top_strengths", []),
-            development_areas=state_out.get("development_areas", []),
-            global_summary=state_out.get("summary", ""),  # summary node stores under "summary" key
-        )
 
-        return EvaluationResponse(
-            title=script.title,
-            logline=script.logline,
-            genre=script.genre,
-            parameters=parameters_response,
-            overall=overall_result,
-        )
+_END = object()
+
+
+async def _relay(source: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Iterate `source` in a task of its own and relay its items; the task is
+    cancelled when the consumer stops. StreamingResponse cancels a body it
+    can no longer send through an anyio cancel scope, and a graph astream
+    cancelled that way can leave the node in flight (e.g. the streamed
+    summary) running to completion; an explicit task.cancel() stops it.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for item in source:
+                queue.put_nowait(item)
+        except Exception as exc:
+            queue.put_nowait(exc)
+        queue.put_nowait(_END)
+
+    task = asyncio.ensure_future(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_evaluation(
+    script: ScriptInput, mode: str, evaluation_id: str, cached: Optional[EvaluationResponse] = None
+) -> AsyncIterator[str]:
+    """
+    Replay `cached`, or run the graph with astream and emit, in order of completion:
+    - `parameter`      one per parameter node, as soon as it writes its result
+    - `overall`        aggregator output
+    - `summary_token`  summary text as the LLM streams it
+    - `result`         the full EvaluationResponse
+    - `done`
+    """
+    fingerprint = script_fingerprint(script, mode)
+    if cached is not None:
+        for param_id, param_result in cached.parameters.items():
+            yield _sse("parameter", {"parameter_id": param_id, **param_result.model_dump()})
+        yield _sse("overall", {"score": cached.overall.score, "verdict": cached.overall.verdict_band})
+        yield _sse("result", cached.model_dump())
+        yield _sse("done", {"cached": True})
+        return
+
+    config = evaluation_config(script, evaluation_id, mode)
+    sent_parameters = set()
+    try:
+        graph_input, deadline = await evaluation_input(script, config)
+        final_state: Dict[str, Any] = graph_input or {}
+        with deadline_scope(deadline):
+            async for stream_mode, chunk in _relay(
+                get_graph(mode).astream(graph_input, config, stream_mode=["updates", "messages", "values"])
+            ):
+                if stream_mode == "values":
+                    final_state = chunk
+                elif stream_mode == "messages":
+                    message, metadata = chunk
+                    if metadata.get("langgraph_node") == "summary" and message.content:
+                        yield _sse("summary_token", {"text": message.content})
+                else:
+                    for node_name, delta in chunk.items():
+                        delta = delta or {}
+                        for param_id, param_eval in (delta.get("parameter_results") or {}).items():
+                            if param_id in sent_parameters:
+                                continue
+                            sent_parameters.add(param_id)
+                            yield _sse(
+                                "parameter",
+                                {"parameter_id": param_id, **to_parameter_result(param_eval).model_dump()},
+                            )
+                        if node_name == "aggregator":
+                            yield _sse(
+                                "overall",
+                                {
+                                    "score": delta.get("overall_average_score"),
+                                    "verdict": delta.get("overall_verdict"),
+                                },
+                            )
+
+        # A resumed run only streams the nodes it re-ran; send the parameters restored from the checkpoint too
+        for param_id, param_eval in (final_state.get("parameter_results") or {}).items():
+            if param_id not in sent_parameters:
+                yield _sse("parameter", {"parameter_id": param_id, **to_parameter_result(param_eval).model_dump()})
+
+        await discard_checkpoint(config)
+        result = build_evaluation_response(script, final_state)
+        if is_cacheable(final_state):
+            await store_evaluation(fingerprint, result)
+        yield _sse("result", result.model_dump())
+        yield _sse("done", {"cached": False})
+    except asyncio.CancelledError:
+        # StreamingResponse cancels the generator when the client goes away; the graph run goes with it
+        evaluations_cancelled.inc(endpoint="evaluate_stream")
+        logger.info("Client disconnected; cancelled evaluation stream %s", evaluation_id)
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        yield _sse("error", {"detail": str(e), "evaluation_id": evaluation_id})
+
+
+async def _sse_response(script: ScriptInput, mode: Optional[str], evaluation_id: Optional[str] = None) -> StreamingResponse:
+    try:
+        mode = resolve_mode(mode)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    evaluation_id = evaluation_id or new_evaluation_id()
+    fingerprint = script_fingerprint(script, mode)
+    cached = await get_cached_evaluation(fingerprint)
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+        "X-Evaluation-Id": evaluation_id,
+    }
+    if cached is not None:
+        # Headers go out before the run finishes: only a memoized result has a known ETag
+        headers["ETag"] = etag_for(fingerprint)
+    return StreamingResponse(
+        _stream_evaluation(script, mode, evaluation_id, cached),
+        media_type="text/event-stream",
+        headers=headers,
+    )
+
+
+@router.get("/evaluate/stream")
+async def evaluate_stream(
+    title: str = Query(...),
+    logline: str = Query(...),
+    genre: str = Query(...),
+    content: str = Query(...),
+    mode: Optional[str] = Query(default=None, description=MODE_DESCRIPTION),
+):
+    """
+    Server-Sent Events variant of /evaluate (EventSource-friendly GET).
+    """
+    script = ScriptInput(title=title, logline=logline, genre=genre, content=content)
+    return await _sse_response(script, mode)
+
+
+@router.post("/evaluate/stream")
+async def evaluate_stream_post(
+    script: ScriptInput,
+    mode: Optional[str] = Query(default=None, description=MODE_DESCRIPTION),
+    x_evaluation_id: Optional[str] = Header(default=None),
+):
+    """
+    Same stream as GET /evaluate/stream, for synopses too long for a query
+    string. Like POST /evaluate, resumes a failed run given its X-Evaluation-Id.
+    """
+    return await _sse_response(script, mode, x_evaluation_id)
+
+
+async def _stream_batch(runner: BatchRunner, items: List[BatchItem]) -> AsyncIterator[str]:
+    summary = BatchSummary()
+    try:
+        async for record in runner.run(items):
+            summary.add(record)
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    except asyncio.CancelledError:
+        # runner.run() cancels the items still in flight as it closes
+        evaluations_cancelled.inc(endpoint="evaluate_batch")
+        logger.info("Client disconnected; cancelled batch after %d of %d items", summary.total, len(items))
+        raise
+    yield json.dumps({"summary": summary.as_dict()}) + "\n"
+
+
+@router.post("/evaluate/batch")
+async def evaluate_batch(batch: BatchEvaluationRequest, mode: Optional[str] = Query(default=None, description=MODE_DESCRIPTION)):
+    """
+    Evaluate a slate of scripts. Streams NDJSON: one record per item as it
+    completes (see services/batch_runner.py; `line` is the 1-based position
+    in `items`), then a final {"summary": ...} line.
+    """
+    if len(batch.items) > app_config.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(batch.items)} items (max {app_config.batch_max_items})",
+        )
+    try:
+        concurrency = min(batch.concurrency or app_config.batch_concurrency, app_config.batch_concurrency)
+        runner = BatchRunner(mode=mode, concurrency=concurrency)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    items = [BatchItem(line=i, script=script) for i, script in enumerate(batch.items, start=1)]
+    return StreamingResponse(_stream_batch(runner, items), media_type="application/x-ndjson")
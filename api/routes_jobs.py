@@ -0,0 +1,49 @@
+# backend/api/routes_jobs.py
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from models.io_models import ScriptInput, JobSubmission, JobStatusResponse
+from services.evaluation_service import to_parameter_result
+from services.job_runner import get_job_runner, JobQueueFull
+
+router = APIRouter(prefix="/evaluations", tags=["evaluations"])
+
+
+@router.post("", status_code=202, response_model=JobSubmission)
+async def submit_evaluation(script: ScriptInput, request: Request, response: Response):
+    """
+    Queue an evaluation and return immediately with a job id.
+    """
+    try:
+        job_id = await get_job_runner().submit(script)
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+    status_url = request.app.url_path_for("get_evaluation", job_id=job_id)
+    response.headers["Location"] = status_url
+    return JobSubmission(job_id=job_id, status="queued", status_url=status_url)
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_evaluation(job_id: str):
+    """
+    Poll a job: status, parameter results finished so far, final result.
+    """
+    job = await asyncio.to_thread(get_job_runner().store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown evaluation job: {job_id}")
+
+    return JobStatusResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        parameter_results={
+            param_id: to_parameter_result(pe)
+            for param_id, pe in job["parameter_results"].items()
+        },
+        result=job["result"],
+        error=job["error"],
+    )
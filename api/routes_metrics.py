@@ -0,0 +1,16 @@
+# backend/api/routes_metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from services.metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Prometheus scrape endpoint: per-node and per-LLM-call histograms and counters.
+    """
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
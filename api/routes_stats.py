@@ -0,0 +1,52 @@
+# backend/api/routes_stats.py
+
+from fastapi import APIRouter
+
+from services.llm_service import get_llm_cache_stats, get_limiter_stats, get_call_policy_stats
+from services.cascade import cascade_stats
+from services.usage_recorder import usage_recorder
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/llm-cache")
+async def llm_cache_stats():
+    """
+    Hit/miss/eviction counters for the LLM response cache.
+    """
+    return get_llm_cache_stats()
+
+
+@router.get("/llm-limiter")
+async def llm_limiter_stats():
+    """
+    Per backend: concurrency window, 429/5xx counters and queue-wait percentiles.
+    """
+    return get_limiter_stats()
+
+
+@router.get("/llm-policy")
+async def llm_policy_stats():
+    """
+    Per backend: retry, timeout and hedged-request counters plus the latency quantiles behind the hedge.
+    """
+    return get_call_policy_stats()
+
+
+@router.get("/llm-cascade")
+async def llm_cascade_stats():
+    """
+    Per-tier latency / token cost and the escalation rate of the model cascade.
+    """
+    return cascade_stats.summary()
+
+
+@router.get("/llm-usage")
+async def llm_usage_stats(recent: int = 50):
+    """
+    Per-node token usage (incl. provider cached tokens) and the most recent calls.
+    """
+    return {
+        "by_node": usage_recorder.summary(),
+        "recent": usage_recorder.recent(recent),
+    }
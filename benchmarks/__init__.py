@@ -0,0 +1 @@
+"""Benchmarks package - offline performance comparisons (not part of the API)."""
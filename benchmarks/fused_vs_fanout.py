@@ -0,0 +1,142 @@
+# backend/benchmarks/fused_vs_fanout.py
+
+"""
+Compare the "fused" single-call topology against the 10-way "fanout" graph.
+
+Usage (from the backend root):
+    python -m benchmarks.fused_vs_fanout [scripts.jsonl] [--repeat N]
+
+Each JSONL line is a ScriptInput object (title, logline, genre, content).
+For every script and mode this reports wall latency, LLM call count and
+prompt/completion tokens, then per-parameter score agreement between the
+two modes. The LLM response cache is switched off so both modes really
+hit the provider.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from graph.graph_builder import build_graph, FANOUT_MODE, FUSED_MODE
+from models.io_models import ScriptInput
+from services.evaluation_service import build_initial_state, discard_checkpoint, evaluation_config, new_evaluation_id
+from services.llm_service import disable_response_cache
+
+
+SAMPLE_SCRIPT = ScriptInput(
+    title="The Last Ferry",
+    logline=(
+        "When the island's only ferry is cancelled for good, a burned-out "
+        "harbour master has one week to convince a dying town to leave together."
+    ),
+    genre="Drama",
+    content=(
+        "Maren, 52, runs the harbour office on a shrinking northern island. "
+        "The mainland council announces the ferry will stop in seven days. "
+        "Her estranged son returns to sell the family boathouse, while her "
+        "oldest friend refuses to abandon his wife's grave. Storms close in, "
+        "a child goes missing on the cliffs, and Maren must choose between "
+        "the town's past and its survival."
+    ),
+)
+
+
+class UsageCollector(AsyncCallbackHandler):
+    """Sums usage_metadata reported by every LLM call in a run."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    async def on_llm_end(self, response, **kwargs: Any) -> None:
+        self.calls += 1
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                self.input_tokens += usage.get("input_tokens", 0)
+                self.output_tokens += usage.get("output_tokens", 0)
+
+
+async def _run_once(graph, mode: str, script: ScriptInput) -> Dict[str, Any]:
+    collector = UsageCollector()
+    started = time.perf_counter()
+    config = {**evaluation_config(script, new_evaluation_id(), mode), "callbacks": [collector]}
+    state_out = await graph.ainvoke(build_initial_state(script), config=config)
+    elapsed = time.perf_counter() - started
+    await discard_checkpoint(config)
+    return {
+        "latency": elapsed,
+        "calls": collector.calls,
+        "input_tokens": collector.input_tokens,
+        "output_tokens": collector.output_tokens,
+        "scores": {pid: pe.raw_score for pid, pe in state_out["parameter_results"].items()},
+        "verdict": state_out.get("overall_verdict"),
+    }
+
+
+def _load_scripts(path: str | None) -> List[ScriptInput]:
+    if not path:
+        return [SAMPLE_SCRIPT]
+    with open(path, encoding="utf-8") as fh:
+        return [ScriptInput.model_validate_json(line) for line in fh if line.strip()]
+
+
+def _summarise(runs: List[Dict[str, Any]]) -> Dict[str, float]:
+    latencies = [r["latency"] for r in runs]
+    return {
+        "latency_mean_s": statistics.mean(latencies),
+        "latency_p50_s": statistics.median(latencies),
+        "latency_max_s": max(latencies),
+        "llm_calls": statistics.mean(r["calls"] for r in runs),
+        "input_tokens": statistics.mean(r["input_tokens"] for r in runs),
+        "output_tokens": statistics.mean(r["output_tokens"] for r in runs),
+    }
+
+
+async def main(path: str | None, repeat: int) -> None:
+    # Measure real provider calls, not cache hits
+    disable_response_cache()
+
+    graphs = {FANOUT_MODE: build_graph(FANOUT_MODE), FUSED_MODE: build_graph(FUSED_MODE)}
+    runs: Dict[str, List[Dict[str, Any]]] = {mode: [] for mode in graphs}
+    deltas: List[float] = []
+    verdict_matches = 0
+    pairs = 0
+
+    for script in _load_scripts(path):
+        for _ in range(repeat):
+            fanout = await _run_once(graphs[FANOUT_MODE], FANOUT_MODE, script)
+            fused = await _run_once(graphs[FUSED_MODE], FUSED_MODE, script)
+            runs[FANOUT_MODE].append(fanout)
+            runs[FUSED_MODE].append(fused)
+
+            pairs += 1
+            verdict_matches += fanout["verdict"] == fused["verdict"]
+            for pid, score in fanout["scores"].items():
+                if pid in fused["scores"]:
+                    deltas.append(abs(score - fused["scores"][pid]))
+
+    report = {
+        mode: _summarise(mode_runs) for mode, mode_runs in runs.items()
+    }
+    report["agreement"] = {
+        "mean_abs_score_delta": statistics.mean(deltas) if deltas else None,
+        "max_abs_score_delta": max(deltas) if deltas else None,
+        "verdict_agreement": verdict_matches / pairs if pairs else None,
+        "pairs": pairs,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scripts", nargs="?", help="JSONL file of ScriptInput records")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per script and mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.scripts, args.repeat))
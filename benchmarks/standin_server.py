@@ -0,0 +1,270 @@
+# backend/benchmarks/standin_server.py
+
+"""
+Stand-in OpenAI-compatible LLM server for load tests and local development.
+
+Usage (from the backend root):
+    python -m benchmarks.standin_server [--port 8001]
+
+then run the API with LLM_BACKEND=local (LOCAL_LLM_BASE_URL defaults to
+http://127.0.0.1:8001/v1). Serves /v1/chat/completions (plain and
+streamed, with a usage chunk when stream_options.include_usage is set),
+/v1/models, and the batch API (/v1/files, /v1/batches) used by
+services/provider_batch.py. Answers are deterministic per prompt and shaped like what
+each node asks for: scene / story digests, the fused ten-parameter object,
+single-parameter JSON, or prose for the summary.
+
+Latency and failures are simulated from the environment:
+    STANDIN_LATENCY_MS      base latency per call          (default 200)
+    STANDIN_JITTER_MS       uniform extra latency           (default 100)
+    STANDIN_TOKENS_PER_S    completion streaming speed      (default 400, 0 = instant)
+    STANDIN_ERROR_RATE      share of calls failing 429/503  (default 0)
+    STANDIN_BATCH_DELAY_S   time a batch spends in_progress (default 5)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from services.fake_llm import canned_response
+
+LATENCY_MS = float(os.getenv("STANDIN_LATENCY_MS", "200"))
+JITTER_MS = float(os.getenv("STANDIN_JITTER_MS", "100"))
+TOKENS_PER_S = float(os.getenv("STANDIN_TOKENS_PER_S", "400"))
+ERROR_RATE = float(os.getenv("STANDIN_ERROR_RATE", "0"))
+BATCH_DELAY_S = float(os.getenv("STANDIN_BATCH_DELAY_S", "5"))
+
+app = FastAPI(title="LLM stand-in")
+
+# Batch API state (in memory): file id -> (metadata, content), batch id -> batch object
+_files: Dict[str, Any] = {}
+_batches: Dict[str, Dict[str, Any]] = {}
+_batch_tasks: set = set()  # keeps the background processing tasks referenced
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):  # content blocks (cache_control hints)
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        parts.append(str(content or ""))
+    return "\n".join(parts)
+
+
+def _usage(prompt: str, completion: str) -> Dict[str, int]:
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(completion) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _completion(body: Dict[str, Any], completion_id: str, created: int) -> Dict[str, Any]:
+    """Non-streamed chat.completion object answering `body`."""
+    prompt = _prompt_text(body.get("messages") or [])
+    text = canned_response(prompt)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": body.get("model", "local-model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+        "usage": _usage(prompt, text),
+    }
+
+
+def _simulated_failure() -> JSONResponse:
+    if random.random() < 0.5:
+        return JSONResponse(
+            {"error": {"message": "Rate limit exceeded (stand-in)", "type": "rate_limit"}},
+            status_code=429,
+            headers={"Retry-After": "1"},
+        )
+    return JSONResponse({"error": {"message": "Upstream unavailable (stand-in)"}}, status_code=503)
+
+
+@app.get("/v1/models")
+async def models():
+    return {"object": "list", "data": [{"id": "local-model", "object": "model", "owned_by": "standin"}]}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if ERROR_RATE > 0 and random.random() < ERROR_RATE:
+        return _simulated_failure()
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    completion = _completion(body, completion_id, created)
+    text = completion["choices"][0]["message"]["content"]
+    usage = completion["usage"]
+    model = completion["model"]
+
+    await asyncio.sleep((LATENCY_MS + random.uniform(0, JITTER_MS)) / 1000)
+    generation_s = usage["completion_tokens"] / TOKENS_PER_S if TOKENS_PER_S > 0 else 0.0
+
+    if not body.get("stream"):
+        await asyncio.sleep(generation_s)
+        return completion
+
+    include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+    def _chunk(choices: List[Dict[str, Any]], **extra: Any) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": choices,
+            **extra,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def events():
+        pieces = [text[i:i + 32] for i in range(0, len(text), 32)]
+        delay = generation_s / len(pieces) if pieces else 0.0
+        for i, piece in enumerate(pieces):
+            delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+            yield _chunk([{"index": 0, "delta": delta, "finish_reason": None}])
+            await asyncio.sleep(delay)
+        yield _chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if include_usage:
+            yield _chunk([], usage=usage)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+# ---- batch API ----
+
+def _store_file(filename: str, purpose: str, content: bytes) -> Dict[str, Any]:
+    meta = {
+        "id": f"file-{uuid.uuid4().hex[:24]}",
+        "object": "file",
+        "bytes": len(content),
+        "created_at": int(time.time()),
+        "filename": filename,
+        "purpose": purpose,
+        "status": "processed",
+    }
+    _files[meta["id"]] = (meta, content)
+    return meta
+
+
+@app.post("/v1/files")
+async def upload_file(request: Request):
+    # multipart/form-data parsed with the stdlib (no python-multipart dependency)
+    header = f"Content-Type: {request.headers.get('content-type', '')}\r\n\r\n".encode()
+    message = BytesParser(policy=HTTP).parsebytes(header + await request.body())
+    fields: Dict[str, Any] = {}
+    filename = "upload.jsonl"
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name == "file":
+            filename = part.get_filename() or filename
+        fields[name] = part.get_payload(decode=True)
+    if "file" not in fields:
+        raise HTTPException(status_code=400, detail="missing file")
+    purpose = (fields.get("purpose") or b"batch").decode()
+    return _store_file(filename, purpose, fields["file"])
+
+
+@app.get("/v1/files/{file_id}/content")
+async def file_content(file_id: str):
+    if file_id not in _files:
+        raise HTTPException(status_code=404, detail="file not found")
+    return Response(_files[file_id][1], media_type="application/jsonl")
+
+
+async def _process_batch(batch: Dict[str, Any], requests: List[Dict[str, Any]]) -> None:
+    batch.update(status="in_progress", in_progress_at=int(time.time()))
+    await asyncio.sleep(BATCH_DELAY_S)
+    outputs: List[str] = []
+    errors: List[str] = []
+    for request in requests:
+        request_id = f"batch_req_{uuid.uuid4().hex[:24]}"
+        if ERROR_RATE > 0 and random.random() < ERROR_RATE:
+            error = {"message": "Upstream unavailable (stand-in)", "type": "server_error"}
+            response = {"status_code": 500, "request_id": request_id, "body": {"error": error}}
+            errors.append(json.dumps({"id": request_id, "custom_id": request["custom_id"], "response": response}))
+            continue
+        completion = _completion(request.get("body") or {}, f"chatcmpl-{uuid.uuid4().hex[:24]}", int(time.time()))
+        response = {"status_code": 200, "request_id": request_id, "body": completion}
+        outputs.append(json.dumps({"id": request_id, "custom_id": request["custom_id"], "response": response, "error": None}))
+
+    if outputs:
+        batch["output_file_id"] = _store_file("output.jsonl", "batch_output", ("\n".join(outputs) + "\n").encode())["id"]
+    if errors:
+        batch["error_file_id"] = _store_file("errors.jsonl", "batch_output", ("\n".join(errors) + "\n").encode())["id"]
+    batch["request_counts"] = {"total": len(requests), "completed": len(outputs), "failed": len(errors)}
+    batch.update(status="completed", completed_at=int(time.time()))
+
+
+@app.post("/v1/batches")
+async def create_batch(request: Request):
+    body = await request.json()
+    input_file_id = body.get("input_file_id")
+    if input_file_id not in _files:
+        raise HTTPException(status_code=404, detail="input file not found")
+    try:
+        requests = [json.loads(line) for line in _files[input_file_id][1].decode().splitlines() if line.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="input file is not JSONL")
+
+    batch = {
+        "id": f"batch_{uuid.uuid4().hex[:24]}",
+        "object": "batch",
+        "endpoint": body.get("endpoint", "/v1/chat/completions"),
+        "input_file_id": input_file_id,
+        "completion_window": body.get("completion_window", "24h"),
+        "status": "validating",
+        "created_at": int(time.time()),
+        "output_file_id": None,
+        "error_file_id": None,
+        "request_counts": {"total": len(requests), "completed": 0, "failed": 0},
+        "metadata": body.get("metadata"),
+    }
+    _batches[batch["id"]] = batch
+    task = asyncio.create_task(_process_batch(batch, requests))
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_tasks.discard)
+    return batch
+
+
+@app.get("/v1/batches/{batch_id}")
+async def retrieve_batch(batch_id: str):
+    if batch_id not in _batches:
+        raise HTTPException(status_code=404, detail="batch not found")
+    return _batches[batch_id]
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# backend/benchmarks/throughput.py
+
+"""
+Offline throughput / latency benchmark of the orchestration layer.
+
+Usage (from the backend root):
+    python -m benchmarks.throughput [--target graph|api|both] [--mode fanout]
+        [--concurrency 1,4,16,64] [--requests 64]
+        [--latency-ms 200 --spread-ms 50 --distribution lognormal]
+        [--cassette runs.jsonl [--record]] [--json report.json]
+
+LLM calls are served by FakeLLM (services/fake_llm.py), so the numbers
+measure LangGraph, pydantic and FastAPI rather than the provider. With
+--cassette the fake replays recorded responses; add --record to capture
+them once from the configured backend (one request at a time).
+
+For each concurrency level this reports throughput, p50/p95/p99 latency
+and, for the graph target, per-node wall time split into time spent
+waiting on the LLM and the remaining orchestration overhead. The api
+target drives POST /api/evaluate in-process over ASGI; every request gets
+a distinct title so the evaluation cache never short-circuits it.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import httpx
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from benchmarks.fused_vs_fanout import SAMPLE_SCRIPT
+from graph.graph_builder import build_graph, EVALUATION_MODES
+from models.io_models import ScriptInput
+from services.evaluation_service import build_initial_state, discard_checkpoint, evaluation_config, new_evaluation_id
+from services.fake_llm import Cassette, FakeLLM, LatencyModel, RecordingLLM, DISTRIBUTIONS, FIXED
+from services.llm_service import get_llm, install_llm
+
+GRAPH_TARGET = "graph"
+API_TARGET = "api"
+
+
+class NodeTimer(AsyncCallbackHandler):
+    """Wall time of every graph node and of the LLM calls made from it."""
+
+    def __init__(self) -> None:
+        self._started: Dict[UUID, tuple] = {}
+        self.node_s: Dict[str, List[float]] = {}
+        self.llm_s: Dict[str, float] = {}
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node is not None and node == (name or kwargs.get("name")):
+            self._started[run_id] = ("node", node, time.perf_counter())
+
+    async def on_chain_end(self, outputs, *, run_id, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    async def on_chain_error(self, error, *, run_id, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        self._started[run_id] = ("llm", node, time.perf_counter())
+
+    async def on_llm_end(self, response, *, run_id, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        kind, node, t0 = started
+        elapsed = time.perf_counter() - t0
+        if kind == "node":
+            self.node_s.setdefault(node, []).append(elapsed)
+        else:
+            self.llm_s[node] = self.llm_s.get(node, 0.0) + elapsed
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _script(i: int) -> ScriptInput:
+    return SAMPLE_SCRIPT.model_copy(update={"title": f"{SAMPLE_SCRIPT.title} #{i}"})
+
+
+async def _drive(requests: int, concurrency: int, one) -> Dict[str, Any]:
+    """Run `one(i)` `requests` times, at most `concurrency` at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def _timed(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await one(i)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_timed(i) for i in range(requests)))
+    wall = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_s": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "latency_p50_s": percentile(latencies, 0.50),
+        "latency_p95_s": percentile(latencies, 0.95),
+        "latency_p99_s": percentile(latencies, 0.99),
+    }
+
+
+def _node_report(timer: NodeTimer) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for node, durations in sorted(timer.node_s.items()):
+        runs = len(durations)
+        node_ms = 1000 * sum(durations) / runs
+        llm_ms = 1000 * timer.llm_s.get(node, 0.0) / runs
+        report[node] = {
+            "runs": runs,
+            "wall_ms": round(node_ms, 2),
+            "llm_ms": round(llm_ms, 2),
+            # Parallel LLM calls inside one node can exceed its wall time
+            "overhead_ms": round(max(0.0, node_ms - llm_ms), 2),
+        }
+    return report
+
+
+async def bench_graph(mode: str, levels: List[int], requests: int) -> List[Dict[str, Any]]:
+    graph = build_graph(mode)
+    results = []
+    for concurrency in levels:
+        timer = NodeTimer()
+
+        async def one(i: int) -> None:
+            script = _script(i)
+            config = {**evaluation_config(script, new_evaluation_id(), mode), "callbacks": [timer]}
+            await graph.ainvoke(build_initial_state(script), config=config)
+            await discard_checkpoint(config)
+
+        result = await _drive(requests, concurrency, one)
+        result["nodes"] = _node_report(timer)
+        results.append(result)
+    return results
+
+
+async def bench_api(mode: str, levels: List[int], requests: int) -> List[Dict[str, Any]]:
+    from main import app
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for level, concurrency in enumerate(levels):
+
+            async def one(i: int) -> None:
+                # Distinct per level too, so later levels don't hit the evaluation cache
+                script = _script(level * requests + i)
+                resp = await client.post("/api/evaluate", params={"mode": mode}, json=script.model_dump())
+                resp.raise_for_status()
+
+            results.append(await _drive(requests, concurrency, one))
+    return results
+
+
+async def record(mode: str, cassette: Cassette, requests: int) -> None:
+    install_llm(RecordingLLM(get_llm(), cassette))
+    graph = build_graph(mode)
+    for i in range(requests):
+        config = evaluation_config(_script(i), new_evaluation_id(), mode)
+        await graph.ainvoke(build_initial_state(_script(i)), config=config)
+        await discard_checkpoint(config)
+    install_llm(None)
+
+
+async def main(args: argparse.Namespace) -> None:
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    cassette = Cassette(args.cassette) if args.cassette else None
+
+    if args.record:
+        if cassette is None:
+            raise SystemExit("--record needs --cassette")
+        await record(args.mode, cassette, args.requests)
+
+    fake = FakeLLM(
+        latency=LatencyModel(args.distribution, args.latency_ms, args.spread_ms, seed=args.seed),
+        cassette=cassette,
+    )
+    install_llm(fake)
+
+    report: Dict[str, Any] = {
+        "mode": args.mode,
+        "latency_model": {"distribution": args.distribution, "mean_ms": args.latency_ms, "spread_ms": args.spread_ms},
+    }
+    if args.target in (GRAPH_TARGET, "both"):
+        report[GRAPH_TARGET] = await bench_graph(args.mode, levels, args.requests)
+    if args.target in (API_TARGET, "both"):
+        report[API_TARGET] = await bench_api(args.mode, levels, args.requests)
+    report["llm_calls"] = fake.calls
+    if cassette is not None:
+        report["replay_misses"] = fake.replay_misses
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=(GRAPH_TARGET, API_TARGET, "both"), default="both")
+    parser.add_argument("--mode", choices=EVALUATION_MODES, default=EVALUATION_MODES[0])
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default=FIXED)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--spread-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cassette", help="JSONL cassette to replay (or record into with --record)")
+    parser.add_argument("--record", action="store_true", help="record --requests runs from the real backend first")
+    parser.add_argument("--json", help="also write the report to this file")
+    asyncio.run(main(parser.parse_args()))
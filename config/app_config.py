@@ -0,0 +1,92 @@
+# backend/config/app_config.py
+
+"""
+Application-level settings (API behaviour, evaluation memoization, ...).
+
+LLM/provider settings live in config/llm_config.py; importing it first
+guarantees the same .env file has been loaded.
+"""
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+from config import llm_config as _llm_config  # noqa: F401  (loads .env)
+
+
+class AppConfig(BaseSettings):
+    # Graph topology: "fanout" (one LLM call per parameter) or "fused" (one call total)
+    evaluation_mode: str = Field("fanout", env="EVALUATION_MODE")
+    fused_max_tokens: int = Field(4096, env="FUSED_MAX_TOKENS")
+
+    # "quorum" mode: aggregate once this many parameters succeeded (+ grace for stragglers)
+    quorum_min_parameters: int = Field(8, env="QUORUM_MIN_PARAMETERS")
+    quorum_grace_s: float = Field(2.0, env="QUORUM_GRACE_S")
+
+    # Per-evaluation budget; parameters still running after it are reported missing (0 = none)
+    evaluation_deadline_s: float = Field(300.0, env="EVALUATION_DEADLINE_S")
+
+    # Parameter prompt layout: "legacy" or "shared_prefix" (provider prefix caching)
+    prompt_layout: str = Field("legacy", env="PROMPT_LAYOUT")
+
+    # Long screenplays: segment + map-reduce into a beat digest above this size
+    long_content_threshold_chars: int = Field(40000, env="LONG_CONTENT_THRESHOLD_CHARS")
+    segment_chunk_chars: int = Field(12000, env="SEGMENT_CHUNK_CHARS")
+    segment_map_concurrency: int = Field(8, env="SEGMENT_MAP_CONCURRENCY")
+    segment_digest_max_tokens: int = Field(900, env="SEGMENT_DIGEST_MAX_TOKENS")
+
+    # Shared story digest pre-pass: "replace" or "alongside" the raw content.
+    # Opt-in: "replace" scores long submissions from the digest instead of their text
+    story_digest_enabled: bool = Field(False, env="STORY_DIGEST_ENABLED")
+    story_digest_min_chars: int = Field(8000, env="STORY_DIGEST_MIN_CHARS")
+    story_digest_mode: str = Field("replace", env="STORY_DIGEST_MODE")
+    story_digest_cache_max_entries: int = Field(512, env="STORY_DIGEST_CACHE_MAX_ENTRIES")
+
+    # Whole-evaluation memoization keyed by script fingerprint
+    eval_cache_enabled: bool = Field(True, env="EVAL_CACHE_ENABLED")
+    eval_cache_max_entries: int = Field(512, env="EVAL_CACHE_MAX_ENTRIES")
+    eval_cache_ttl_seconds: float = Field(7 * 86400.0, env="EVAL_CACHE_TTL_SECONDS")
+    eval_cache_sqlite_path: str = Field("", env="EVAL_CACHE_SQLITE_PATH")
+    eval_cache_sqlite_max_entries: int = Field(20000, env="EVAL_CACHE_SQLITE_MAX_ENTRIES")
+
+    # Revision-aware re-evaluation (POST /api/evaluate/revision): stored drafts keyed by fingerprint
+    revision_store_max_entries: int = Field(256, env="REVISION_STORE_MAX_ENTRIES")
+    revision_store_ttl_seconds: float = Field(30 * 86400.0, env="REVISION_STORE_TTL_SECONDS")
+    revision_store_sqlite_path: str = Field("", env="REVISION_STORE_SQLITE_PATH")
+    # Re-run every parameter once this share of the draft's text changed
+    revision_full_rerun_share: float = Field(0.3, env="REVISION_FULL_RERUN_SHARE")
+
+    # Asynchronous job API (POST /evaluations)
+    jobs_sqlite_path: str = Field("scriptwise_jobs.db", env="JOBS_SQLITE_PATH")
+    jobs_concurrency: int = Field(4, env="JOBS_CONCURRENCY")
+    jobs_queue_max: int = Field(1000, env="JOBS_QUEUE_MAX")
+    # A running job whose worker hasn't renewed its claim for this long is re-queued
+    jobs_lease_s: float = Field(60.0, env="JOBS_LEASE_S")
+
+    # Graph checkpoints keyed by evaluation id, so interrupted runs resume ("" = off)
+    checkpoint_sqlite_path: str = Field("scriptwise_checkpoints.db", env="CHECKPOINT_SQLITE_PATH")
+    checkpoint_ttl_s: float = Field(86400.0, env="CHECKPOINT_TTL_S")
+    checkpoint_compress_min_bytes: int = Field(1024, env="CHECKPOINT_COMPRESS_MIN_BYTES")
+
+    # Batch evaluation (POST /api/evaluate/batch, python -m services.batch_runner)
+    batch_concurrency: int = Field(8, env="BATCH_CONCURRENCY")  # graph runs at once, across all batches
+    batch_max_items: int = Field(500, env="BATCH_MAX_ITEMS")  # per API request
+
+    # Span tracing (services/tracing.py): exporter "none" | "console" | "file"
+    tracing_exporter: str = Field("none", env="TRACING_EXPORTER")
+    tracing_file_path: str = Field("traces.jsonl", env="TRACING_FILE_PATH")
+    tracing_sample_rate: float = Field(1.0, env="TRACING_SAMPLE_RATE")
+    # Dump the full span tree of traces slower than this (0 = off), independent of the exporter
+    tracing_slow_threshold_s: float = Field(0.0, env="TRACING_SLOW_THRESHOLD_S")
+    tracing_slow_sample_rate: float = Field(1.0, env="TRACING_SLOW_SAMPLE_RATE")
+    tracing_slow_dir: str = Field("slow_traces", env="TRACING_SLOW_DIR")
+
+    # Queue-backed structured logging (services/log_pipeline.py)
+    log_level: str = Field("INFO", env="LOG_LEVEL")
+    log_format: str = Field("json", env="LOG_FORMAT")  # "json" or "text"
+    log_queue_max: int = Field(10000, env="LOG_QUEUE_MAX")
+
+    class Config:
+        extra = "ignore"
+
+
+app_config = AppConfig()
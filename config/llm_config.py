@@ -34,12 +34,73 @@ for candidate in (BASE_DIR / ".env", PROJECT_ROOT / ".env"):
 # -------- Pydantic settings model --------
 
 class LLMConfig(BaseSettings):
-    openrouter_api_key: str = Field(..., env="OPENROUTER_API_KEY")
+    # Only required when the "openrouter" backend is in use
+    openrouter_api_key: str = Field("", env="OPENROUTER_API_KEY")
     model: str = Field("meta-llama/llama-3.1-70b-instruct", env="OPENROUTER_MODEL")
     base_url: str = Field("https://openrouter.ai/api/v1", env="OPENROUTER_BASE_URL")
     temperature: float = Field(0.2, env="LLM_TEMPERATURE")
     max_tokens: int = Field(1024, env="LLM_MAX_TOKENS")
 
+    # Backend registry (services/llm_backends.py): deployment default + per-node routing
+    llm_backend: str = Field("openrouter", env="LLM_BACKEND")
+    llm_parameter_backends: str = Field("", env="LLM_PARAMETER_BACKENDS")
+
+    # Shared HTTP connection pool used by the sync + async OpenAI clients
+    llm_http_max_connections: int = Field(200, env="LLM_HTTP_MAX_CONNECTIONS")
+    llm_http_max_keepalive: int = Field(50, env="LLM_HTTP_MAX_KEEPALIVE")
+    llm_http_keepalive_expiry: float = Field(30.0, env="LLM_HTTP_KEEPALIVE_EXPIRY")
+
+    # Content-addressed response cache (memory LRU, optionally backed by SQLite)
+    llm_cache_enabled: bool = Field(True, env="LLM_CACHE_ENABLED")
+    llm_cache_max_entries: int = Field(2048, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_ttl_seconds: float = Field(86400.0, env="LLM_CACHE_TTL_SECONDS")
+    llm_cache_sqlite_path: str = Field("", env="LLM_CACHE_SQLITE_PATH")
+    llm_cache_sqlite_max_entries: int = Field(50000, env="LLM_CACHE_SQLITE_MAX_ENTRIES")
+
+    # Forward `cache_control` hints on shared prompt prefixes (see PROMPT_LAYOUT)
+    llm_prompt_cache_hints: bool = Field(True, env="LLM_PROMPT_CACHE_HINTS")
+
+    # Process-wide outbound limiter: RPM/TPM buckets (0 = unlimited) + AIMD concurrency window
+    llm_limiter_enabled: bool = Field(True, env="LLM_LIMITER_ENABLED")
+    llm_rate_limit_rpm: int = Field(0, env="LLM_RATE_LIMIT_RPM")
+    llm_rate_limit_tpm: int = Field(0, env="LLM_RATE_LIMIT_TPM")
+    llm_concurrency_initial: int = Field(16, env="LLM_CONCURRENCY_INITIAL")
+    llm_concurrency_min: int = Field(1, env="LLM_CONCURRENCY_MIN")
+    llm_concurrency_max: int = Field(64, env="LLM_CONCURRENCY_MAX")
+    llm_concurrency_backoff: float = Field(0.5, env="LLM_CONCURRENCY_BACKOFF")
+
+    # Model cascade: small model first, escalate low-confidence / near-cutoff parameters to `model`
+    # (OpenRouter tiers; Ollama / local backends set their small model in config/settings.py)
+    llm_cascade_enabled: bool = Field(False, env="LLM_CASCADE_ENABLED")
+    llm_cascade_small_model: str = Field("meta-llama/llama-3.1-8b-instruct", env="LLM_CASCADE_SMALL_MODEL")
+    llm_cascade_min_confidence: float = Field(0.75, env="LLM_CASCADE_MIN_CONFIDENCE")
+    llm_cascade_band_margin: float = Field(0.5, env="LLM_CASCADE_BAND_MARGIN")
+    # USD per 1M tokens, used for the per-tier cost log
+    llm_cascade_small_price_in: float = Field(0.02, env="LLM_CASCADE_SMALL_PRICE_IN")
+    llm_cascade_small_price_out: float = Field(0.05, env="LLM_CASCADE_SMALL_PRICE_OUT")
+    llm_cascade_large_price_in: float = Field(0.12, env="LLM_CASCADE_LARGE_PRICE_IN")
+    llm_cascade_large_price_out: float = Field(0.30, env="LLM_CASCADE_LARGE_PRICE_OUT")
+
+    # Call policy: jittered retries, per-call timeout, hedging after the p95 latency
+    llm_max_retries: int = Field(3, env="LLM_MAX_RETRIES")
+    llm_retry_base_delay_s: float = Field(0.5, env="LLM_RETRY_BASE_DELAY_S")
+    llm_retry_max_delay_s: float = Field(8.0, env="LLM_RETRY_MAX_DELAY_S")
+    llm_call_timeout_s: float = Field(120.0, env="LLM_CALL_TIMEOUT_S")
+    llm_hedge_enabled: bool = Field(True, env="LLM_HEDGE_ENABLED")
+    llm_hedge_quantile: float = Field(0.95, env="LLM_HEDGE_QUANTILE")
+    llm_hedge_min_samples: int = Field(20, env="LLM_HEDGE_MIN_SAMPLES")
+    llm_hedge_min_delay_s: float = Field(1.0, env="LLM_HEDGE_MIN_DELAY_S")
+
+    # One "re-emit JSON only" call when an evaluation answer can't be parsed even after repair
+    llm_json_reemit_enabled: bool = Field(True, env="LLM_JSON_REEMIT_ENABLED")
+
+    # Provider batch API (services/provider_batch.py): collect window, submission cap, polling
+    llm_batch_collect_window_s: float = Field(2.0, env="LLM_BATCH_COLLECT_WINDOW_S")
+    llm_batch_max_wait_s: float = Field(30.0, env="LLM_BATCH_MAX_WAIT_S")
+    llm_batch_max_requests: int = Field(50000, env="LLM_BATCH_MAX_REQUESTS")
+    llm_batch_poll_interval_s: float = Field(30.0, env="LLM_BATCH_POLL_INTERVAL_S")
+    llm_batch_completion_window: str = Field("24h", env="LLM_BATCH_COMPLETION_WINDOW")
+
     class Config:
         extra = "ignore"  # ignore unrelated env vars
 
@@ -62,3 +123,8 @@ if __name__ == "__main__":
         f"temp={llm_config.temperature}, "
         f"max_tokens={llm_config.max_tokens}"
     )
+    print(
+        f"[LLM_CONFIG] HTTP pool: max_connections={llm_config.llm_http_max_connections}, "
+        f"max_keepalive={llm_config.llm_http_max_keepalive}, "
+        f"keepalive_expiry={llm_config.llm_http_keepalive_expiry}s"
+    )
@@ -1,12 +1,21 @@
-from pydantic import BaseSettings
+from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3.1"
-    LLM_TEMPERATURE: float = 0.1
-    LLM_NUM_CTX: int = 8192
+    LLM_TEMPERATURE: float = 0.1  # Ollama and local backends
+    OLLAMA_MAX_CONCURRENCY: int = 4
+    OLLAMA_CASCADE_SMALL_MODEL: str = ""  # e.g. "llama3.2:3b"; empty = no model cascade
+
+    # Any OpenAI-compatible server (vLLM, llama.cpp, benchmarks/standin_server.py)
+    LOCAL_LLM_BASE_URL: str = "http://127.0.0.1:8001/v1"
+    LOCAL_LLM_MODEL: str = "local-model"
+    LOCAL_LLM_API_KEY: str = "not-needed"
+    LOCAL_LLM_MAX_CONCURRENCY: int = 16
+    LOCAL_LLM_CASCADE_SMALL_MODEL: str = ""
 
     class Config:
         env_file = ".env"
+        extra = "ignore"  # .env also carries the OpenRouter / app settings
 
 settings = Settings()
@@ -1,63 +1,146 @@
 from langgraph.graph import StateGraph, START, END
 
+from prompts.parameter_rubrics import PARAMETER_NAMES
+from prompts.parameter_specs import PARAMETER_SPECS
+from services.checkpoint_store import get_checkpointer
+from services.metrics import graph_metrics_handler
+from services.tracing import trace_handler, tracing_enabled
+
 from .state import GraphState
+from .node_wrappers import with_cascade, with_deadline
 from .nodes import (
     input_adapter,
-    evaluate_story_engine,
-    evaluate_goal_stakes,
-    evaluate_momentum,
-    evaluate_protagonist_arc,
-    evaluate_relationships,
-    evaluate_emotional_truth,
-    evaluate_world_specificity,
-    evaluate_theme_cinema,
-    evaluate_hook_recall,
-    evaluate_audience_market,
+    condense_long_content,
+    build_story_digest,
+    make_parameter_node,
+    evaluate_all_parameters,
+    make_quorum_node,
     aggregate_scores,
     summarize_evaluation,
 )
 
 
-def build_graph():
+# Graph topologies selectable per request or via EVALUATION_MODE
+FANOUT_MODE = "fanout"
+FUSED_MODE = "fused"
+QUORUM_MODE = "quorum"
+EVALUATION_MODES = (FANOUT_MODE, FUSED_MODE, QUORUM_MODE)
+
+
+def _parameter_node(parameter_id: str):
+    """Single-parameter node (chain compiled now) with the model cascade inside the evaluation deadline."""
+    node_fn = make_parameter_node(PARAMETER_SPECS[parameter_id])
+    return with_deadline(with_cascade(node_fn, parameter_id), [parameter_id])
+
+
+def _route_parameters(state: GraphState):
+    """
+    Fan out to every parameter agent, or only to `rerun_parameters` when a
+    revision re-evaluates part of a draft (the rest arrive pre-filled in
+    parameter_results; services/revision_service.py).
+    """
+    rerun = state.get("rerun_parameters")
+    if rerun is None:
+        return list(PARAMETER_SPECS)
+    return [parameter_id for parameter_id in rerun if parameter_id in PARAMETER_SPECS] or "aggregator"
+
+
+def _compile(workflow: StateGraph):
+    """
+    Compile with the metrics (and, if enabled, tracing) callbacks bound, so
+    every invocation is instrumented, and with the SQLite checkpointer, so
+    every invocation needs a thread_id (evaluation_service.evaluation_config).
+    """
+    callbacks = [graph_metrics_handler]
+    if tracing_enabled():
+        callbacks.append(trace_handler)
+    return workflow.compile(checkpointer=get_checkpointer()).with_config(callbacks=callbacks)
+
+
+def build_graph(mode: str = FANOUT_MODE):
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"Unknown evaluation mode: {mode!r} (expected one of {EVALUATION_MODES})")
+    if mode == FUSED_MODE:
+        return _build_fused_graph()
+    if mode == QUORUM_MODE:
+        return _build_quorum_graph()
+
     workflow = StateGraph(GraphState)
 
     # Register nodes
     workflow.add_node("input_adapter", input_adapter)
-    workflow.add_node("story_engine", evaluate_story_engine)
-    workflow.add_node("goal_stakes", evaluate_goal_stakes)
-    workflow.add_node("momentum", evaluate_momentum)
-    workflow.add_node("protagonist_arc", evaluate_protagonist_arc)
-    workflow.add_node("relationships", evaluate_relationships)
-    workflow.add_node("emotional_truth", evaluate_emotional_truth)
-    workflow.add_node("world_specificity", evaluate_world_specificity)
-    workflow.add_node("theme_cinema", evaluate_theme_cinema)
-    workflow.add_node("hook_recall", evaluate_hook_recall)
-    workflow.add_node("audience_market", evaluate_audience_market)
+    workflow.add_node("condense_content", condense_long_content)
+    workflow.add_node("story_digest", build_story_digest)
+    for parameter_id in PARAMETER_SPECS:
+        workflow.add_node(parameter_id, _parameter_node(parameter_id))
     workflow.add_node("aggregator", aggregate_scores)
     workflow.add_node("summary", summarize_evaluation)
 
-    # Wiring: input_adapter → all parameter agents (in parallel)
+    # Wiring: input_adapter → condense_content → story_digest → parameter agents (in parallel)
     workflow.add_edge(START, "input_adapter")
+    workflow.add_edge("input_adapter", "condense_content")
+    workflow.add_edge("condense_content", "story_digest")
+    workflow.add_conditional_edges("story_digest", _route_parameters, [*PARAMETER_SPECS, "aggregator"])
 
-    parameter_nodes = [
-        "story_engine",
-        "goal_stakes",
-        "momentum",
-        "protagonist_arc",
-        "relationships",
-        "emotional_truth",
-        "world_specificity",
-        "theme_cinema",
-        "hook_recall",
-        "audience_market",
-    ]
-
-    for node_name in parameter_nodes:
-        workflow.add_edge("input_adapter", node_name)
-        workflow.add_edge(node_name, "aggregator")
+    for parameter_id in PARAMETER_SPECS:
+        workflow.add_edge(parameter_id, "aggregator")
 
     # Aggregator → summary → END
     workflow.add_edge("aggregator", "summary")
     workflow.add_edge("summary", END)
 
-    return workflow.compile()
+    return _compile(workflow)
+
+
+def _build_fused_graph():
+    """
+    input_adapter → condense_content → story_digest → fused (all ten rubrics,
+    one LLM call) → aggregator → summary
+    """
+    workflow = StateGraph(GraphState)
+
+    workflow.add_node("input_adapter", input_adapter)
+    workflow.add_node("condense_content", condense_long_content)
+    workflow.add_node("story_digest", build_story_digest)
+    workflow.add_node("fused_parameters", with_deadline(evaluate_all_parameters, list(PARAMETER_NAMES)))
+    workflow.add_node("aggregator", aggregate_scores)
+    workflow.add_node("summary", summarize_evaluation)
+
+    workflow.add_edge(START, "input_adapter")
+    workflow.add_edge("input_adapter", "condense_content")
+    workflow.add_edge("condense_content", "story_digest")
+    workflow.add_edge("story_digest", "fused_parameters")
+    workflow.add_edge("fused_parameters", "aggregator")
+    workflow.add_edge("aggregator", "summary")
+    workflow.add_edge("summary", END)
+
+    return _compile(workflow)
+
+
+def _build_quorum_graph():
+    """
+    input_adapter → condense_content → story_digest → quorum (ten parameter
+    agents, proceeds once QUORUM_MIN_PARAMETERS are in) → aggregator → summary
+    """
+    workflow = StateGraph(GraphState)
+
+    workflow.add_node("input_adapter", input_adapter)
+    workflow.add_node("condense_content", condense_long_content)
+    workflow.add_node("story_digest", build_story_digest)
+    evaluators = {
+        parameter_id: with_cascade(make_parameter_node(spec), parameter_id)
+        for parameter_id, spec in PARAMETER_SPECS.items()
+    }
+    workflow.add_node("quorum_parameters", make_quorum_node(evaluators))
+    workflow.add_node("aggregator", aggregate_scores)
+    workflow.add_node("summary", summarize_evaluation)
+
+    workflow.add_edge(START, "input_adapter")
+    workflow.add_edge("input_adapter", "condense_content")
+    workflow.add_edge("condense_content", "story_digest")
+    workflow.add_edge("story_digest", "quorum_parameters")
+    workflow.add_edge("quorum_parameters", "aggregator")
+    workflow.add_edge("aggregator", "summary")
+    workflow.add_edge("summary", END)
+
+    return _compile(workflow)
@@ -0,0 +1,101 @@
+# backend/graph/node_wrappers.py
+
+"""
+Wrappers applied to graph nodes at build_graph time, so the nodes
+themselves stay plain `state -> partial update` functions.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Sequence
+
+from config.llm_config import llm_config
+from services.call_policy import current_deadline, deadline_scope
+from services.cascade import SMALL_TIER, LARGE_TIER, cascade_stats, escalation_reason
+from services.llm_backends import backend_for_node, backend_spec
+from services.llm_service import use_model
+from services.usage_recorder import usage_recorder
+from .state import GraphState
+
+logger = logging.getLogger(__name__)
+
+NodeFn = Callable[[GraphState], Awaitable[Dict[str, Any]]]
+
+DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+def with_deadline(node_fn: NodeFn, parameter_ids: Sequence[str]) -> NodeFn:
+    """
+    Bound a parameter node by the evaluation's deadline: the caller's
+    deadline_scope if set (a resumed checkpoint gets a fresh one), else
+    state["deadline"].
+
+    LLM calls inside the node see the deadline through `deadline_scope`, so
+    retries and per-call timeouts shrink with the remaining budget. If the
+    budget runs out, the node reports its parameters in `parameter_errors`
+    instead of a result and the aggregator proceeds with what it has.
+    """
+
+    @functools.wraps(node_fn)
+    async def wrapper(state: GraphState) -> Dict[str, Any]:
+        deadline = current_deadline() or state.get("deadline")
+        if not deadline:
+            return await node_fn(state)
+
+        remaining = deadline - time.time()
+        try:
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            with deadline_scope(deadline):
+                return await asyncio.wait_for(node_fn(state), remaining)
+        except asyncio.TimeoutError:
+            logger.warning("Deadline exceeded in %s; dropping %s", node_fn.__name__, list(parameter_ids))
+            return {"parameter_errors": {pid: DEADLINE_EXCEEDED for pid in parameter_ids}}
+
+    return wrapper
+
+
+async def _run_tier(node_fn: NodeFn, state: GraphState, tier: str, model: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    with use_model(model), usage_recorder.capture() as records:
+        update = await node_fn(state)
+    latency = time.perf_counter() - started
+    cascade_stats.record_tier(tier, latency, records)
+    logger.debug("Cascade tier=%s model=%s latency=%.2fs calls=%d", tier, model, latency, len(records))
+    return update
+
+
+def with_cascade(node_fn: NodeFn, parameter_id: str) -> NodeFn:
+    """
+    Run a single-parameter node on the small model and re-run it on the
+    configured (large) model only if the small answer needs escalating.
+    Both tiers are models of the backend routed to the parameter; a no-op
+    unless LLM_CASCADE_ENABLED is set and that backend has a small model.
+    """
+
+    @functools.wraps(node_fn)
+    async def wrapper(state: GraphState) -> Dict[str, Any]:
+        if not llm_config.llm_cascade_enabled:
+            return await node_fn(state)
+        spec = backend_spec(backend_for_node(parameter_id))
+        if not spec.small_model or spec.small_model == spec.model:
+            return await node_fn(state)
+
+        update = await _run_tier(node_fn, state, SMALL_TIER, spec.small_model)
+        param_eval = (update.get("parameter_results") or {}).get(parameter_id)
+        reason = "missing" if param_eval is None else escalation_reason(
+            param_eval,
+            min_confidence=llm_config.llm_cascade_min_confidence,
+            band_margin=llm_config.llm_cascade_band_margin,
+        )
+        cascade_stats.record_decision(reason)
+        if reason is None:
+            return update
+
+        logger.info("Escalating %s to %s (%s)", parameter_id, spec.model, reason)
+        return await _run_tier(node_fn, state, LARGE_TIER, spec.model)
+
+    return wrapper
+
@@ -1,31 +1,21 @@
 """Exports all LangGraph node functions used in the evaluation graph."""
 
 from .input_adapter import input_adapter
-from .parameter_story_engine import evaluate_story_engine
-from .parameter_goal_stakes import evaluate_goal_stakes
-from .parameter_momentum import evaluate_momentum
-from .parameter_protagonist_arc import evaluate_protagonist_arc
-from .parameter_relationships import evaluate_relationships
-from .parameter_emotional_truth import evaluate_emotional_truth
-from .parameter_world_specificity import evaluate_world_specificity
-from .parameter_theme_cinema import evaluate_theme_cinema
-from .parameter_hook_recall import evaluate_hook_recall
-from .parameter_audience_market import evaluate_audience_market
+from .long_content import condense_long_content
+from .story_digest import build_story_digest
+from .parameter_node import make_parameter_node
+from .fused_evaluation import evaluate_all_parameters
+from .quorum import make_quorum_node
 from .aggregator import aggregate_scores
 from .summary import summarize_evaluation
 
 __all__ = [
     "input_adapter",
-    "evaluate_story_engine",
-    "evaluate_goal_stakes",
-    "evaluate_momentum",
-    "evaluate_protagonist_arc",
-    "evaluate_relationships",
-    "evaluate_emotional_truth",
-    "evaluate_world_specificity",
-    "evaluate_theme_cinema",
-    "evaluate_hook_recall",
-    "evaluate_audience_market",
+    "condense_long_content",
+    "build_story_digest",
+    "make_parameter_node",
+    "evaluate_all_parameters",
+    "make_quorum_node",
     "aggregate_scores",
     "summarize_evaluation",
 ]
@@ -1,12 +1,18 @@
+import logging
 from typing import Dict, Any
 
 from ..state import GraphState
+from prompts.parameter_rubrics import PARAMETER_NAMES
+from .quorum import PENDING
 from models.evaluation_models import (
     OverallEvaluation,
     EvaluationVerdict,
     ParameterEvaluation,
+    VERDICT_CUTOFFS,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def aggregate_scores(state: GraphState) -> Dict[str, Any]:
     """
@@ -17,20 +23,25 @@ def aggregate_scores(state: GraphState) -> Dict[str, Any]:
     param_results: Dict[str, ParameterEvaluation] = (
         state.get("parameter_results") or {}
     )
-
-    # Debug: print what we received
-    print(f"[AGGREGATOR] Received {len(param_results)} parameter results")
-    print(f"[AGGREGATOR] Keys: {list(param_results.keys())}")
+    parameter_errors: Dict[str, str] = state.get("parameter_errors") or {}
+    missing = [pid for pid in PARAMETER_NAMES if pid not in param_results]
 
     # If something went wrong upstream, fail gracefully
     if not param_results:
-        print("[AGGREGATOR] No parameter results found, returning 0.0")
+        logger.warning(
+            "aggregator.no_results",
+            extra={"missing_parameters": missing, "parameter_errors": parameter_errors},
+        )
         overall = OverallEvaluation(
             average_score=0.0,
             weighted_score=None,
             verdict=EvaluationVerdict.POOR,
             parameter_evaluations={},
-            metadata={"reason": "No parameter evaluations produced"},
+            metadata={
+                "reason": "No parameter evaluations produced",
+                "missing_parameters": missing,
+                "parameter_errors": parameter_errors,
+            },
         )
         return {
             "overall": overall,
@@ -50,18 +61,17 @@ def aggregate_scores(state: GraphState) -> Dict[str, Any]:
             scores.append(0.0)
     
     avg_score = sum(scores) / len(scores) if scores else 0.0
-    print(f"[AGGREGATOR] Scores: {scores}")
-    print(f"[AGGREGATOR] Average score: {avg_score}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "aggregator.scores",
+            extra={"parameters": list(param_results.keys()), "scores": scores, "average_score": avg_score},
+        )
 
-    # Simple banding – can be tuned later
-    if avg_score >= 8.5:
-        verdict = EvaluationVerdict.EXCELLENT
-    elif avg_score >= 7.0:
-        verdict = EvaluationVerdict.GOOD
-    elif avg_score >= 5.0:
-        verdict = EvaluationVerdict.NEEDS_WORK
-    else:
-        verdict = EvaluationVerdict.POOR
+    # Simple banding – can be tuned later (see VERDICT_CUTOFFS)
+    verdict = next(
+        (band for cutoff, band in VERDICT_CUTOFFS if avg_score >= cutoff),
+        EvaluationVerdict.POOR,
+    )
 
     overall = OverallEvaluation(
         average_score=avg_score,
@@ -71,6 +81,10 @@ def aggregate_scores(state: GraphState) -> Dict[str, Any]:
         metadata={
             "normalized_average_score": avg_score / 10.0,
             "num_parameters": len(scores),
+            # Partial result: deadline or quorum left these parameters out
+            "missing_parameters": missing,
+            "pending_parameters": [pid for pid, err in parameter_errors.items() if err == PENDING],
+            "parameter_errors": parameter_errors,
         },
     )
 
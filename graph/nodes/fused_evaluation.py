@@ -0,0 +1,83 @@
+# backend/graph/nodes/fused_evaluation.py
+
+from typing import Any, Dict
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.prompts import ChatPromptTemplate
+
+from config.app_config import app_config
+from services.json_repair import TolerantJsonOutputParser, ainvoke_with_reemit
+from services.llm_service import routed_llm
+from prompts.fused_prompts import FUSED_SYSTEM_PROMPT, FUSED_USER_PROMPT
+from prompts.parameter_rubrics import PARAMETER_RUBRICS
+from models.evaluation_models import ParameterEvaluation
+from graph.state import GraphState
+from .parameter_node import failed_parameter, normalize_parameter_result, parameter_evaluation
+
+
+# Compiled once; routed_llm still resolves the backend / installed LLM per call
+_FUSED_LLM = routed_llm.bind(max_tokens=app_config.fused_max_tokens)
+_FUSED_PARSER = TolerantJsonOutputParser()
+_FUSED_CHAIN = (
+    ChatPromptTemplate.from_messages(
+        [
+            ("system", FUSED_SYSTEM_PROMPT),
+            ("user", FUSED_USER_PROMPT),
+        ]
+    )
+    | _FUSED_LLM
+    | _FUSED_PARSER
+)
+
+
+def _to_parameter_evaluation(param_id: str, raw: Any) -> ParameterEvaluation:
+    if not isinstance(raw, dict):
+        return failed_parameter(param_id, "Fused evaluation returned no result for this parameter.")
+    try:
+        return parameter_evaluation(param_id, normalize_parameter_result(raw))
+    except OutputParserException as exc:
+        return failed_parameter(param_id, f"Fused evaluation returned an invalid result for this parameter: {exc}")
+
+
+async def evaluate_all_parameters(state: GraphState) -> dict:
+    """
+    Node for: ALL TEN PARAMETERS IN ONE CALL ("fused" mode)
+
+    Sends the synopsis once with every rubric from PARAMETER_RUBRICS and fans
+    the JSON answer back out into the same state["parameter_results"] shape
+    the ten individual parameter nodes produce.
+    """
+
+    try:
+        raw: Dict[str, Any] = await ainvoke_with_reemit(
+            _FUSED_CHAIN,
+            {
+                "title": state.get("title", ""),
+                "logline": state.get("logline", ""),
+                "genre": state.get("genre", ""),
+                "content": state.get("content", ""),
+            },
+            _FUSED_PARSER,
+            _FUSED_LLM,
+        )
+    except Exception as exc:
+        reason = f"Model failure during fused evaluation: {exc}"
+        return {
+            "parameter_results": {
+                param_id: failed_parameter(param_id, reason) for param_id in PARAMETER_RUBRICS
+            }
+        }
+
+    if not isinstance(raw, dict):
+        raw = {}
+
+    return {
+        "parameter_results": {
+            param_id: _to_parameter_evaluation(param_id, raw.get(param_id))
+            for param_id in PARAMETER_RUBRICS
+        }
+    }
+
+
+# Optional alias if you ever want node-style naming elsewhere
+fused_evaluation_node = evaluate_all_parameters
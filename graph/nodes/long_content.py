@@ -0,0 +1,135 @@
+# backend/graph/nodes/long_content.py
+
+"""
+Map-reduce pre-pass for full-length screenplays.
+
+Short submissions (synopses) pass straight through. Anything longer than
+LONG_CONTENT_THRESHOLD_CHARS is segmented into scenes, packed into chunks,
+and each chunk is compressed into a beat digest by the LLM (map stage, run
+concurrently under a semaphore). The concatenated digests replace
+state["content"] for the parameter nodes; if they are still too long the
+digest is fed through the map stage again (reduce).
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from config.app_config import app_config
+from services.json_repair import TolerantJsonOutputParser
+from services.llm_service import get_llm
+from services.segmenter import Chunk, iter_chunks, iter_lines, iter_scenes
+from prompts.digest_templates import SCENE_DIGEST_SYSTEM_PROMPT, SCENE_DIGEST_USER_PROMPT
+from graph.state import GraphState
+
+MAX_REDUCE_ROUNDS = 3
+# How much raw text to keep for a chunk whose digest call failed
+FALLBACK_EXCERPT_CHARS = 1500
+
+
+def _render_digest(chunk: Chunk, raw: Dict[str, Any]) -> str:
+    lines = [f"[pp. {chunk.first_page}-{chunk.last_page}]"]
+    for scene in raw.get("scenes") or []:
+        if not isinstance(scene, dict):
+            continue
+        heading = str(scene.get("heading", "")).strip() or "SCENE"
+        characters = ", ".join(str(c) for c in scene.get("characters") or [])
+        lines.append(f"{heading} ({characters})" if characters else heading)
+        for beat in scene.get("beats") or []:
+            lines.append(f"- {beat}")
+        turn = str(scene.get("turn") or "").strip()
+        if turn:
+            lines.append(f"  TURN: {turn}")
+    return "\n".join(lines)
+
+
+async def _digest_chunk(chain, state: GraphState, chunk: Chunk, semaphore: asyncio.Semaphore) -> str:
+    try:
+        raw = await chain.ainvoke(
+            {
+                "title": state.get("title", ""),
+                "logline": state.get("logline", ""),
+                "genre": state.get("genre", ""),
+                "chunk_label": f"{chunk.index + 1} (pp. {chunk.first_page}-{chunk.last_page})",
+                "chunk": chunk.text,
+            }
+        )
+        return _render_digest(chunk, raw if isinstance(raw, dict) else {})
+    except Exception:
+        # Keep the beginning of the chunk rather than silently dropping it
+        excerpt = chunk.text[:FALLBACK_EXCERPT_CHARS]
+        return f"[pp. {chunk.first_page}-{chunk.last_page}, excerpt]\n{excerpt}"
+    finally:
+        semaphore.release()
+
+
+async def _map_stage(chain, state: GraphState, text: str) -> Tuple[str, int, int]:
+    """
+    Digest every chunk of `text`. Chunks are produced lazily and at most
+    SEGMENT_MAP_CONCURRENCY are in flight, so memory stays bounded.
+    """
+    semaphore = asyncio.Semaphore(app_config.segment_map_concurrency)
+    tasks: List[asyncio.Task] = []
+    scene_count = 0
+
+    scenes = iter_scenes(iter_lines(text), max_scene_chars=app_config.segment_chunk_chars)
+    try:
+        for chunk in iter_chunks(scenes, app_config.segment_chunk_chars):
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(_digest_chunk(chain, state, chunk, semaphore)))
+            scene_count += chunk.scene_count
+        digests = await asyncio.gather(*tasks)
+    except BaseException:
+        # Node cancelled (deadline, client disconnect) or failed: stop the chunk digests in flight
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return "\n\n".join(digests), len(tasks), scene_count
+
+
+async def condense_long_content(state: GraphState) -> dict:
+    """
+    Node for: LONG SCREENPLAY SEGMENTATION + MAP-REDUCE
+
+    No-op for content under the threshold; otherwise writes the reduced
+    beat digest into state["content"] and bookkeeping into state["content_digest"].
+    """
+    content = state.get("content", "") or ""
+    threshold = app_config.long_content_threshold_chars
+    if len(content) <= threshold:
+        return {}
+
+    llm = get_llm().bind(max_tokens=app_config.segment_digest_max_tokens)
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", SCENE_DIGEST_SYSTEM_PROMPT),
+            ("user", SCENE_DIGEST_USER_PROMPT),
+        ]
+    )
+    chain = prompt | llm | TolerantJsonOutputParser()
+
+    text = content
+    rounds: List[Dict[str, int]] = []
+    while len(text) > threshold and len(rounds) < MAX_REDUCE_ROUNDS:
+        text, chunk_count, scene_count = await _map_stage(chain, state, text)
+        rounds.append({"chunks": chunk_count, "scenes": scene_count, "output_chars": len(text)})
+
+    truncated = len(text) > threshold
+    if truncated:
+        text = text[:threshold]
+
+    return {
+        "content": text,
+        "content_digest": {
+            "source_chars": len(content),
+            "digest_chars": len(text),
+            "rounds": rounds,
+            "truncated": truncated,
+        },
+    }
+
+
+# Optional alias if you ever want node-style naming elsewhere
+long_content_node = condense_long_content
@@ -0,0 +1,160 @@
+# backend/graph/nodes/parameter_node.py
+
+"""
+Single-parameter evaluation nodes, one per entry of PARAMETER_SPECS.
+
+make_parameter_node(spec) compiles the node's `prompt | llm | parser`
+chain once, when build_graph runs, instead of on every invocation. The LLM
+step is `routed_llm`, which resolves get_llm() per call, so the model
+cascade, per-node backend routing and install_llm() keep working.
+
+Every node shares PARAMETER_RESULT_PARSER: it extracts and repairs the
+JSON (services/json_repair.py), rejects answers without a numeric score
+(counted as a parse failure) and coerces / clamps score and confidence
+into range. The fused node reuses the same checks. An answer that can't
+be parsed at all gets one "re-emit JSON only" call before the parameter
+is reported as failed.
+"""
+
+import math
+import re
+from typing import Any, Awaitable, Callable, Dict, List
+
+from langchain_core.exceptions import OutputParserException
+
+from services.json_repair import TolerantJsonOutputParser, ainvoke_with_reemit
+from services.llm_service import routed_llm
+from prompts.parameter_rubrics import PARAMETER_NAMES
+from prompts.parameter_specs import ParameterSpec
+from models.evaluation_models import ParameterEvaluation
+from graph.state import GraphState
+from .prompt_layout import build_parameter_prompt
+
+NodeFn = Callable[[GraphState], Awaitable[Dict[str, Any]]]
+
+DEFAULT_CONFIDENCE = 1.0
+
+_FIRST_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _to_float(value: Any) -> float:
+    """Number from a JSON value, accepting numeric strings such as "7.5/10" or "85%"."""
+    if isinstance(value, bool):
+        raise ValueError("boolean is not a number")
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _FIRST_NUMBER.search(str(value))
+    if match is None:
+        raise ValueError(f"no number in {value!r}")
+    number = float(match.group(0))
+    return number / 100.0 if str(value).strip().endswith("%") else number
+
+
+def normalize_parameter_result(raw: Any) -> Dict[str, Any]:
+    """Validated {score, confidence, reasoning, evidence} from one parameter's JSON answer."""
+    if not isinstance(raw, dict):
+        raise OutputParserException(f"Expected a JSON object, got {type(raw).__name__}")
+    try:
+        score = _to_float(raw["score"])
+    except (KeyError, ValueError):
+        raise OutputParserException(f"Missing or non-numeric score: {raw.get('score')!r}")
+    if not math.isfinite(score):
+        raise OutputParserException(f"Non-finite score: {raw.get('score')!r}")
+
+    try:
+        confidence = _to_float(raw.get("confidence", DEFAULT_CONFIDENCE))
+    except ValueError:
+        confidence = DEFAULT_CONFIDENCE
+    if not math.isfinite(confidence):
+        confidence = DEFAULT_CONFIDENCE
+    if 1.0 < confidence <= 100.0:  # answered as a percentage
+        confidence /= 100.0
+
+    evidence_raw = raw.get("evidence") or []
+    if isinstance(evidence_raw, list):
+        evidence: List[str] = [str(e) for e in evidence_raw]
+    else:
+        evidence = [str(evidence_raw)]
+
+    return {
+        "score": max(0.0, min(10.0, score)),
+        "confidence": max(0.0, min(1.0, confidence)),
+        "reasoning": str(raw.get("reasoning", "")).strip(),
+        "evidence": evidence,
+    }
+
+
+class ParameterResultParser(TolerantJsonOutputParser):
+    """Tolerant JSON parser that also validates and clamps a single-parameter answer."""
+
+    def parse_result(self, result, *, partial: bool = False) -> Any:
+        parsed = super().parse_result(result, partial=partial)
+        if partial:
+            return parsed
+        return normalize_parameter_result(parsed)
+
+
+PARAMETER_RESULT_PARSER = ParameterResultParser()
+
+
+def parameter_evaluation(param_id: str, result: Dict[str, Any]) -> ParameterEvaluation:
+    """ParameterEvaluation from a normalize_parameter_result() dict."""
+    return ParameterEvaluation(
+        parameter_id=param_id,
+        parameter_name=PARAMETER_NAMES[param_id],
+        raw_score=result["score"],
+        normalized_score=result["score"] / 10.0,
+        confidence=result["confidence"],
+        reasoning=result["reasoning"],
+        evidence=result["evidence"],
+    )
+
+
+def failed_parameter(param_id: str, reason: str) -> ParameterEvaluation:
+    """Failure marker every parameter node uses: 0.0 score with 0.0 confidence."""
+    return ParameterEvaluation(
+        parameter_id=param_id,
+        parameter_name=PARAMETER_NAMES[param_id],
+        raw_score=0.0,
+        normalized_score=0.0,
+        confidence=0.0,
+        reasoning=reason,
+        evidence=[],
+    )
+
+
+def is_failed_parameter(param_eval: ParameterEvaluation) -> bool:
+    """True for the failed_parameter() marker (0.0 score with 0.0 confidence)."""
+    return param_eval.raw_score == 0.0 and param_eval.confidence == 0.0
+
+
+def make_parameter_node(spec: ParameterSpec) -> NodeFn:
+    """
+    Node for one parameter: writes a ParameterEvaluation into
+    state["parameter_results"][spec.parameter_id], or a failure marker if
+    the LLM call or parsing fails.
+    """
+    param_id = spec.parameter_id
+    prompt = build_parameter_prompt(param_id, spec.system_prompt, spec.user_prompt)
+    chain = prompt | routed_llm | PARAMETER_RESULT_PARSER
+
+    async def evaluate_parameter(state: GraphState) -> dict:
+        try:
+            result = await ainvoke_with_reemit(
+                chain,
+                {
+                    "title": state.get("title", ""),
+                    "logline": state.get("logline", ""),
+                    "genre": state.get("genre", ""),
+                    "content": state.get("content", ""),
+                },
+                PARAMETER_RESULT_PARSER,
+            )
+        except Exception as exc:
+            reason = f"Model failure while evaluating {spec.name}: {exc}"
+            return {"parameter_results": {param_id: failed_parameter(param_id, reason)}}
+
+        return {"parameter_results": {param_id: parameter_evaluation(param_id, result)}}
+
+    evaluate_parameter.__name__ = evaluate_parameter.__qualname__ = f"evaluate_{param_id}"
+    return evaluate_parameter
@@ -0,0 +1,44 @@
+# backend/graph/nodes/prompt_layout.py
+
+"""
+Builds the ChatPromptTemplate a parameter node sends to the LLM.
+
+- "legacy":        the node's own SYSTEM + USER prompt (rubric first, synopsis last).
+- "shared_prefix": shared persona + project block first (marked as a provider
+                   cache breakpoint), per-parameter rubric/schema as the tail.
+"""
+
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+
+from config.app_config import app_config
+from prompts.shared_prefix_prompts import (
+    SHARED_SYSTEM_PROMPT,
+    SHARED_PROJECT_PROMPT,
+    PARAMETER_TAIL_PROMPTS,
+)
+
+LEGACY_LAYOUT = "legacy"
+SHARED_PREFIX_LAYOUT = "shared_prefix"
+
+# OpenAI-compatible cache hint (honoured by OpenRouter for providers that support it)
+CACHE_BREAKPOINT = {"cache_control": {"type": "ephemeral"}}
+
+
+def build_parameter_prompt(parameter_id: str, system_prompt: str, user_prompt: str) -> ChatPromptTemplate:
+    if app_config.prompt_layout != SHARED_PREFIX_LAYOUT:
+        return ChatPromptTemplate.from_messages(
+            [
+                ("system", system_prompt),
+                ("user", user_prompt),
+            ]
+        )
+
+    return ChatPromptTemplate.from_messages(
+        [
+            ("system", SHARED_SYSTEM_PROMPT),
+            HumanMessagePromptTemplate.from_template(
+                SHARED_PROJECT_PROMPT, additional_kwargs=CACHE_BREAKPOINT
+            ),
+            ("user", PARAMETER_TAIL_PROMPTS[parameter_id]),
+        ]
+    )
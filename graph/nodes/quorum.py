@@ -0,0 +1,145 @@
+# backend/graph/nodes/quorum.py
+
+"""
+Quorum fan-out ("quorum" mode).
+
+Runs the ten parameter agents as tasks inside one node and moves on to the
+aggregator once QUORUM_MIN_PARAMETERS of them have succeeded (plus a short
+QUORUM_GRACE_S for stragglers), so tail latency is no longer the slowest
+of ten calls.
+
+Stragglers either keep running and are handed to the caller's
+`on_late_parameter(param_id, ParameterEvaluation)` callback, passed as
+config["configurable"] (the job runner attaches them to the stored job),
+or are cancelled. Either way they are listed in parameter_errors.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import var_child_runnable_config
+
+from config.app_config import app_config
+from models.evaluation_models import ParameterEvaluation
+from services.call_policy import current_deadline, deadline_scope
+from graph.state import GraphState
+from graph.node_wrappers import DEADLINE_EXCEEDED, NodeFn
+from .parameter_node import is_failed_parameter
+
+logger = logging.getLogger(__name__)
+
+# parameter_errors values written by this node
+PENDING = "pending"
+NOT_AWAITED = "not_awaited"
+
+# Keeps late tasks referenced until they finish
+_background: Set[asyncio.Task] = set()
+
+
+async def _run_parameter(
+    param_id: str, evaluator: NodeFn, state: GraphState, config: RunnableConfig
+) -> ParameterEvaluation:
+    # Attribute LLM usage to the parameter rather than to the quorum node
+    metadata = {**(config.get("metadata") or {}), "langgraph_node": param_id}
+    var_child_runnable_config.set({**config, "metadata": metadata})
+    update = await evaluator(state)
+    return update["parameter_results"][param_id]
+
+
+def _deliver_late(param_id: str, on_late: Callable[[str, ParameterEvaluation], Any], task: asyncio.Task) -> None:
+    if task.cancelled() or task.exception() is not None:
+        return
+    try:
+        on_late(param_id, task.result())
+    except Exception:
+        logger.exception("on_late_parameter callback failed for %s", param_id)
+
+
+def make_quorum_node(evaluators: Dict[str, NodeFn]) -> Callable[[GraphState, RunnableConfig], Awaitable[dict]]:
+    """Quorum node over `evaluators` (parameter id -> single-parameter node, built by build_graph)."""
+
+    async def evaluate_with_quorum(state: GraphState, config: RunnableConfig) -> dict:
+        """
+        Node for: ALL TEN PARAMETERS WITH A QUORUM ("quorum" mode)
+
+        Writes the same state["parameter_results"] shape as the fan-out nodes,
+        plus state["parameter_errors"] for every parameter it did not wait for.
+        """
+        quorum = min(max(1, app_config.quorum_min_parameters), len(evaluators))
+        deadline: Optional[float] = current_deadline() or state.get("deadline")
+        on_late = (config.get("configurable") or {}).get("on_late_parameter")
+
+        with deadline_scope(deadline):
+            tasks = {
+                asyncio.ensure_future(_run_parameter(param_id, evaluator, state, config)): param_id
+                for param_id, evaluator in evaluators.items()
+            }
+
+        results: Dict[str, ParameterEvaluation] = {}
+        errors: Dict[str, str] = {}
+        succeeded = 0
+        quorum_reached_at: Optional[float] = None
+        pending = set(tasks)
+
+        try:
+            while pending:
+                timeout = None
+                if deadline:
+                    timeout = deadline - time.time()
+                if quorum_reached_at is not None:
+                    grace_left = quorum_reached_at + app_config.quorum_grace_s - time.monotonic()
+                    timeout = grace_left if timeout is None else min(timeout, grace_left)
+                if timeout is not None and timeout <= 0:
+                    break
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    param_id = tasks[task]
+                    try:
+                        param_eval = task.result()
+                    except Exception as exc:
+                        errors[param_id] = f"error: {exc}"
+                        continue
+                    results[param_id] = param_eval
+                    succeeded += int(not is_failed_parameter(param_eval))
+
+                if quorum_reached_at is None and succeeded >= quorum:
+                    quorum_reached_at = time.monotonic()
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        deadline_passed = bool(deadline) and time.time() >= deadline
+        for task in pending:
+            param_id = tasks[task]
+            if on_late is not None and not deadline_passed:
+                errors[param_id] = PENDING
+                _background.add(task)
+                task.add_done_callback(_background.discard)
+                task.add_done_callback(functools.partial(_deliver_late, param_id, on_late))
+            else:
+                task.cancel()
+                errors[param_id] = DEADLINE_EXCEEDED if deadline_passed else NOT_AWAITED
+
+        if pending and quorum_reached_at is not None:
+            logger.info(
+                "Quorum reached with %d/%d parameters; not waiting for %s",
+                len(results), len(tasks), sorted(errors),
+            )
+        elif pending:
+            logger.warning(
+                "Deadline passed before quorum (%d/%d succeeded); dropping %s",
+                succeeded, quorum, sorted(errors),
+            )
+
+        update: Dict[str, Any] = {"parameter_results": results}
+        if errors:
+            update["parameter_errors"] = errors
+        return update
+
+    return evaluate_with_quorum
@@ -0,0 +1,127 @@
+# backend/graph/nodes/story_digest.py
+
+"""
+Shared "story digest" pre-pass.
+
+When STORY_DIGEST_ENABLED (opt-in), for submissions above
+STORY_DIGEST_MIN_CHARS, one LLM call extracts a compact structured
+breakdown (protagonist, goal, turning points, relationships, setting,
+theme candidates). The ten parameter agents then
+read that digest instead of (or in front of) the raw content. Digests are
+cached by content hash, so title/logline tweaks don't pay for it again.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from config.app_config import app_config
+from services.cache import CacheBackend, build_cache, content_hash
+from services.json_repair import TolerantJsonOutputParser
+from services.llm_backends import backend_for_node, backend_spec
+from services.llm_service import get_llm
+from prompts.digest_templates import STORY_DIGEST_SYSTEM_PROMPT, STORY_DIGEST_USER_PROMPT
+from version.metadata import PROMPT_VERSION
+from graph.state import GraphState
+
+REPLACE_MODE = "replace"
+ALONGSIDE_MODE = "alongside"
+
+_digest_cache: Optional[CacheBackend] = None
+
+
+def _get_digest_cache() -> CacheBackend:
+    global _digest_cache
+    if _digest_cache is None:
+        _digest_cache = build_cache(
+            max_entries=app_config.story_digest_cache_max_entries,
+            ttl_seconds=app_config.eval_cache_ttl_seconds,
+            sqlite_path=app_config.eval_cache_sqlite_path,
+            sqlite_table="story_digests",
+            sqlite_max_entries=app_config.eval_cache_sqlite_max_entries,
+        )
+    return _digest_cache
+
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(v) for v in value if str(v).strip()]
+    return [str(value)] if value else []
+
+
+def render_story_digest(digest: Dict[str, Any]) -> str:
+    """Compact text form injected into the parameter prompts."""
+    lines = [
+        f"PROTAGONIST: {digest.get('protagonist', '')}",
+        f"GOAL: {digest.get('goal', '')}",
+        f"STAKES: {digest.get('stakes', '')}",
+        "TURNING POINTS:",
+        *[f"- {tp}" for tp in _as_list(digest.get("turning_points"))],
+        "RELATIONSHIPS:",
+        *[f"- {rel}" for rel in _as_list(digest.get("relationships"))],
+        f"SETTING: {digest.get('setting', '')}",
+        f"THEME CANDIDATES: {'; '.join(_as_list(digest.get('theme_candidates')))}",
+        f"TONE: {digest.get('tone', '')}",
+    ]
+    return "\n".join(lines)
+
+
+async def build_story_digest(state: GraphState) -> dict:
+    """
+    Node for: SHARED STORY DIGEST
+
+    Writes the structured digest into state["story_digest"] and rewrites
+    state["content"] according to STORY_DIGEST_MODE ("replace" / "alongside").
+    """
+    content = state.get("content", "") or ""
+    if not app_config.story_digest_enabled or len(content) < app_config.story_digest_min_chars:
+        return {}
+
+    cache = _get_digest_cache()
+    cache_key = content_hash(
+        {
+            "content": content,
+            "model": backend_spec(backend_for_node("story_digest")).model,
+            "prompt_version": PROMPT_VERSION,
+        }
+    )
+    cached = await cache.aget(cache_key)
+
+    if cached is not None:
+        digest: Dict[str, Any] = json.loads(cached)
+    else:
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", STORY_DIGEST_SYSTEM_PROMPT),
+                ("user", STORY_DIGEST_USER_PROMPT),
+            ]
+        )
+        chain = prompt | get_llm() | TolerantJsonOutputParser()
+        try:
+            digest = await chain.ainvoke(
+                {
+                    "title": state.get("title", ""),
+                    "logline": state.get("logline", ""),
+                    "genre": state.get("genre", ""),
+                    "content": content,
+                }
+            )
+        except Exception:
+            # Parameter agents simply fall back to reading the raw content
+            return {}
+        if not isinstance(digest, dict) or not digest:
+            return {}
+        await cache.aset(cache_key, json.dumps(digest))
+
+    digest_text = render_story_digest(digest)
+    if app_config.story_digest_mode == ALONGSIDE_MODE:
+        new_content = f"STORY DIGEST:\n{digest_text}\n\nFULL TEXT:\n{content}"
+    else:
+        new_content = f"STORY DIGEST:\n{digest_text}"
+
+    return {"story_digest": digest, "content": new_content}
+
+
+# Optional alias if you ever want node-style naming elsewhere
+story_digest_node = build_story_digest
@@ -42,7 +42,7 @@ def _format_overall_block(overall: OverallEvaluation | None) -> str:
     return " ".join(parts)
 
 
-def summarize_evaluation(state: GraphState) -> GraphState:
+async def summarize_evaluation(state: GraphState) -> GraphState:
     """
     Final node: generate a human-readable coverage-style summary
     from parameter-level scores + overall evaluation.
@@ -69,7 +69,7 @@ def summarize_evaluation(state: GraphState) -> GraphState:
     chain = prompt | llm
 
     try:
-        result = chain.invoke(
+        result = await chain.ainvoke(
             {
                 "title": state.get("title", ""),
                 "logline": state.get("logline", ""),
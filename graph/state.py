@@ -27,11 +27,27 @@ class EvaluationState(TypedDict, total=False):
     genre: str
     content: str
 
+    # Per-evaluation deadline (epoch seconds); parameter nodes stop waiting on the LLM after it
+    deadline: float
+
+    # Set when long content was condensed into a beat digest before evaluation
+    content_digest: Dict[str, Any]
+
+    # Structured story breakdown shared by the parameter agents (story_digest node)
+    story_digest: Dict[str, Any]
+
+    # Revision re-evaluation: only these parameter agents run (fanout graph); the others'
+    # results are carried over from the previous draft in parameter_results
+    rerun_parameters: List[str]
+
     # Per-parameter results, filled by the 10 parameter agents
     # Uses Annotated with merge_dicts reducer to allow parallel node updates
     # Keyed by parameter_id (e.g. "story_engine", "hook_conceptual_recall", etc.)
     parameter_results: Annotated[ParameterMap, merge_dicts]
 
+    # Parameters that produced no result, keyed by parameter_id (e.g. "deadline_exceeded")
+    parameter_errors: Annotated[Dict[str, str], merge_dicts]
+
     # Aggregated results (set by aggregator node)
     overall: OverallEvaluation
     overall_average_score: float
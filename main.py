@@ -1,9 +1,41 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from api.routes_evaluate import router as eval_router
 from api.routes_graph import router as graph_router
+from api.routes_jobs import router as jobs_router
+from api.routes_stats import router as stats_router
+from api.routes_metrics import router as metrics_router
+from services.job_runner import get_job_runner
+from services.log_pipeline import configure_logging, correlation_scope, shutdown_logging
 from version.metadata import API_VERSION
 
-app = FastAPI(title="Scriptwise Evaluator", version=API_VERSION)
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background workers for POST /api/evaluations
+    runner = get_job_runner()
+    await runner.start()
+    yield
+    await runner.stop()
+    shutdown_logging()
+
+
+app = FastAPI(title="Scriptwise Evaluator", version=API_VERSION, lifespan=lifespan)
 
 app.include_router(eval_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")  # /api/evaluations
 app.include_router(graph_router)  # /graph/view
+app.include_router(stats_router, prefix="/api")  # /api/stats/*
+app.include_router(metrics_router)  # /metrics (Prometheus)
+
+
+@app.middleware("http")
+async def correlation_id_middleware(request: Request, call_next):
+    # Every log record emitted while serving the request carries its id
+    with correlation_scope(request.headers.get("X-Request-ID")) as correlation_id:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = correlation_id
+    return response
@@ -20,6 +20,14 @@ class EvaluationVerdict(str, Enum):
     POOR = "poor"
 
 
+# Lower bound of each band (average score); anything below the last is POOR
+VERDICT_CUTOFFS = (
+    (8.5, EvaluationVerdict.EXCELLENT),
+    (7.0, EvaluationVerdict.GOOD),
+    (5.0, EvaluationVerdict.NEEDS_WORK),
+)
+
+
 # ========= LangGraph-internal parameter representations =========
 
 class ParameterState(TypedDict):
@@ -1,5 +1,6 @@
-from typing import Dict, List
-from pydantic import BaseModel
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
 
 
 class ScriptInput(BaseModel):
@@ -44,3 +45,81 @@ class EvaluationResponse(BaseModel):
 
     # overall blended result
     overall: OverallResult
+
+    # parameters without a result, with the reason ("pending", "deadline_exceeded", ...)
+    missing_parameters: Dict[str, str] = Field(default_factory=dict)
+
+
+class RevisionEvaluationRequest(BaseModel):
+    """
+    Body of POST /evaluate/revision.
+    """
+    script: ScriptInput
+    # `fingerprint` of the previous draft's revision response; omit for a first draft
+    previous_fingerprint: Optional[str] = None
+
+
+class ParameterDelta(BaseModel):
+    """
+    Score movement of one parameter between two drafts.
+    """
+    previous_score: Optional[float] = None
+    score: float
+    delta: Optional[float] = None
+    reevaluated: bool      # False = result carried over from the previous draft
+
+
+class RevisionEvaluationResponse(EvaluationResponse):
+    """
+    Response of /evaluate/revision: the evaluation of the new draft plus
+    what was re-run and how the scores moved.
+    """
+    fingerprint: str                              # pass as previous_fingerprint for the next draft
+    previous_fingerprint: Optional[str] = None    # None when no previous draft was found
+    reevaluated_parameters: List[str] = Field(default_factory=list)
+    reused_parameters: List[str] = Field(default_factory=list)
+    parameter_deltas: Dict[str, ParameterDelta] = Field(default_factory=dict)
+    overall_delta: Optional[float] = None
+    changes: Optional[Dict[str, Any]] = None      # scene / paragraph diff summary
+
+
+class BatchEvaluationRequest(BaseModel):
+    """
+    Body of POST /evaluate/batch.
+    """
+    items: List[ScriptInput]
+    # graph runs at once for this batch (capped by BATCH_CONCURRENCY)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of an asynchronous evaluation job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobSubmission(BaseModel):
+    """
+    Returned (202) by POST /evaluations.
+    """
+    job_id: str
+    status: JobStatus
+    status_url: str
+
+
+class JobStatusResponse(BaseModel):
+    """
+    Returned by GET /evaluations/{job_id}.
+
+    parameter_results fills in as individual parameter agents finish;
+    result is only set once the whole evaluation has succeeded.
+    """
+    job_id: str
+    status: JobStatus
+    created_at: float
+    updated_at: float
+    parameter_results: Dict[str, ParameterResult] = Field(default_factory=dict)
+    result: Optional[EvaluationResponse] = None
+    error: Optional[str] = None
@@ -1,3 +1,7 @@
 """Prompts package - Templates and rubrics for LLM prompts."""
 from .base_templates import *
 from .parameter_rubrics import *
+from .parameter_specs import *
+from .fused_prompts import *
+from .shared_prefix_prompts import *
+from .digest_templates import *
@@ -87,3 +87,20 @@ Rules:
 - `evidence` must be a JSON array of strings, not a single string.
 - Do **not** include any extra top-level keys.
 """
+
+
+# "Re-emit JSON only" repair call, used when an answer can't be parsed even
+# after local repair (services/json_repair.py).
+JSON_REEMIT_SYSTEM_PROMPT = """
+You fix malformed JSON. You never change, add or drop content; you only
+make the given answer valid JSON.
+""".strip()
+
+JSON_REEMIT_USER_PROMPT = """
+The answer below was supposed to be a single JSON object but could not be
+parsed. Re-emit it as exactly one valid JSON object with the same keys and
+values. Output the JSON object only: no prose, no code fences.
+
+ANSWER:
+{answer}
+""".strip()
@@ -0,0 +1,79 @@
+# backend/prompts/digest_templates.py
+
+"""
+Prompts for the map stage of long-screenplay evaluation: each chunk of
+scenes is compressed into a structured beat digest.
+"""
+
+SCENE_DIGEST_SYSTEM_PROMPT = """
+You are a story analyst breaking down a screenplay excerpt for coverage.
+
+Compress the excerpt into its dramatic beats. Keep names, goals, reversals,
+decisions and consequences; drop action description, camera direction and
+dialogue wording unless a line is thematically essential.
+""".strip()
+
+
+SCENE_DIGEST_USER_PROMPT = """
+Project: {title} ({genre})
+Logline: {logline}
+
+Excerpt {chunk_label}:
+{chunk}
+
+OUTPUT FORMAT (STRICT JSON ONLY):
+
+{{
+  "scenes": [
+    {{
+      "heading": "INT. LOCATION - TIME",
+      "characters": ["NAME", "NAME"],
+      "beats": ["What happens, who wants what, what changes."],
+      "turn": "The scene's reversal or new information, or empty string."
+    }}
+  ]
+}}
+
+Rules:
+- One entry per scene, in order.
+- At most 3 beats per scene, each a single sentence.
+- DO NOT output anything except the JSON object.
+""".strip()
+
+
+# ---- Whole-story digest shared by the parameter agents ----
+
+STORY_DIGEST_SYSTEM_PROMPT = """
+You are a story analyst preparing a compact, factual breakdown of a project
+so that several specialist reviewers can evaluate it without re-reading the
+full text. Do not judge quality; only extract what is on the page.
+""".strip()
+
+
+STORY_DIGEST_USER_PROMPT = """
+TITLE: {title}
+LOGLINE: {logline}
+GENRE: {genre}
+
+TEXT:
+{content}
+
+OUTPUT FORMAT (STRICT JSON ONLY):
+
+{{
+  "protagonist": "Name, age/role, defining flaw or wound.",
+  "goal": "What the protagonist actively wants and what stands in the way.",
+  "stakes": "What is lost if they fail (personal, relational, societal).",
+  "turning_points": ["Inciting incident...", "Midpoint...", "Crisis...", "Climax...", "Resolution..."],
+  "relationships": ["NAME – relation to protagonist – how it pressures them"],
+  "setting": "Where/when, and what is specific about this world.",
+  "theme_candidates": ["Theme or question the story keeps returning to"],
+  "tone": "Tone and comparable titles if evident."
+}}
+
+Rules:
+- Stay under 350 words in total.
+- Use concrete names and events from the text.
+- DO NOT output anything except the JSON object.
+""".strip()
+
@@ -0,0 +1,76 @@
+# backend/prompts/fused_prompts.py
+
+"""
+Single-call "fused rubric" prompt: all ten parameter rubrics in one request,
+answered as one JSON object keyed by parameter id.
+"""
+
+from .parameter_rubrics import PARAMETER_RUBRICS, PARAMETER_NAMES
+
+
+FUSED_SYSTEM_PROMPT = """
+You are a senior story analyst at a major film studio.
+
+You will judge ONE project on TEN independent craft parameters. Score each
+parameter on its own merits against its own rubric; do not let one
+parameter's score drag the others up or down.
+
+Use the full 0–10 range for every parameter:
+- 0–2  = fundamentally broken.
+- 3–4  = very weak, thin, or confused.
+- 5–6  = functional but generic.
+- 7–8  = strong, clear, professional.
+- 9–10 = outstanding, premium, best-in-class.
+"""
+
+
+def _rubric_sections() -> str:
+    sections = []
+    for idx, (param_id, rubric) in enumerate(PARAMETER_RUBRICS.items(), start=1):
+        sections.append(
+            f"### {idx}. {PARAMETER_NAMES[param_id]}  (key: \"{param_id}\")\n{rubric.strip()}"
+        )
+    return "\n\n".join(sections)
+
+
+def _output_skeleton() -> str:
+    entries = [
+        f'  "{param_id}": {{"score": 0.0, "confidence": 0.0, '
+        f'"reasoning": "...", "evidence": ["..."]}}'
+        for param_id in PARAMETER_RUBRICS
+    ]
+    return "{\n" + ",\n".join(entries) + "\n}"
+
+
+def _escape_braces(text: str) -> str:
+    # ChatPromptTemplate uses str.format-style placeholders
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+FUSED_USER_PROMPT = (
+    "You will be given:\n"
+    "- Title\n- Logline\n- Genre\n- Full synopsis text\n\n"
+    "Evaluate the project against EACH of the following rubrics:\n\n"
+    + _escape_braces(_rubric_sections())
+    + "\n\nOUTPUT FORMAT (STRICT JSON ONLY), one entry per key:\n\n"
+    + _escape_braces(_output_skeleton())
+    + """
+
+Rules:
+- Include ALL ten keys exactly as written above.
+- `score` must be a float between 0 and 10.
+- `confidence` must be a float between 0 and 1.0.
+- `reasoning` is 1–2 focused paragraphs for that parameter only.
+- `evidence` must contain specific beats from the synopsis, not vague opinions.
+- DO NOT output anything except the JSON object.
+
+Now evaluate this project:
+
+TITLE: {title}
+LOGLINE: {logline}
+GENRE: {genre}
+
+SYNOPSIS:
+{content}
+"""
+)
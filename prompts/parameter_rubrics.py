@@ -162,6 +162,20 @@ PARAMETER_RUBRICS = {
     "audience_market": AUDIENCE_MARKET_RUBRIC,
 }
 
+# Human-readable labels, keyed like PARAMETER_RUBRICS
+PARAMETER_NAMES = {
+    "story_engine": "Central Story Engine",
+    "goal_stakes": "Protagonist Goal, Stakes & Conflict Loop",
+    "momentum": "Structural Momentum & Escalation",
+    "protagonist_arc": "Protagonist Arc & Internal Journey",
+    "relationships": "Relationships & Ensemble Dynamics",
+    "emotional_truth": "Emotional & Social Truth",
+    "world_specificity": "World, Uniqueness & Cultural Specificity",
+    "theme_cinema": "Theme & Cinematic Expression",
+    "hook_recall": "Market Hook & Recall Value",
+    "audience_market": "Audience, Positioning & Market Fit",
+}
+
 # =========================
 # FULL PROMPTS PER PARAMETER
 # (SYSTEM + USER)
@@ -0,0 +1,66 @@
+# backend/prompts/parameter_specs.py
+
+"""
+Spec table for the single-parameter evaluation nodes.
+
+Every key of PARAMETER_RUBRICS gets one ParameterSpec; the graph builds one
+node per spec (graph/nodes/parameter_node.py). Adding a parameter means
+adding its rubric, display name and SYSTEM/USER prompts to
+parameter_rubrics.py and one line to _PARAMETER_PROMPTS below.
+"""
+
+from dataclasses import dataclass
+
+from .parameter_rubrics import (
+    PARAMETER_RUBRICS,
+    PARAMETER_NAMES,
+    STORY_ENGINE_SYSTEM_PROMPT,
+    STORY_ENGINE_USER_PROMPT,
+    GOAL_STAKES_SYSTEM_PROMPT,
+    GOAL_STAKES_USER_PROMPT,
+    MOMENTUM_SYSTEM_PROMPT,
+    MOMENTUM_USER_PROMPT,
+    PROTAGONIST_ARC_SYSTEM_PROMPT,
+    PROTAGONIST_ARC_USER_PROMPT,
+    RELATIONSHIPS_SYSTEM_PROMPT,
+    RELATIONSHIPS_USER_PROMPT,
+    EMOTIONAL_TRUTH_SYSTEM_PROMPT,
+    EMOTIONAL_TRUTH_USER_PROMPT,
+    WORLD_SPECIFICITY_SYSTEM_PROMPT,
+    WORLD_SPECIFICITY_USER_PROMPT,
+    THEME_CINEMA_SYSTEM_PROMPT,
+    THEME_CINEMA_USER_PROMPT,
+    HOOK_RECALL_SYSTEM_PROMPT,
+    HOOK_RECALL_USER_PROMPT,
+    AUDIENCE_MARKET_SYSTEM_PROMPT,
+    AUDIENCE_MARKET_USER_PROMPT,
+)
+
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    parameter_id: str
+    name: str
+    system_prompt: str  # "legacy" prompt layout only; shared_prefix uses PARAMETER_TAIL_PROMPTS
+    user_prompt: str
+
+
+# (SYSTEM, USER) prompt pair per parameter
+_PARAMETER_PROMPTS = {
+    "story_engine": (STORY_ENGINE_SYSTEM_PROMPT, STORY_ENGINE_USER_PROMPT),
+    "goal_stakes": (GOAL_STAKES_SYSTEM_PROMPT, GOAL_STAKES_USER_PROMPT),
+    "momentum": (MOMENTUM_SYSTEM_PROMPT, MOMENTUM_USER_PROMPT),
+    "protagonist_arc": (PROTAGONIST_ARC_SYSTEM_PROMPT, PROTAGONIST_ARC_USER_PROMPT),
+    "relationships": (RELATIONSHIPS_SYSTEM_PROMPT, RELATIONSHIPS_USER_PROMPT),
+    "emotional_truth": (EMOTIONAL_TRUTH_SYSTEM_PROMPT, EMOTIONAL_TRUTH_USER_PROMPT),
+    "world_specificity": (WORLD_SPECIFICITY_SYSTEM_PROMPT, WORLD_SPECIFICITY_USER_PROMPT),
+    "theme_cinema": (THEME_CINEMA_SYSTEM_PROMPT, THEME_CINEMA_USER_PROMPT),
+    "hook_recall": (HOOK_RECALL_SYSTEM_PROMPT, HOOK_RECALL_USER_PROMPT),
+    "audience_market": (AUDIENCE_MARKET_SYSTEM_PROMPT, AUDIENCE_MARKET_USER_PROMPT),
+}
+
+# Keyed (and ordered) like PARAMETER_RUBRICS
+PARAMETER_SPECS = {
+    param_id: ParameterSpec(param_id, PARAMETER_NAMES[param_id], *_PARAMETER_PROMPTS[param_id])
+    for param_id in PARAMETER_RUBRICS
+}
@@ -0,0 +1,50 @@
+# backend/prompts/shared_prefix_prompts.py
+
+"""
+"Shared prefix" prompt layout for the ten parameter calls.
+
+Every call starts with the same byte-identical block (system persona +
+title/logline/genre/synopsis) so providers can serve it from their prompt
+cache; only the per-parameter tail (focus, rubric, output schema) differs.
+"""
+
+from .base_templates import SCORING_GUIDANCE, OUTPUT_JSON_INSTRUCTIONS
+from .parameter_rubrics import PARAMETER_RUBRICS, PARAMETER_NAMES
+
+
+SHARED_SYSTEM_PROMPT = """
+You are a senior story analyst at a major film studio.
+
+You will read one project and then be asked to judge exactly ONE craft
+parameter of it. Judge only that parameter, be blunt, and use the full
+0–10 range.
+""" + SCORING_GUIDANCE
+
+
+SHARED_PROJECT_PROMPT = """
+TITLE: {title}
+LOGLINE: {logline}
+GENRE: {genre}
+
+SYNOPSIS:
+{content}
+"""
+
+
+def _escape_braces(text: str) -> str:
+    # ChatPromptTemplate uses str.format-style placeholders
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _parameter_tail(param_id: str) -> str:
+    return _escape_braces(
+        f"Evaluate the project above ONLY for: {PARAMETER_NAMES[param_id].upper()}\n\n"
+        "Use the following rubric as your checklist:\n"
+        f"{PARAMETER_RUBRICS[param_id]}\n"
+        f"{OUTPUT_JSON_INSTRUCTIONS}\n"
+        "DO NOT output anything except the JSON object."
+    )
+
+
+# Per-parameter tail, keyed like PARAMETER_RUBRICS
+PARAMETER_TAIL_PROMPTS = {param_id: _parameter_tail(param_id) for param_id in PARAMETER_RUBRICS}
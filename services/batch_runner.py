@@ -0,0 +1,469 @@
+# backend/services/batch_runner.py
+
+"""
+Batch evaluation of many scripts (submission slates), shared by
+POST /api/evaluate/batch and the offline CLI.
+
+- At most BATCH_CONCURRENCY graph runs happen at once per process, across
+  every batch running in it. Items are read lazily, so a JSONL input of
+  any size is streamed rather than loaded.
+- Scripts with the same fingerprint are evaluated once per batch; later
+  copies get the first one's result, marked with `duplicate_of`.
+- Whole-evaluation cache hits (EVAL_CACHE_*) are served without a graph run.
+
+Every item yields one output record as it completes (not in input order):
+    {"line", "id", "title", "fingerprint", "status": "ok"|"error", "cached",
+     "duplicate_of", "elapsed_s", "result", "error"}
+
+CLI usage (from the backend root):
+    python -m services.batch_runner slate.jsonl results.jsonl
+        [--mode fanout] [--concurrency 8] [--processes 1] [--retry-failed]
+        [--provider-batch]
+
+Each input line is a JSON ScriptInput (title, logline, genre, content),
+optionally with an "id" that is copied to the output. Results are appended
+to the output file as they finish. Re-running the same command resumes:
+lines that already have a record are skipped (failed ones too, unless
+--retry-failed, in which case the newer record for a line supersedes the
+older one). A throughput summary is printed at the end.
+
+With --processes N the input is sharded by fingerprint over N worker
+processes (duplicates stay in one process), each running
+concurrency / N graph runs at once. The parent writes the output file.
+
+With --provider-batch the LLM calls of all graph runs in flight are sent
+through the provider's batch API (services/provider_batch.py) instead of
+one request each: cheaper and higher aggregate throughput, but each LLM
+round of a graph waits for a whole batch, so there is no evaluation
+deadline and --concurrency should be large (hundreds of scripts).
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import queue
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config.app_config import app_config
+from models.io_models import ScriptInput, EvaluationResponse
+from services.evaluation_service import (
+    get_graph,
+    resolve_mode,
+    evaluation_config,
+    evaluation_input,
+    discard_checkpoint,
+    build_evaluation_response,
+    script_fingerprint,
+    get_cached_evaluation,
+    store_evaluation,
+    is_cacheable,
+)
+from services.call_policy import deadline_scope
+from services.cache import content_hash
+from services.log_pipeline import correlation_scope, new_correlation_id
+from services.provider_batch import ProviderBatch, provider_batch_scope
+
+OK = "ok"
+ERROR = "error"
+
+_END = object()
+_global_slots: Optional[asyncio.Semaphore] = None
+
+
+def batch_slots() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent graph runs for batch work (BATCH_CONCURRENCY)."""
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(max(1, app_config.batch_concurrency))
+    return _global_slots
+
+
+@dataclass
+class BatchItem:
+    line: int  # 1-based position in the input
+    script: Optional[ScriptInput] = None
+    record_id: Optional[Any] = None
+    error: Optional[str] = None  # the input line itself was invalid
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    ok: int = 0
+    failed: int = 0
+    evaluated: int = 0  # graph runs
+    cached: int = 0
+    duplicates: int = 0
+    skipped: int = 0  # already completed in a previous run
+    started: float = field(default_factory=time.perf_counter)
+    latencies: List[float] = field(default_factory=list)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.total += 1
+        if record["status"] != OK:
+            self.failed += 1
+            return
+        self.ok += 1
+        if record["duplicate_of"] is not None:
+            self.duplicates += 1
+        elif record["cached"]:
+            self.cached += 1
+        else:
+            self.evaluated += 1
+            self.latencies.append(record["elapsed_s"])
+
+    def as_dict(self) -> Dict[str, Any]:
+        wall = time.perf_counter() - self.started
+        ordered = sorted(self.latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3) if ordered else None
+
+        return {
+            "total": self.total,
+            "ok": self.ok,
+            "failed": self.failed,
+            "evaluated": self.evaluated,
+            "cached": self.cached,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "wall_s": round(wall, 3),
+            "scripts_per_s": round(self.ok / wall, 3) if wall else 0.0,
+            "evaluations_per_min": round(60 * self.evaluated / wall, 2) if wall else 0.0,
+            "latency_p50_s": percentile(0.50),
+            "latency_p95_s": percentile(0.95),
+        }
+
+
+class BatchRunner:
+    """Evaluates BatchItems with bounded concurrency and per-batch de-duplication."""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        slots: Optional[asyncio.Semaphore] = None,
+        batch_id: Optional[str] = None,
+        provider_batch: Optional[ProviderBatch] = None,
+    ) -> None:
+        self.mode = resolve_mode(mode)
+        self.slots = slots or batch_slots()
+        self.concurrency = max(1, concurrency or app_config.batch_concurrency)
+        self._limit = asyncio.Semaphore(self.concurrency)  # this batch's share of the slots
+        self.batch_id = batch_id or new_correlation_id()
+        self.provider_batch = provider_batch
+        # fingerprint -> (line that runs it, future of (result, cached, error))
+        self._seen: Dict[str, Tuple[int, asyncio.Future]] = {}
+
+    async def run(self, items: Iterable[BatchItem]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one output record per item, in completion order."""
+        outbox: asyncio.Queue = asyncio.Queue()
+        # Bounds the items in flight (and so memory) independently of the input size
+        window_size = self.concurrency * 4
+        window = asyncio.Semaphore(window_size)
+        tasks: Set[asyncio.Task] = set()
+
+        async def one(item: BatchItem) -> None:
+            try:
+                await outbox.put(await self._process(item))
+            finally:
+                window.release()
+
+        async def feed() -> None:
+            try:
+                for item in items:
+                    await window.acquire()
+                    task = asyncio.create_task(one(item))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                for _ in range(window_size):  # wait for the last items
+                    await window.acquire()
+            finally:
+                outbox.put_nowait(_END)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                record = await outbox.get()
+                if record is _END:
+                    break
+                yield record
+            await feeder
+        finally:
+            feeder.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    async def _process(self, item: BatchItem) -> Dict[str, Any]:
+        started = time.perf_counter()
+        record: Dict[str, Any] = {
+            "line": item.line,
+            "id": item.record_id,
+            "title": item.script.title if item.script else None,
+            "fingerprint": None,
+            "status": ERROR,
+            "cached": False,
+            "duplicate_of": None,
+            "elapsed_s": 0.0,
+            "result": None,
+            "error": item.error,
+        }
+        if item.script is None:
+            return record
+
+        fingerprint = script_fingerprint(item.script, self.mode)
+        record["fingerprint"] = fingerprint
+        first = self._seen.get(fingerprint)
+        if first is None:
+            future = asyncio.get_running_loop().create_future()
+            self._seen[fingerprint] = (item.line, future)
+            try:
+                with correlation_scope(f"{self.batch_id}:{item.line}"):
+                    future.set_result(await self._evaluate(item.script, fingerprint))
+            finally:
+                future.cancel()  # no-op once set; releases waiting duplicates if this task is cancelled
+        else:
+            record["duplicate_of"], future = first
+        result, cached, error = await future
+
+        record["elapsed_s"] = round(time.perf_counter() - started, 3)
+        if error is not None:
+            record["error"] = error
+            return record
+        record.update(status=OK, cached=cached, result=result.model_dump())
+        return record
+
+    async def _evaluate(
+        self, script: ScriptInput, fingerprint: str
+    ) -> Tuple[Optional[EvaluationResponse], bool, Optional[str]]:
+        """(result, served from cache, error) for one distinct script."""
+        cached = await get_cached_evaluation(fingerprint)
+        if cached is not None:
+            return cached, True, None
+        try:
+            async with self._limit, self.slots:
+                # Checkpointed per batch + script, so re-running an interrupted batch resumes it
+                config = evaluation_config(script, f"{self.batch_id}:{fingerprint}", self.mode)
+                # Built inside the slot so queueing doesn't eat the evaluation deadline
+                graph_input, deadline = await evaluation_input(script, config)
+                if self.provider_batch is not None:
+                    # Batch turnaround is minutes to hours
+                    deadline = None
+                    if graph_input is not None:
+                        graph_input.pop("deadline", None)
+                with deadline_scope(deadline), provider_batch_scope(self.provider_batch):
+                    state_out = await get_graph(self.mode).ainvoke(graph_input, config)
+            await discard_checkpoint(config)
+            result = build_evaluation_response(script, state_out)
+        except Exception as exc:
+            return None, False, str(exc) or type(exc).__name__
+        if is_cacheable(state_out):
+            await store_evaluation(fingerprint, result)
+        return result, False, None
+
+
+# ---- JSONL input / output ----
+
+def read_batch_file(path: str, skip_lines: Optional[Set[int]] = None) -> Iterator[BatchItem]:
+    """BatchItems from a JSONL file of ScriptInput records (blank lines are ignored)."""
+    skip_lines = skip_lines or set()
+    with open(path, encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, start=1):
+            if not line.strip() or line_no in skip_lines:
+                continue
+            try:
+                data = json.loads(line)
+                script = ScriptInput.model_validate(data)
+            except Exception as exc:
+                yield BatchItem(line=line_no, error=f"Invalid input line: {exc}")
+                continue
+            yield BatchItem(line=line_no, script=script, record_id=data.get("id"))
+
+
+def completed_lines(output_path: str, retry_failed: bool = False) -> Set[int]:
+    """Input lines that already have a record in `output_path` (a torn last line is ignored)."""
+    path = Path(output_path)
+    if not path.exists():
+        return set()
+    done: Set[int] = set()
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == OK or not retry_failed:
+                done.add(record["line"])
+    return done
+
+
+class _OutputWriter:
+    """Appends records to the output JSONL, one flushed line each."""
+
+    def __init__(self, path: str) -> None:
+        self._fh = open(path, "a+", encoding="utf-8")
+        self._fh.seek(0, 2)
+        if self._fh.tell() > 0:
+            self._fh.seek(self._fh.tell() - 1)
+            if self._fh.read(1) != "\n":  # previous run died mid-line
+                self._fh.write("\n")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+# ---- CLI ----
+
+def _shard_items(
+    items: Iterable[BatchItem], mode: str, rank: int, processes: int
+) -> Iterator[BatchItem]:
+    for item in items:
+        if item.script is None:
+            shard = 0
+        else:
+            shard = int(script_fingerprint(item.script, mode)[:8], 16) % processes
+        if shard == rank:
+            yield item
+
+
+@dataclass
+class _FileRun:
+    """Everything a worker needs to evaluate its share of an input file (picklable for spawn)."""
+
+    input_path: str
+    mode: str
+    concurrency: int
+    skip: Set[int]
+    batch_id: str  # stable per output file, so checkpoints of an interrupted run are found again
+    provider_batch: bool = False
+
+
+async def _run_in_process(run: _FileRun, emit, rank: int = 0, processes: int = 1) -> None:
+    batch = ProviderBatch() if run.provider_batch else None
+    runner = BatchRunner(
+        mode=run.mode,
+        concurrency=run.concurrency,
+        slots=asyncio.Semaphore(run.concurrency),
+        batch_id=run.batch_id,
+        provider_batch=batch,
+    )
+    items = read_batch_file(run.input_path, run.skip)
+    if processes > 1:
+        items = _shard_items(items, run.mode, rank, processes)
+    try:
+        async for record in runner.run(items):
+            emit(record)
+    finally:
+        if batch is not None:
+            await batch.aclose()
+
+
+def _child_main(run: _FileRun, rank: int, processes: int, out) -> None:
+    try:
+        asyncio.run(_run_in_process(run, out.put, rank, processes))
+    finally:
+        out.put(None)
+
+
+def run_file(
+    input_path: str,
+    output_path: str,
+    mode: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    processes: int = 1,
+    retry_failed: bool = False,
+    provider_batch: bool = False,
+) -> Dict[str, Any]:
+    """Evaluate a JSONL file into `output_path`, resuming where a previous run stopped; returns the summary."""
+    processes = max(1, processes)
+    skip = completed_lines(output_path, retry_failed)
+    run = _FileRun(
+        input_path=input_path,
+        mode=resolve_mode(mode),
+        concurrency=max(1, concurrency or app_config.batch_concurrency),
+        skip=skip,
+        batch_id="file-" + content_hash(str(Path(output_path).resolve()))[:16],
+        provider_batch=provider_batch,
+    )
+
+    summary = BatchSummary(skipped=len(skip))
+    writer = _OutputWriter(output_path)
+
+    def emit(record: Dict[str, Any]) -> None:
+        writer.write(record)
+        summary.add(record)
+
+    try:
+        if processes == 1:
+            asyncio.run(_run_in_process(run, emit))
+        else:
+            _run_processes(run, processes, emit)
+    finally:
+        writer.close()
+    return summary.as_dict()
+
+
+def _run_processes(run: _FileRun, processes: int, emit) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    per_process = replace(run, concurrency=max(1, run.concurrency // processes))
+    workers = [
+        ctx.Process(target=_child_main, args=(per_process, rank, processes, out))
+        for rank in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    running = processes
+    while running:
+        try:
+            record = out.get(timeout=1.0)
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                break  # a worker died without its end marker
+            continue
+        if record is None:
+            running -= 1
+        else:
+            emit(record)
+    for worker in workers:
+        worker.join()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of ScriptInput records")
+    parser.add_argument("output", help="JSONL file results are appended to (also the resume point)")
+    parser.add_argument("--mode", default=None, help="graph mode (default: EVALUATION_MODE)")
+    parser.add_argument("--concurrency", type=int, default=None, help="graph runs at once (default: BATCH_CONCURRENCY)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to shard the input over")
+    parser.add_argument("--retry-failed", action="store_true", help="re-run lines whose previous record is an error")
+    parser.add_argument(
+        "--provider-batch", action="store_true", help="send LLM calls through the provider's batch API (slow, cheaper)"
+    )
+    args = parser.parse_args(argv)
+
+    summary = run_file(
+        args.input,
+        args.output,
+        mode=args.mode,
+        concurrency=args.concurrency,
+        processes=args.processes,
+        retry_failed=args.retry_failed,
+        provider_batch=args.provider_batch,
+    )
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+# backend/services/cache.py
+
+"""
+Small key/value cache backends used to avoid paying twice for identical work.
+
+- LRUCache:    in-process, bounded by entry count + TTL.
+- SQLiteCache: on-disk, shared by every uvicorn worker on the host.
+- TieredCache: checks tiers in order and back-fills the faster ones on a hit.
+
+Values are plain strings (callers store JSON), keys are content hashes.
+Async callers use aget() / aset(): SQLite I/O then runs in a worker thread
+instead of on the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def content_hash(payload: Any) -> str:
+    """Stable sha256 over a JSON-serialisable payload."""
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Minimal interface every cache tier implements."""
+
+    name: str = "cache"
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": self.size(),
+        }
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe in-process LRU with optional TTL (ttl_seconds <= 0 disables expiry)."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 0.0) -> None:
+        super().__init__()
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and (time.time() - stored_at) > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            if self._expired(stored_at):
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    async def aget(self, key: str) -> Optional[str]:
+        return self.get(key)  # no I/O; not worth a thread hop
+
+    async def aset(self, key: str, value: str) -> None:
+        self.set(key, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk cache shared across processes via SQLite (WAL mode).
+
+    Eviction runs every `prune_every` writes: expired rows are dropped first,
+    then the least-recently-accessed rows beyond `max_entries`.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "cache",
+        max_entries: int = 50_000,
+        ttl_seconds: float = 0.0,
+        prune_every: int = 64,
+    ) -> None:
+        super().__init__()
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self.path = path
+        self.table = table
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.prune_every = max(1, prune_every)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed_idx ON {table}(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds > 0 and (now - created_at) > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        if self.ttl_seconds > 0:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self.evictions += max(cur.rowcount, 0)
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += max(cur.rowcount, 0)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return count
+
+
+class TieredCache(CacheBackend):
+    """Looks up tiers in order (fastest first); a hit in a slow tier back-fills the faster ones."""
+
+    name = "tiered"
+
+    def __init__(self, tiers: List[CacheBackend]) -> None:
+        super().__init__()
+        if not tiers:
+            raise ValueError("TieredCache needs at least one tier")
+        self.tiers = tiers
+
+    def get(self, key: str) -> Optional[str]:
+        for idx, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster in self.tiers[:idx]:
+                    faster.set(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    async def aget(self, key: str) -> Optional[str]:
+        for idx, tier in enumerate(self.tiers):
+            value = await tier.aget(key)
+            if value is not None:
+                for faster in self.tiers[:idx]:
+                    await faster.aset(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    async def aset(self, key: str, value: str) -> None:
+        for tier in self.tiers:
+            await tier.aset(key, value)
+
+    def delete(self, key: str) -> None:
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def size(self) -> int:
+        return self.tiers[0].size()
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data["tiers"] = [tier.stats() for tier in self.tiers]
+        return data
+
+
+def build_cache(
+    max_entries: int,
+    ttl_seconds: float,
+    sqlite_path: str = "",
+    sqlite_table: str = "cache",
+    sqlite_max_entries: int = 50_000,
+) -> CacheBackend:
+    """Memory-only LRU, or memory LRU in front of SQLite when a path is configured."""
+    memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if not sqlite_path:
+        return memory
+    disk = SQLiteCache(
+        sqlite_path,
+        table=sqlite_table,
+        max_entries=sqlite_max_entries,
+        ttl_seconds=ttl_seconds,
+    )
+    return TieredCache([memory, disk])
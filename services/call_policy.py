@@ -0,0 +1,272 @@
+# backend/services/call_policy.py
+
+"""
+Retry / timeout / hedging policy for outbound LLM calls.
+
+- Retries:  full-jitter exponential backoff on timeouts, connection errors,
+            429 and 5xx (the provider SDK's own retries are disabled).
+- Timeouts: every provider call gets a per-call timeout, clipped to the
+            remaining per-evaluation budget.
+- Hedging:  once a call has run longer than the observed p95 latency, a
+            duplicate is fired and whichever answers first wins. Latency
+            is tracked per latency key (model and node), so fast cascade
+            small-model calls don't set the hedge for large-model escalations,
+            fused or summary calls.
+
+The per-evaluation deadline travels in graph state ("deadline", epoch
+seconds); graph/node_wrappers.py publishes it to this module through a
+context variable for the duration of a node.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional, TypeVar
+
+from openai import APIConnectionError
+
+from services.metrics import failure_reason, llm_hedges, llm_retries
+from services.rate_limiter import error_status
+from services.usage_recorder import current_node
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = {408, 409, 429}
+
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_call_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The per-evaluation budget ran out before (or while) calling the provider."""
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    """Make `deadline` (epoch seconds) visible to every LLM call made inside the block."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """Deadline (epoch seconds) set by the innermost deadline_scope, if any."""
+    return _deadline.get()
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the current evaluation's deadline (None = no deadline)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, DeadlineExceeded):
+        return False
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, APIConnectionError)):
+        return True
+    status = error_status(exc)
+    return status is not None and (status in RETRYABLE_STATUSES or status >= 500)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies used to place the hedge."""
+
+    def __init__(self, max_samples: int = 512) -> None:
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class CallPolicy:
+    def __init__(
+        self,
+        max_retries: int = 2,
+        base_delay_s: float = 0.5,
+        max_delay_s: float = 8.0,
+        timeout_s: float = 120.0,
+        hedge_enabled: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_min_delay_s: float = 1.0,
+    ) -> None:
+        self.max_retries = max(0, max_retries)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.timeout_s = timeout_s
+        self.hedge_enabled = hedge_enabled
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay_s = hedge_min_delay_s
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._latency_lock = threading.Lock()
+
+        self.retries = 0
+        self.timeouts = 0
+        self.deadline_exceeded = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    # ---- building blocks ----
+
+    def latency(self, key: str = "") -> LatencyTracker:
+        """Latency window of one kind of call (e.g. "model/node")."""
+        with self._latency_lock:
+            tracker = self._latency.get(key)
+            if tracker is None:
+                tracker = self._latency[key] = LatencyTracker()
+            return tracker
+
+    def call_timeout(self) -> Optional[float]:
+        """Per-call timeout, clipped to the evaluation's remaining budget."""
+        timeout = self.timeout_s if self.timeout_s > 0 else None
+        budget = remaining_budget()
+        if budget is None:
+            return timeout
+        if budget <= 0:
+            self.deadline_exceeded += 1
+            raise DeadlineExceeded("Evaluation deadline exceeded")
+        return budget if timeout is None else min(timeout, budget)
+
+    def retry_delay(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Backoff before retry number `attempt + 1`, or None if we should give up."""
+        if isinstance(exc, (asyncio.TimeoutError, TimeoutError)) and not isinstance(exc, DeadlineExceeded):
+            self.timeouts += 1
+        if attempt >= self.max_retries or not is_retryable(exc):
+            return None
+        delay = random.uniform(0, min(self.max_delay_s, self.base_delay_s * (2 ** attempt)))
+        budget = remaining_budget()
+        if budget is not None and delay >= budget:
+            return None
+        self.retries += 1
+        llm_retries.inc(node=current_node(), reason=failure_reason(exc))
+        return delay
+
+    def hedge_delay(self, latency_key: str = "") -> Optional[float]:
+        if not self.hedge_enabled:
+            return None
+        tracker = self._latency.get(latency_key)
+        p = tracker.quantile(self.hedge_quantile, self.hedge_min_samples) if tracker is not None else None
+        if p is None:
+            return None
+        return max(self.hedge_min_delay_s, p)
+
+    # ---- async ----
+
+    async def _timed(
+        self, call: Callable[[Optional[float]], Awaitable[T]], timeout: Optional[float], latency_key: str
+    ) -> T:
+        started = time.perf_counter()
+        result = await call(timeout)
+        self.latency(latency_key).record(time.perf_counter() - started)
+        return result
+
+    async def _hedged(
+        self, call: Callable[[Optional[float]], Awaitable[T]], timeout: Optional[float], latency_key: str
+    ) -> T:
+        delay = self.hedge_delay(latency_key)
+        if delay is None:
+            return await self._timed(call, timeout, latency_key)
+
+        primary = asyncio.ensure_future(self._timed(call, timeout, latency_key))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges_fired += 1
+            llm_hedges.inc(node=current_node(), outcome="fired")
+            hedge = asyncio.ensure_future(self._timed(call, timeout, latency_key))
+            tasks.append(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                            llm_hedges.inc(node=current_node(), outcome="won")
+                        return task.result()
+            # Both failed: surface the primary's error to the retry loop
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark retrieved so the loser isn't logged
+
+    async def arun(
+        self, call: Callable[[Optional[float]], Awaitable[T]], hedge: bool = True, latency_key: str = ""
+    ) -> T:
+        """
+        Run `call(timeout)` under the policy. `call` must perform exactly one
+        provider request and honour the timeout it is given; `latency_key`
+        selects the latency window that places its hedge.
+        """
+        attempt = 0
+        while True:
+            timeout = self.call_timeout()
+            try:
+                if hedge:
+                    return await self._hedged(call, timeout, latency_key)
+                return await self._timed(call, timeout, latency_key)
+            except Exception as exc:
+                delay = self.retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    # ---- sync ----
+
+    def run(self, call: Callable[[Optional[float]], T], latency_key: str = "") -> T:
+        """Blocking counterpart of `arun` (no hedging)."""
+        attempt = 0
+        while True:
+            timeout = self.call_timeout()
+            started = time.perf_counter()
+            try:
+                result = call(timeout)
+            except Exception as exc:
+                delay = self.retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+            else:
+                self.latency(latency_key).record(time.perf_counter() - started)
+                return result
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._latency_lock:
+            keys = sorted(self._latency)
+        return {
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "deadline_exceeded": self.deadline_exceeded,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            # Per latency key ("model/node")
+            "hedge_delay_s": {key: self.hedge_delay(key) for key in keys},
+            "latency_p50_s": {key: self.latency(key).quantile(0.50) for key in keys},
+            "latency_p95_s": {key: self.latency(key).quantile(0.95) for key in keys},
+        }
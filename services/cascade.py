@@ -0,0 +1,102 @@
+# backend/services/cascade.py
+
+"""
+Two-tier model cascade for parameter evaluations.
+
+Each parameter runs on the small model first and is re-run on the large
+model only when the answer is low-confidence, failed, or sits within a
+margin of a verdict cut-off (where a small scoring error could flip the
+band). CascadeStats keeps per-tier latency / token cost and the
+escalation rate so the savings can be checked against verdict drift.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from config.llm_config import llm_config
+from models.evaluation_models import ParameterEvaluation, VERDICT_CUTOFFS
+from services.usage_recorder import LLMCallRecord
+
+SMALL_TIER = "small"
+LARGE_TIER = "large"
+
+
+def escalation_reason(
+    param_eval: ParameterEvaluation,
+    min_confidence: float,
+    band_margin: float,
+    cutoffs: Sequence[float] = tuple(cutoff for cutoff, _ in VERDICT_CUTOFFS),
+) -> Optional[str]:
+    """Why a small-tier result must be re-run on the large model (None = keep it)."""
+    # Imported here: graph/node_wrappers.py imports this module while the graph nodes load
+    from graph.nodes.parameter_node import is_failed_parameter
+
+    if is_failed_parameter(param_eval):
+        return "failed"
+    if param_eval.confidence < min_confidence:
+        return "low_confidence"
+    for cutoff in cutoffs:
+        if abs(param_eval.raw_score - cutoff) < band_margin:
+            return f"near_cutoff_{cutoff}"
+    return None
+
+
+def tier_cost(tier: str, records: List[LLMCallRecord]) -> float:
+    """USD cost of the captured calls at the tier's configured per-1M-token prices."""
+    if tier == SMALL_TIER:
+        price_in, price_out = llm_config.llm_cascade_small_price_in, llm_config.llm_cascade_small_price_out
+    else:
+        price_in, price_out = llm_config.llm_cascade_large_price_in, llm_config.llm_cascade_large_price_out
+    prompt = sum(rec.prompt_tokens for rec in records)
+    completion = sum(rec.completion_tokens for rec in records)
+    return (prompt * price_in + completion * price_out) / 1_000_000
+
+
+class CascadeStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+        self._parameters = 0
+        self._escalations = 0
+        self._reasons: Dict[str, int] = {}
+
+    def record_tier(self, tier: str, latency_s: float, records: List[LLMCallRecord]) -> None:
+        with self._lock:
+            totals = self._tiers.setdefault(
+                tier,
+                {"runs": 0, "latency_s": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0},
+            )
+            totals["runs"] += 1
+            totals["latency_s"] += latency_s
+            totals["prompt_tokens"] += sum(rec.prompt_tokens for rec in records)
+            totals["completion_tokens"] += sum(rec.completion_tokens for rec in records)
+            totals["cost_usd"] += tier_cost(tier, records)
+
+    def record_decision(self, reason: Optional[str]) -> None:
+        with self._lock:
+            self._parameters += 1
+            if reason is not None:
+                self._escalations += 1
+                self._reasons[reason] = self._reasons.get(reason, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {tier: dict(t) for tier, t in self._tiers.items()}
+            parameters, escalations, reasons = self._parameters, self._escalations, dict(self._reasons)
+        return {
+            "parameters": parameters,
+            "escalations": escalations,
+            "escalation_rate": escalations / parameters if parameters else 0.0,
+            "escalation_reasons": reasons,
+            "tiers": {
+                tier: {
+                    **t,
+                    "avg_latency_s": t["latency_s"] / t["runs"] if t["runs"] else 0.0,
+                    "avg_cost_usd": t["cost_usd"] / t["runs"] if t["runs"] else 0.0,
+                }
+                for tier, t in tiers.items()
+            },
+        }
+
+
+cascade_stats = CascadeStats()
@@ -0,0 +1,409 @@
+# backend/services/checkpoint_store.py
+
+"""
+SQLite-backed LangGraph checkpointer, so an interrupted evaluation resumes
+instead of paying again for the nodes that already finished.
+
+build_graph() compiles every graph with get_checkpointer(); each run is
+keyed by its evaluation id (the LangGraph thread_id, see
+evaluation_service.evaluation_config). LangGraph saves a checkpoint after
+every super-step and each node's writes as soon as the node finishes, so
+re-invoking an evaluation id whose run died (process restart, summary
+call failing after nine of ten parameters) with input None re-runs only
+the nodes that have no saved writes. Successful runs delete their thread.
+
+Storage is kept small and cheap to write:
+- channel values live in their own rows keyed by (channel, version), so a
+  super-step only writes the channels it changed; the script content is
+  stored once per evaluation, not once per checkpoint;
+- values are msgpack (JsonPlusSerializer) and zlib-compressed (level 1)
+  above CHECKPOINT_COMPRESS_MIN_BYTES;
+- WAL mode with synchronous=NORMAL, one short transaction per write.
+
+The async API runs the same SQLite calls in a worker thread, so a slow
+disk never stalls the event loop.
+
+Threads untouched for CHECKPOINT_TTL_S are dropped when the store opens.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from config.app_config import app_config
+
+logger = logging.getLogger(__name__)
+
+_COMPRESSED = "+zlib"
+_EMPTY = "empty"
+
+# Types the graph state carries besides plain JSON (msgpack allowlist)
+STATE_TYPES = [
+    ("models.evaluation_models", "ParameterEvaluation"),
+    ("models.evaluation_models", "OverallEvaluation"),
+    ("models.evaluation_models", "EvaluationVerdict"),
+]
+
+
+class CompactSerializer(JsonPlusSerializer):
+    """msgpack serializer that zlib-compresses payloads of `compress_min_bytes` or more."""
+
+    def __init__(self, compress_min_bytes: int = 1024, **kwargs: Any) -> None:
+        kwargs.setdefault("allowed_msgpack_modules", STATE_TYPES)
+        super().__init__(**kwargs)
+        self.compress_min_bytes = compress_min_bytes
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = super().dumps_typed(obj)
+        if self.compress_min_bytes > 0 and len(data) >= self.compress_min_bytes:
+            return type_ + _COMPRESSED, zlib.compress(data, 1)
+        return type_, data
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.endswith(_COMPRESSED):
+            type_, payload = type_[: -len(_COMPRESSED)], zlib.decompress(payload)
+        return super().loads_typed((type_, payload))
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[int]):
+    """LangGraph checkpoint saver on a local SQLite file, safe to share across threads."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = 0.0,
+        compress_min_bytes: int = 1024,
+    ) -> None:
+        super().__init__(serde=CompactSerializer(compress_min_bytes))
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " thread_id TEXT NOT NULL,"
+            " checkpoint_ns TEXT NOT NULL,"
+            " checkpoint_id TEXT NOT NULL,"
+            " parent_id TEXT,"
+            " type TEXT NOT NULL,"
+            " checkpoint BLOB NOT NULL,"
+            " metadata_type TEXT NOT NULL,"
+            " metadata BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id));"
+            "CREATE INDEX IF NOT EXISTS checkpoints_created_idx ON checkpoints(created_at);"
+            "CREATE TABLE IF NOT EXISTS checkpoint_blobs ("
+            " thread_id TEXT NOT NULL,"
+            " checkpoint_ns TEXT NOT NULL,"
+            " channel TEXT NOT NULL,"
+            " version TEXT NOT NULL,"
+            " type TEXT NOT NULL,"
+            " value BLOB,"
+            " PRIMARY KEY (thread_id, checkpoint_ns, channel, version));"
+            "CREATE TABLE IF NOT EXISTS checkpoint_writes ("
+            " thread_id TEXT NOT NULL,"
+            " checkpoint_ns TEXT NOT NULL,"
+            " checkpoint_id TEXT NOT NULL,"
+            " task_id TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " channel TEXT NOT NULL,"
+            " type TEXT NOT NULL,"
+            " value BLOB,"
+            " task_path TEXT NOT NULL DEFAULT '',"
+            " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx));"
+        )
+        self._conn.commit()
+        if ttl_seconds > 0:
+            self.expire(ttl_seconds)
+
+    # ---- reads ----
+
+    def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self._conn.execute(
+                "SELECT type, value FROM checkpoint_blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row is None or row[0] == _EMPTY:
+                continue
+            values[channel] = self.serde.loads_typed((row[0], row[1]))
+        return values
+
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        rows = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM checkpoint_writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return [(task_id, channel, self.serde.loads_typed((type_, value))) for task_id, channel, type_, value in rows]
+
+    def _to_tuple(self, row: Tuple[Any, ...]) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, checkpoint, metadata_type, metadata = row
+        saved: Checkpoint = self.serde.loads_typed((type_, checkpoint))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **saved,
+                "channel_values": self._load_blobs(thread_id, checkpoint_ns, saved["channel_versions"]),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    _COLUMNS = "thread_id, checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata"
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM checkpoints"
+                    " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM checkpoints"
+                    " WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._to_tuple(row) if row is not None else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses: List[str] = []
+        args: List[Any] = []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            args.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                args.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                args.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            args.append(before_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM checkpoints{where} ORDER BY checkpoint_id DESC", args
+            ).fetchall()
+
+        remaining = limit
+        for row in rows:
+            if remaining is not None and remaining <= 0:
+                break
+            with self._lock:
+                checkpoint_tuple = self._to_tuple(row)
+            if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if remaining is not None:
+                remaining -= 1
+            yield checkpoint_tuple
+
+    # ---- writes ----
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        saved = checkpoint.copy()
+        values: Dict[str, Any] = saved.pop("channel_values")  # type: ignore[misc]
+        blobs = []
+        for channel, version in new_versions.items():
+            type_, value = self.serde.dumps_typed(values[channel]) if channel in values else (_EMPTY, None)
+            blobs.append((thread_id, checkpoint_ns, channel, str(version), type_, value))
+        type_, payload = self.serde.dumps_typed(saved)
+        metadata_type, metadata_payload = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_blobs"
+                " (thread_id, checkpoint_ns, channel, version, type, value) VALUES (?, ?, ?, ?, ?, ?)",
+                blobs,
+            )
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO checkpoints ({self._COLUMNS}, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),  # parent
+                    type_,
+                    payload,
+                    metadata_type,
+                    metadata_payload,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, payload = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id, checkpoint_ns, checkpoint_id, task_id,
+                WRITES_IDX_MAP.get(channel, idx), channel, type_, payload, task_path,
+            ))
+        # Special channels (errors, interrupts) are overwritten; regular writes are kept if already saved
+        all_special = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        verb = "INSERT OR REPLACE" if all_special else "INSERT OR IGNORE"
+        with self._lock:
+            self._conn.executemany(
+                f"{verb} INTO checkpoint_writes"
+                " (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+
+    def expire(self, max_age_s: float) -> int:
+        """Delete every thread whose latest checkpoint is older than `max_age_s`; returns the count."""
+        cutoff = time.time() - max_age_s
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?", (cutoff,)
+            ).fetchall()
+        for (thread_id,) in rows:
+            self.delete_thread(thread_id)
+        if rows:
+            logger.info("Dropped %d expired evaluation checkpoints", len(rows))
+        return len(rows)
+
+    def thread_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT thread_id) FROM checkpoints").fetchone()[0]
+
+    # ---- async API (SQLite I/O runs in a worker thread, off the event loop) ----
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_checkpointer: Optional[SQLiteCheckpointSaver] = None
+
+
+def get_checkpointer() -> Optional[SQLiteCheckpointSaver]:
+    """Process-wide checkpointer (None when CHECKPOINT_SQLITE_PATH is empty)."""
+    global _checkpointer
+    if _checkpointer is None and app_config.checkpoint_sqlite_path:
+        _checkpointer = SQLiteCheckpointSaver(
+            app_config.checkpoint_sqlite_path,
+            ttl_seconds=app_config.checkpoint_ttl_s,
+            compress_min_bytes=app_config.checkpoint_compress_min_bytes,
+        )
+    return _checkpointer
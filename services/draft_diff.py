@@ -0,0 +1,203 @@
+# backend/services/draft_diff.py
+
+"""
+Diff two drafts of a script and estimate which parameters the edits can move.
+
+diff_drafts() compares scenes first (split on sluglines, services/segmenter.py)
+and, inside scenes that changed, paragraphs (blank-line separated), after
+collapsing whitespace so reflowed text doesn't count as an edit. Every
+changed paragraph is classified by where it sits in the new draft
+(opening / middle / ending) and by what it is (dialogue / action /
+setting); removed paragraphs are classified the same way, placed at the
+end of the new paragraph they followed. Added or removed scenes count as
+a structural change.
+
+affected_parameters() maps those change kinds onto parameters through
+REVISION_IMPACT. Drafts that changed more than REVISION_FULL_RERUN_SHARE of
+their text are re-evaluated in full.
+"""
+
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Set, Tuple
+
+from config.app_config import app_config
+from models.io_models import ScriptInput
+from prompts.parameter_specs import PARAMETER_SPECS
+from services.segmenter import SLUGLINE_RE, iter_lines, iter_scenes
+
+# Change kinds -> parameters they can move
+REVISION_IMPACT: Dict[str, Tuple[str, ...]] = {
+    "title": ("hook_recall", "audience_market"),
+    "logline": ("hook_recall", "audience_market"),
+    "genre": ("audience_market", "world_specificity"),
+    "structure": ("story_engine", "goal_stakes", "momentum"),  # scenes added / removed
+    "opening": ("hook_recall", "goal_stakes"),
+    "middle": ("momentum",),
+    "ending": ("story_engine", "protagonist_arc", "theme_cinema"),
+    "dialogue": ("relationships", "emotional_truth"),
+    "action": ("momentum", "theme_cinema"),
+    "setting": ("world_specificity",),
+}
+
+# Relative position in the new draft where the opening ends / the ending starts
+OPENING_END = 0.25
+ENDING_START = 0.75
+
+_WS_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+# A character cue: a short all-caps line, optionally with (V.O.) / (CONT'D)
+_CUE_RE = re.compile(r"^[A-Z][A-Z0-9 .'\-]{0,38}(?:\s*\([A-Z.' ]+\))?$")
+
+
+@dataclass
+class DraftDiff:
+    title_changed: bool = False
+    logline_changed: bool = False
+    genre_changed: bool = False
+    scenes_added: int = 0
+    scenes_removed: int = 0
+    scenes_changed: int = 0
+    paragraphs_changed: int = 0
+    changed_share: float = 0.0  # changed characters / draft size
+    kinds: Set[str] = field(default_factory=set)
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.kinds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "title_changed": self.title_changed,
+            "logline_changed": self.logline_changed,
+            "genre_changed": self.genre_changed,
+            "scenes_added": self.scenes_added,
+            "scenes_removed": self.scenes_removed,
+            "scenes_changed": self.scenes_changed,
+            "paragraphs_changed": self.paragraphs_changed,
+            "changed_share": round(self.changed_share, 4),
+            "kinds": sorted(self.kinds),
+        }
+
+
+def _normalize(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _scenes(content: str) -> List[List[str]]:
+    """Normalised paragraphs of every scene."""
+    scenes = []
+    for scene in iter_scenes(iter_lines(content.replace("\r\n", "\n"))):
+        paragraphs = [_normalize(p) for p in _BLANK_LINES_RE.split(scene.text)]
+        scenes.append([p for p in paragraphs if p])
+    return scenes
+
+
+def _paragraph_kind(raw: str) -> str:
+    first = raw.split("\n", 1)[0].strip()
+    if SLUGLINE_RE.match(first + " "):
+        return "setting"
+    if "\n" in raw.strip() and _CUE_RE.match(first):
+        return "dialogue"
+    return "action"
+
+
+def _region(position: float) -> str:
+    if position < OPENING_END:
+        return "opening"
+    if position >= ENDING_START:
+        return "ending"
+    return "middle"
+
+
+def _raw_paragraphs(content: str) -> Dict[str, str]:
+    """Normalised paragraph -> its raw text (kept for classifying dialogue by its line layout)."""
+    raw: Dict[str, str] = {}
+    for scene in iter_scenes(iter_lines(content.replace("\r\n", "\n"))):
+        for paragraph in _BLANK_LINES_RE.split(scene.text):
+            if paragraph.strip():
+                raw.setdefault(_normalize(paragraph), paragraph)
+    return raw
+
+
+def diff_drafts(previous: ScriptInput, current: ScriptInput) -> DraftDiff:
+    """Scene- and paragraph-level diff of `current` against `previous`."""
+    diff = DraftDiff(
+        title_changed=_normalize(previous.title) != _normalize(current.title),
+        logline_changed=_normalize(previous.logline) != _normalize(current.logline),
+        genre_changed=_normalize(previous.genre).casefold() != _normalize(current.genre).casefold(),
+    )
+    for kind, changed in (("title", diff.title_changed), ("logline", diff.logline_changed), ("genre", diff.genre_changed)):
+        if changed:
+            diff.kinds.add(kind)
+
+    old_scenes = _scenes(previous.content)
+    new_scenes = _scenes(current.content)
+    new_size = sum(len(p) for scene in new_scenes for p in scene)
+    old_size = sum(len(p) for scene in old_scenes for p in scene)
+    size = max(new_size, old_size, 1)
+    length = max(new_size, 1)  # edits are located relative to the new draft
+
+    # Character offset of each new scene, for locating edits in the new draft
+    starts: List[int] = []
+    offset = 0
+    for scene in new_scenes:
+        starts.append(offset)
+        offset += sum(len(p) for p in scene)
+    starts.append(offset)
+
+    raw = _raw_paragraphs(current.content)
+    old_raw = _raw_paragraphs(previous.content)
+    changed_chars = 0
+    matcher = SequenceMatcher(None, ["\n\n".join(s) for s in old_scenes], ["\n\n".join(s) for s in new_scenes], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        diff.scenes_added += max(0, (j2 - j1) - (i2 - i1))
+        diff.scenes_removed += max(0, (i2 - i1) - (j2 - j1))
+        diff.scenes_changed += min(i2 - i1, j2 - j1)
+
+        old_paragraphs = [p for scene in old_scenes[i1:i2] for p in scene]
+        new_paragraphs: List[Tuple[int, str]] = []
+        for j in range(j1, j2):
+            position = starts[j]
+            for paragraph in new_scenes[j]:
+                new_paragraphs.append((position, paragraph))
+                position += len(paragraph)
+
+        inner = SequenceMatcher(None, old_paragraphs, [p for _, p in new_paragraphs], autojunk=False)
+        for ptag, a1, a2, b1, b2 in inner.get_opcodes():
+            if ptag == "equal":
+                continue
+            for position, paragraph in new_paragraphs[b1:b2]:
+                diff.kinds.add(_region(position / length))
+                diff.kinds.add(_paragraph_kind(raw.get(paragraph, paragraph)))
+                changed_chars += len(paragraph)
+            removed = old_paragraphs[a1 + (b2 - b1):a2]  # old paragraphs left without a counterpart
+            if removed:
+                # Deleted text is located at the end of the new paragraph it followed
+                if b2 > 0:
+                    position = new_paragraphs[b2 - 1][0] + len(new_paragraphs[b2 - 1][1]) - 1
+                else:
+                    position = starts[j1] - 1
+                diff.kinds.add(_region(min(max(position, 0) / length, 1.0)))
+                for paragraph in removed:
+                    diff.kinds.add(_paragraph_kind(old_raw.get(paragraph, paragraph)))
+                    changed_chars += len(paragraph)
+            diff.paragraphs_changed += max(a2 - a1, b2 - b1)
+
+    if diff.scenes_added or diff.scenes_removed:
+        diff.kinds.add("structure")
+    diff.changed_share = min(1.0, changed_chars / size)
+    return diff
+
+
+def affected_parameters(diff: DraftDiff) -> List[str]:
+    """Parameters to re-run for a revision with `diff` (in PARAMETER_SPECS order)."""
+    if diff.changed_share >= app_config.revision_full_rerun_share:
+        return list(PARAMETER_SPECS)
+    affected: Set[str] = set()
+    for kind in diff.kinds:
+        affected.update(REVISION_IMPACT.get(kind, ()))
+    return [param_id for param_id in PARAMETER_SPECS if param_id in affected]
@@ -0,0 +1,290 @@
+# backend/services/evaluation_service.py
+
+"""
+Glue between the HTTP layer and the LangGraph pipeline.
+
+- Owns the compiled graph used by the API.
+- Builds the initial graph state from a ScriptInput.
+- Maps the final graph state onto the public EvaluationResponse.
+- Memoizes whole evaluations by script fingerprint.
+- Keys graph checkpoints by evaluation id, so an interrupted evaluation
+  resumes from its last completed nodes.
+"""
+
+import logging
+import re
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from config.app_config import app_config
+from config.llm_config import llm_config
+from graph.graph_builder import build_graph, EVALUATION_MODES
+from graph.nodes.parameter_node import is_failed_parameter
+from models.evaluation_models import ParameterEvaluation
+from models.io_models import ScriptInput, EvaluationResponse, ParameterResult, OverallResult
+from services.cache import CacheBackend, build_cache, content_hash
+from services.checkpoint_store import get_checkpointer
+from services.llm_backends import backend_spec, parameter_backends
+from version.metadata import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+_graphs: Dict[str, Any] = {}
+
+
+def resolve_mode(mode: Optional[str] = None) -> str:
+    """Per-request mode if given, else the EVALUATION_MODE default."""
+    mode = mode or app_config.evaluation_mode
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"Unknown evaluation mode: {mode!r} (expected one of {EVALUATION_MODES})")
+    return mode
+
+
+def get_graph(mode: Optional[str] = None):
+    """Compiled graph for a topology; each one is compiled once per process."""
+    mode = resolve_mode(mode)
+    if mode not in _graphs:
+        _graphs[mode] = build_graph(mode)
+    return _graphs[mode]
+
+
+app_graph = get_graph()
+
+
+# ---- state in / response out ----
+
+def new_deadline() -> Optional[float]:
+    """Deadline (epoch seconds) for an evaluation starting now; None if EVALUATION_DEADLINE_S is 0."""
+    if app_config.evaluation_deadline_s > 0:
+        return time.time() + app_config.evaluation_deadline_s
+    return None
+
+
+def build_initial_state(script: ScriptInput) -> Dict[str, Any]:
+    state: Dict[str, Any] = {
+        "title": script.title,
+        "logline": script.logline,
+        "genre": script.genre,
+        "content": script.content,
+    }
+    deadline = new_deadline()
+    if deadline is not None:
+        state["deadline"] = deadline
+    return state
+
+
+# ---- checkpointed runs ----
+
+def new_evaluation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def evaluation_config(
+    script: ScriptInput, evaluation_id: str, mode: Optional[str] = None, **configurable: Any
+) -> Dict[str, Any]:
+    """
+    Graph config for one evaluation. Its checkpoints are keyed by mode and
+    evaluation id (the LangGraph thread_id); the script fingerprint is
+    saved with them so a reused id with a different script starts over.
+    """
+    mode = resolve_mode(mode)
+    return {
+        "configurable": {
+            "thread_id": f"{mode}:{evaluation_id}",
+            "fingerprint": script_fingerprint(script, mode),
+            **configurable,
+        }
+    }
+
+
+async def evaluation_input(
+    script: ScriptInput, config: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+    """
+    (graph input, deadline) for running `script` under `config`: the
+    initial state of a new run, or None (= resume) and a fresh deadline if
+    a run of the same evaluation id was checkpointed and interrupted.
+    Run the graph inside call_policy.deadline_scope(deadline).
+    """
+    checkpointer = get_checkpointer()
+    if checkpointer is not None:
+        saved = await checkpointer.aget_tuple(config)
+        if saved is not None:
+            thread_id = config["configurable"]["thread_id"]
+            if saved.metadata.get("fingerprint") == config["configurable"]["fingerprint"]:
+                logger.info("Resuming evaluation %s from step %s", thread_id, saved.metadata.get("step"))
+                return None, new_deadline()
+            logger.info("Evaluation %s was checkpointed for another script; starting over", thread_id)
+            await checkpointer.adelete_thread(thread_id)
+    state = build_initial_state(script)
+    return state, state.get("deadline")
+
+
+async def discard_checkpoint(config: Dict[str, Any]) -> None:
+    """Drop the checkpoints of an evaluation that completed (they are only needed to resume)."""
+    checkpointer = get_checkpointer()
+    if checkpointer is not None:
+        await checkpointer.adelete_thread(config["configurable"]["thread_id"])
+
+
+def to_parameter_result(param_eval: ParameterEvaluation) -> ParameterResult:
+    return ParameterResult(
+        name=param_eval.parameter_name,
+        score=param_eval.raw_score,
+        reasoning=param_eval.reasoning,
+        suggestions=param_eval.evidence,  # Using evidence as suggestions
+    )
+
+
+def build_evaluation_response(script: ScriptInput, state_out: Dict[str, Any]) -> EvaluationResponse:
+    # Map parameter_results to ParameterResult format for API response
+    param_results = state_out.get("parameter_results", {})
+    parameters_response = {
+        param_id: to_parameter_result(param_eval)
+        for param_id, param_eval in param_results.items()
+    }
+
+    # Build overall result from aggregated state
+    overall_result = OverallResult(
+        score=state_out.get("overall_average_score", 0.0),
+        verdict_band=state_out.get("overall_verdict", "poor"),
+        verdict_text=state_out.get("verdict_text", "Evaluation complete"),
+        top_strengths=state_out.get("top_strengths", []),
+        development_areas=state_out.get("development_areas", []),
+        global_summary=state_out.get("summary", ""),  # summary node stores under "summary" key
+    )
+
+    return EvaluationResponse(
+        title=script.title,
+        logline=script.logline,
+        genre=script.genre,
+        parameters=parameters_response,
+        overall=overall_result,
+        missing_parameters=dict(state_out.get("parameter_errors") or {}),
+    )
+
+
+def attach_parameter(
+    response: EvaluationResponse, param_id: str, param_eval: ParameterEvaluation
+) -> EvaluationResponse:
+    """Fold a late (post-quorum) parameter result into an already built response."""
+    parameters = {**response.parameters, param_id: to_parameter_result(param_eval)}
+    missing = {pid: reason for pid, reason in response.missing_parameters.items() if pid != param_id}
+    return response.model_copy(update={"parameters": parameters, "missing_parameters": missing})
+
+
+# ---- fingerprinting + memoization ----
+
+_WS_RE = re.compile(r"[ \t]+")
+
+
+def _normalize_line(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _normalize_content(text: str) -> str:
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(_normalize_line(line) for line in lines).strip()
+
+
+def script_fingerprint(script: ScriptInput, mode: Optional[str] = None) -> str:
+    """
+    Stable identity of an evaluation: normalised script fields plus the
+    backend/model routing, graph mode, prompt version/layout and the
+    content pre-passes (long-content condensing, story digest) that would produce it.
+    """
+    return content_hash(
+        {
+            "title": _normalize_line(script.title),
+            "logline": _normalize_line(script.logline),
+            "genre": _normalize_line(script.genre).casefold(),
+            "content": _normalize_content(script.content),
+            "backend": llm_config.llm_backend,
+            "model": backend_spec(llm_config.llm_backend).model,
+            "parameter_backends": parameter_backends(),
+            "temperature": backend_spec(llm_config.llm_backend).temperature,
+            "mode": resolve_mode(mode),
+            "prompt_layout": app_config.prompt_layout,
+            "prompt_version": PROMPT_VERSION,
+            "cascade": (
+                {
+                    backend: backend_spec(backend).small_model
+                    for backend in sorted({llm_config.llm_backend, *parameter_backends().values()})
+                }
+                if llm_config.llm_cascade_enabled
+                else None
+            ),
+            "long_content": [
+                app_config.long_content_threshold_chars,
+                app_config.segment_chunk_chars,
+                app_config.segment_digest_max_tokens,
+            ],
+            "story_digest": (
+                [app_config.story_digest_min_chars, app_config.story_digest_mode]
+                if app_config.story_digest_enabled
+                else None
+            ),
+        }
+    )
+
+
+_evaluation_cache: Optional[CacheBackend] = None
+
+
+def get_evaluation_cache() -> Optional[CacheBackend]:
+    global _evaluation_cache
+    if not app_config.eval_cache_enabled:
+        return None
+    if _evaluation_cache is None:
+        _evaluation_cache = build_cache(
+            max_entries=app_config.eval_cache_max_entries,
+            ttl_seconds=app_config.eval_cache_ttl_seconds,
+            sqlite_path=app_config.eval_cache_sqlite_path,
+            sqlite_table="evaluations",
+            sqlite_max_entries=app_config.eval_cache_sqlite_max_entries,
+        )
+    return _evaluation_cache
+
+
+async def get_cached_evaluation(fingerprint: str) -> Optional[EvaluationResponse]:
+    cache = get_evaluation_cache()
+    if cache is None:
+        return None
+    raw = await cache.aget(fingerprint)
+    if raw is None:
+        return None
+    return EvaluationResponse.model_validate_json(raw)
+
+
+def is_cacheable(state_out: Dict[str, Any]) -> bool:
+    """Don't memoize partial runs or runs where a parameter node fell back to its 0.0 failure result."""
+    if state_out.get("parameter_errors"):
+        return False
+    for param_eval in (state_out.get("parameter_results") or {}).values():
+        if is_failed_parameter(param_eval):
+            return False
+    return bool(state_out.get("parameter_results"))
+
+
+async def store_evaluation(fingerprint: str, response: EvaluationResponse) -> bool:
+    """Memoize `response`; False if the evaluation cache is off (then it gets no ETag either)."""
+    cache = get_evaluation_cache()
+    if cache is None:
+        return False
+    await cache.aset(fingerprint, response.model_dump_json())
+    return True
+
+
+def etag_for(fingerprint: str) -> str:
+    return f'"{fingerprint}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
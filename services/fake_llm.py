@@ -0,0 +1,323 @@
+# backend/services/fake_llm.py
+
+"""
+Offline LLM stand-ins for measuring orchestration overhead without paying
+for provider calls.
+
+- FakeLLM:     BaseChatModel with the same call surface as OpenRouterLLM,
+               answering with canned node-shaped responses (or replaying a
+               cassette) after a latency drawn from a LatencyModel.
+- RecordingLLM: wraps a real LLM and appends every response to a cassette
+               (JSONL, keyed by the prompt) so a run can be replayed later.
+
+Install either process-wide with services.llm_service.install_llm().
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from prompts.parameter_rubrics import PARAMETER_RUBRICS
+from services.cache import content_hash
+from services.usage_recorder import LLMCallRecord, current_node, usage_recorder
+
+FIXED = "fixed"
+UNIFORM = "uniform"
+NORMAL = "normal"
+LOGNORMAL = "lognormal"
+RECORDED = "recorded"  # replay the latency captured in the cassette
+DISTRIBUTIONS = (FIXED, UNIFORM, NORMAL, LOGNORMAL, RECORDED)
+
+
+# ---- canned responses ----
+
+def _parameter_json(seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "score": round(rng.uniform(4.0, 9.5), 1),
+        "confidence": round(rng.uniform(0.6, 0.95), 2),
+        "reasoning": "Stand-in analysis: the premise sets up a clear engine and the escalation is legible.",
+        "evidence": ["Stand-in evidence beat one.", "Stand-in evidence beat two."],
+    }
+
+
+def canned_response(prompt: str) -> str:
+    """Deterministic response shaped after what the prompt asks for."""
+    seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12], 16)
+
+    if '"scenes"' in prompt:
+        return json.dumps({
+            "scenes": [{
+                "heading": "INT. HARBOUR OFFICE - NIGHT",
+                "characters": ["MAREN"],
+                "beats": ["Maren learns the ferry will stop running."],
+                "turn": "She decides to fight the closure.",
+            }]
+        })
+    if '"theme_candidates"' in prompt:
+        return json.dumps({
+            "protagonist": "Maren, 52, harbour master, burned out.",
+            "goal": "Get the town to leave together before the ferry stops.",
+            "stakes": "The community scatters or is stranded.",
+            "turning_points": ["Ferry cancelled", "Son returns", "Storm", "Child missing", "Last crossing"],
+            "relationships": ["Son - estranged - wants to sell the boathouse"],
+            "setting": "A shrinking northern island.",
+            "theme_candidates": ["Leaving versus belonging"],
+            "tone": "Quiet drama.",
+        })
+    if all(f'"{param_id}"' in prompt for param_id in PARAMETER_RUBRICS):
+        return json.dumps({
+            param_id: _parameter_json(seed + i) for i, param_id in enumerate(PARAMETER_RUBRICS)
+        })
+    if '"score"' in prompt:
+        return json.dumps(_parameter_json(seed))
+    return (
+        "Stand-in summary: a clear, emotionally grounded premise with a workable "
+        "engine; escalation and market positioning need sharpening."
+    )
+
+
+def estimate_usage(prompt: str, completion: str) -> Dict[str, int]:
+    """Rough chars/4 token counts, shaped like LangChain usage_metadata."""
+    input_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(completion) // 4)
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    parts = []
+    for message in messages:
+        content = message.content
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        parts.append(str(content))
+    return "\n".join(parts)
+
+
+# ---- latency ----
+
+class LatencyModel:
+    """
+    Per-call latency in seconds. `mean_ms` is the centre of the
+    distribution and `spread_ms` its width (uniform half-width, normal
+    standard deviation, or the lognormal sigma expressed in ms at the mean).
+    """
+
+    def __init__(
+        self,
+        distribution: str = FIXED,
+        mean_ms: float = 200.0,
+        spread_ms: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution!r} (expected one of {DISTRIBUTIONS})")
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.spread_ms = spread_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, recorded_s: Optional[float] = None) -> float:
+        with self._lock:
+            if self.distribution == RECORDED and recorded_s is not None:
+                return recorded_s
+            if self.distribution == UNIFORM:
+                ms = self._rng.uniform(self.mean_ms - self.spread_ms, self.mean_ms + self.spread_ms)
+            elif self.distribution == NORMAL:
+                ms = self._rng.gauss(self.mean_ms, self.spread_ms)
+            elif self.distribution == LOGNORMAL and self.mean_ms > 0:
+                sigma = self.spread_ms / self.mean_ms
+                ms = self._rng.lognormvariate(math.log(self.mean_ms), sigma)
+            else:
+                ms = self.mean_ms
+        return max(0.0, ms) / 1000
+
+
+# ---- cassettes ----
+
+def cassette_key(messages: List[BaseMessage], stop: Optional[List[str]] = None) -> str:
+    """Prompt identity for record/replay (model-independent, so recordings survive a model swap)."""
+    return content_hash({
+        "messages": [(message.type, message.content) for message in messages],
+        "stop": stop,
+    })
+
+
+class Cassette:
+    """Append-only JSONL file of {"key", "text", "usage", "latency_s"} records."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(key)
+
+    def append(self, key: str, text: str, usage: Dict[str, Any], latency_s: float) -> None:
+        entry = {"key": key, "text": text, "usage": usage, "latency_s": latency_s}
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# ---- models ----
+
+class FakeLLM(BaseChatModel):
+    """Answers from a cassette (replay) or canned_response(), after a simulated latency."""
+
+    latency: Any = None
+    cassette: Any = None
+    strict_replay: bool = False
+    model: str = "fake"
+    calls: int = 0
+    replay_misses: int = 0
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        cassette: Optional[Cassette] = None,
+        strict_replay: bool = False,
+        model: str = "fake",
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.latency = latency or LatencyModel()
+        self.cassette = cassette
+        self.strict_replay = strict_replay
+        self.model = model
+
+    def _respond(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> tuple:
+        """(text, usage_metadata, delay_s) for one call."""
+        self.calls += 1
+        entry = self.cassette.get(cassette_key(messages, stop)) if self.cassette is not None else None
+        if entry is not None:
+            return entry["text"], entry.get("usage") or {}, self.latency.sample(entry.get("latency_s"))
+
+        if self.cassette is not None:
+            self.replay_misses += 1
+            if self.strict_replay:
+                raise KeyError("Prompt not found in cassette (strict replay)")
+        prompt = _prompt_text(messages)
+        text = canned_response(prompt)
+        return text, estimate_usage(prompt, text), self.latency.sample()
+
+    def _result(self, text: str, usage: Dict[str, Any], run_manager: Optional[Any], delay: float) -> ChatResult:
+        usage_recorder.record(
+            LLMCallRecord(
+                node=current_node(run_manager),
+                model=self.model,
+                prompt_tokens=usage.get("input_tokens", 0),
+                cached_tokens=0,
+                completion_tokens=usage.get("output_tokens", 0),
+                latency_s=delay,
+            )
+        )
+        message = AIMessage(content=text, usage_metadata=usage or None)
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"model_name": self.model, "token_usage": usage},
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, usage, delay = self._respond(messages, stop)
+        time.sleep(delay)
+        return self._result(text, usage, run_manager, delay)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, usage, delay = self._respond(messages, stop)
+        await asyncio.sleep(delay)
+        return self._result(text, usage, run_manager, delay)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+
+class RecordingLLM(BaseChatModel):
+    """Delegates to a real LLM and appends each response to a cassette."""
+
+    inner: Any = None
+    cassette: Any = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def __init__(self, inner: BaseChatModel, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.inner = inner
+        self.cassette = cassette
+
+    def _save(self, messages: List[BaseMessage], stop: Optional[List[str]], result: ChatResult, started: float) -> None:
+        message = result.generations[0].message
+        self.cassette.append(
+            cassette_key(messages, stop),
+            message.content,
+            dict(getattr(message, "usage_metadata", None) or {}),
+            time.perf_counter() - started,
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        started = time.perf_counter()
+        result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        self._save(messages, stop, result, started)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        started = time.perf_counter()
+        result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        self._save(messages, stop, result, started)
+        return result
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording:{self.inner._llm_type}"
@@ -0,0 +1,245 @@
+# backend/services/job_runner.py
+
+"""
+Bounded in-process worker pool for asynchronous evaluation jobs.
+
+POST /evaluations persists a job and drops its id on an asyncio queue;
+`concurrency` worker tasks pull ids off the queue and run the graph,
+saving partial parameter results as each parameter node finishes.
+In "quorum" mode, parameters that finish after the job succeeded are
+attached to the stored result as they arrive.
+
+Jobs are claimed atomically in the JobStore before they run, so
+several uvicorn workers can share one jobs database without running a
+job twice; each renews its claims every JOBS_LEASE_S / 3 and re-queues
+running jobs whose lease expired (a dead worker's), along with queued
+jobs nobody picked up within the lease (left in a dead worker's memory).
+Re-queueing never blocks the heartbeat: ids that don't fit in the local
+queue stay queued in the database and are swept again on a later tick.
+
+The graph is checkpointed under the job id, so a job picked up again
+after a restart resumes from the nodes it had already finished.
+
+JobStore calls are SQLite I/O and run in a worker thread (asyncio.to_thread),
+never on the event loop.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from config.app_config import app_config
+from models.evaluation_models import ParameterEvaluation
+from services.call_policy import deadline_scope
+from services.evaluation_service import (
+    app_graph,
+    evaluation_config,
+    evaluation_input,
+    discard_checkpoint,
+    build_evaluation_response,
+    attach_parameter,
+    script_fingerprint,
+    get_cached_evaluation,
+    store_evaluation,
+    is_cacheable,
+)
+from services.job_store import JobStore
+from services.log_pipeline import correlation_scope
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class JobRunner:
+    def __init__(self, store: JobStore, concurrency: int, queue_max: int, lease_s: float = 60.0) -> None:
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        self.queue_max = max(1, queue_max)
+        self.lease_s = lease_s
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # Ids sitting in the local queue, so sweeps don't enqueue them twice
+        self._pending: Set[str] = set()
+        # Late-parameter attaches, kept referenced until they finish
+        self._background: Set[asyncio.Task] = set()
+        self._attach_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_max)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"evaluation-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        # Pick up anything left queued, or running under an expired lease, by a previous process
+        stale = await asyncio.to_thread(self.store.requeue_stale, self.lease_s)
+        unfinished = await asyncio.to_thread(self.store.queued_job_ids)
+        if unfinished:
+            logger.info("Resuming %d unfinished evaluation jobs (%d from dead workers)", len(unfinished), len(stale))
+            self._enqueue(unfinished)
+        self._workers.append(asyncio.create_task(self._keep_leases(), name="evaluation-job-leases"))
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, script) -> str:
+        if self._queue is None:
+            raise RuntimeError("JobRunner.start() has not been called")
+        if self._queue.full():
+            raise JobQueueFull(f"Evaluation queue is full ({self.queue_max} jobs)")
+        job_id = await asyncio.to_thread(self.store.create, script)
+        try:
+            self._queue.put_nowait(job_id)
+            self._pending.add(job_id)
+        except asyncio.QueueFull:
+            # Filled up by concurrent submissions while the job was being stored
+            await asyncio.to_thread(self.store.mark_failed, job_id, "Evaluation queue is full")
+            raise JobQueueFull(f"Evaluation queue is full ({self.queue_max} jobs)")
+        return job_id
+
+    def _enqueue(self, job_ids: List[str]) -> int:
+        """Put job ids on the local queue without waiting; returns how many were added.
+
+        Ids that don't fit stay queued in the database for the next sweep.
+        claim() is atomic, so an id queued by several workers still runs once.
+        """
+        added = 0
+        for job_id in job_ids:
+            if job_id in self._pending:
+                continue
+            try:
+                self._queue.put_nowait(job_id)
+            except asyncio.QueueFull:
+                break
+            self._pending.add(job_id)
+            added += 1
+        return added
+
+    async def _keep_leases(self) -> None:
+        """Renew this worker's claims and take over jobs of workers that stopped renewing theirs."""
+        while True:
+            await asyncio.sleep(self.lease_s / 3)
+            try:
+                await asyncio.to_thread(self.store.heartbeat)
+                stale = await asyncio.to_thread(self.store.requeue_stale, self.lease_s)
+                orphaned = await asyncio.to_thread(self.store.queued_job_ids, self.lease_s)
+            except Exception:
+                logger.exception("Renewing evaluation job leases failed")
+                continue
+            if stale:
+                logger.info("Re-queued %d evaluation jobs with expired leases", len(stale))
+            added = self._enqueue(stale + [job_id for job_id in orphaned if job_id not in stale])
+            if added < len(stale):
+                logger.warning("Evaluation queue is full; leaving re-queued jobs for a later sweep")
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._pending.discard(job_id)
+            try:
+                # Log records of a background evaluation carry its job id
+                with correlation_scope(job_id):
+                    await self._run_job(job_id)
+            except Exception:
+                logger.exception("Evaluation job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        if not await asyncio.to_thread(self.store.claim, job_id):
+            # Finished, or running in another worker
+            return
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return
+        script = job["request"]
+
+        fingerprint = script_fingerprint(script)
+        cached = await get_cached_evaluation(fingerprint)
+        if cached is not None:
+            await asyncio.to_thread(self.store.mark_succeeded, job_id, cached)
+            return
+
+        partial: Dict[str, ParameterEvaluation] = {}
+        late: Dict[str, ParameterEvaluation] = {}
+        finished = False
+
+        def on_late_parameter(param_id: str, param_eval: ParameterEvaluation) -> None:
+            late[param_id] = param_eval
+            if finished:
+                task = asyncio.create_task(self._attach_late_parameters(job_id, partial, late))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+
+        try:
+            config = evaluation_config(script, job_id, on_late_parameter=on_late_parameter)
+            graph_input, deadline = await evaluation_input(script, config)
+            final_state = graph_input or {}
+
+            with deadline_scope(deadline):
+                async for mode, chunk in app_graph.astream(
+                    graph_input, config=config, stream_mode=["updates", "values"]
+                ):
+                    if mode == "values":
+                        final_state = chunk
+                        continue
+                    # "updates": {node_name: partial state written by that node}
+                    for delta in chunk.values():
+                        results: Dict[str, Any] = (delta or {}).get("parameter_results") or {}
+                        if set(results) - set(partial):
+                            partial.update(results)
+                            await asyncio.to_thread(self.store.save_parameter_results, job_id, dict(partial))
+
+            await discard_checkpoint(config)
+            result = build_evaluation_response(script, final_state)
+            if is_cacheable(final_state):
+                await store_evaluation(fingerprint, result)
+            await asyncio.to_thread(self.store.mark_succeeded, job_id, result)
+            finished = True
+            await self._attach_late_parameters(job_id, partial, late)
+        except Exception as exc:
+            await asyncio.to_thread(self.store.mark_failed, job_id, str(exc))
+
+    async def _attach_late_parameters(
+        self,
+        job_id: str,
+        partial: Dict[str, ParameterEvaluation],
+        late: Dict[str, ParameterEvaluation],
+    ) -> None:
+        """Fold parameters that missed the quorum into the stored job result."""
+        # Serialised: each attach reads, extends and rewrites the stored result
+        async with self._attach_lock:
+            if not late:
+                return
+            job = await asyncio.to_thread(self.store.get, job_id)
+            if job is None or job["result"] is None:
+                return
+            result = job["result"]
+            for param_id, param_eval in late.items():
+                result = attach_parameter(result, param_id, param_eval)
+            partial.update(late)
+            late.clear()
+            await asyncio.to_thread(self.store.save_parameter_results, job_id, dict(partial))
+            await asyncio.to_thread(self.store.save_result, job_id, result)
+
+
+_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    if _runner is None:
+        _runner = JobRunner(
+            store=JobStore(app_config.jobs_sqlite_path),
+            concurrency=app_config.jobs_concurrency,
+            queue_max=app_config.jobs_queue_max,
+            lease_s=app_config.jobs_lease_s,
+        )
+    return _runner
@@ -0,0 +1,171 @@
+# backend/services/job_store.py
+
+"""
+SQLite persistence for asynchronous evaluation jobs.
+
+One row per job: the submitted ScriptInput, its status, partial
+parameter results as they arrive, and the final EvaluationResponse.
+Because rows live on disk, queued/running jobs can be picked up again
+after a worker restart.
+
+Several processes (uvicorn workers) can share one database: a worker
+runs a job only after claim() moved it from queued to running under its
+owner id, and keeps the claim alive with heartbeat(). Running jobs whose
+heartbeat is older than the lease belong to a dead worker and are put
+back in the queue by requeue_stale(). Queued jobs that sat in a dead
+worker's in-memory queue are found again through queued_job_ids(older_than=...).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from models.evaluation_models import ParameterEvaluation
+from models.io_models import ScriptInput, EvaluationResponse, JobStatus
+
+
+class JobStore:
+    def __init__(self, path: str, owner: Optional[str] = None) -> None:
+        self.path = path
+        # Identifies this process's claims among the workers sharing the database
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " request TEXT NOT NULL,"
+            " parameter_results TEXT NOT NULL DEFAULT '{}',"
+            " result TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " owner TEXT,"
+            " heartbeat REAL)"
+        )
+        # Databases created before job claims were added
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs(status)")
+        self._conn.commit()
+
+    def create(self, script: ScriptInput) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, request, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED.value, script.model_dump_json(), now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "status": JobStatus(row["status"]),
+            "request": ScriptInput.model_validate_json(row["request"]),
+            "parameter_results": {
+                param_id: ParameterEvaluation.model_validate(data)
+                for param_id, data in json.loads(row["parameter_results"]).items()
+            },
+            "result": (
+                EvaluationResponse.model_validate_json(row["result"]) if row["result"] else None
+            ),
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+            )
+            self._conn.commit()
+
+    def claim(self, job_id: str) -> bool:
+        """Atomically move a queued job to running under this owner; False if another worker got it."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, heartbeat = ?, error = NULL, updated_at = ?"
+                " WHERE id = ? AND status = ?",
+                (JobStatus.RUNNING.value, self.owner, now, now, job_id, JobStatus.QUEUED.value),
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def heartbeat(self) -> None:
+        """Renew the lease of every job this owner is running."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = ?",
+                (time.time(), self.owner, JobStatus.RUNNING.value),
+            )
+            self._conn.commit()
+
+    def requeue_stale(self, lease_s: float) -> List[str]:
+        """Put running jobs whose heartbeat expired (their worker died) back in the queue."""
+        cutoff = time.time() - lease_s
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (heartbeat IS NULL OR heartbeat < ?)",
+                (JobStatus.RUNNING.value, cutoff),
+            ).fetchall()
+            requeued = []
+            for row in rows:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE id = ? AND status = ?"
+                    " AND (heartbeat IS NULL OR heartbeat < ?)",
+                    (JobStatus.QUEUED.value, time.time(), row["id"], JobStatus.RUNNING.value, cutoff),
+                )
+                if cursor.rowcount == 1:
+                    requeued.append(row["id"])
+            self._conn.commit()
+        return requeued
+
+    def save_parameter_results(self, job_id: str, results: Dict[str, ParameterEvaluation]) -> None:
+        payload = {param_id: pe.model_dump() for param_id, pe in results.items()}
+        self._update(job_id, parameter_results=json.dumps(payload))
+
+    def save_result(self, job_id: str, result: EvaluationResponse) -> None:
+        """Replace the stored result without touching the status (late quorum parameters)."""
+        self._update(job_id, result=result.model_dump_json())
+
+    def mark_succeeded(self, job_id: str, result: EvaluationResponse) -> None:
+        self._update(job_id, status=JobStatus.SUCCEEDED.value, result=result.model_dump_json())
+
+    def mark_failed(self, job_id: str, error: str) -> None:
+        self._update(job_id, status=JobStatus.FAILED.value, error=error)
+
+    def queued_job_ids(self, older_than: Optional[float] = None) -> List[str]:
+        """Queued jobs, oldest first (used to resume after a restart; claim() before running one).
+
+        With `older_than`, only jobs not updated for that many seconds: ones
+        another worker queued in memory and never got to.
+        """
+        cutoff = time.time() - older_than if older_than is not None else float("inf")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND updated_at < ? ORDER BY created_at",
+                (JobStatus.QUEUED.value, cutoff),
+            ).fetchall()
+        return [row["id"] for row in rows]
@@ -0,0 +1,378 @@
+# backend/services/json_repair.py
+
+"""
+Tolerant JSON extraction for LLM answers.
+
+Models wrap the JSON in prose, leave trailing commas, write Python
+literals or get cut off by max_tokens, and JsonOutputParser rejects all of
+these. This module recovers what it can before giving up:
+
+- JsonObjectScanner:        incremental scanner for the first balanced
+                            JSON object; feed it chunks as they stream in.
+- repair_json():            rewrites a JSON-ish fragment into valid JSON
+                            and reports which defects it fixed.
+- extract_json():           json.loads fast path, then scan + repair,
+                            moving on to the next object if one fails.
+- TolerantJsonOutputParser: drop-in JsonOutputParser replacement built on
+                            extract_json, counting outcomes in /metrics.
+- ainvoke_with_reemit():    if an answer still can't be parsed, makes one
+                            small "re-emit JSON only" call for that answer
+                            instead of re-running the evaluation.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import BaseOutputParser, JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+from config.llm_config import llm_config
+from prompts.base_templates import JSON_REEMIT_SYSTEM_PROMPT, JSON_REEMIT_USER_PROMPT
+from services.llm_service import routed_llm
+from services.metrics import llm_json_parses, llm_json_reemits, llm_json_repairs
+from services.usage_recorder import current_node
+
+logger = logging.getLogger(__name__)
+
+# Repair kinds (label values of scriptwise_llm_json_repairs_total)
+PROSE_WRAPPED = "prose_wrapped"
+TRAILING_COMMA = "trailing_comma"
+COMMENT = "comment"
+SINGLE_QUOTES = "single_quotes"
+SMART_QUOTES = "smart_quotes"
+PYTHON_LITERAL = "python_literal"
+UNQUOTED_KEY = "unquoted_key"
+UNQUOTED_STRING = "unquoted_string"
+INNER_QUOTE = "inner_quote"
+NUMBER_FORMAT = "number_format"
+CONTROL_CHAR = "control_char"
+INVALID_ESCAPE = "invalid_escape"
+TRUNCATED = "truncated"
+
+# Opening quote -> closing quote
+_QUOTES = {'"': '"', "'": "'", "“": "”"}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "'": "'", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null"}
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_BARE = re.compile(r"[^\s,:{}\[\]\"'“”/]+")
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+
+def _reject_constant(name: str) -> Any:
+    raise ValueError(f"{name} is not a valid JSON number")
+
+
+def _loads(text: str) -> Any:
+    """json.loads without the NaN / Infinity / -Infinity extension."""
+    return json.loads(text, parse_constant=_reject_constant)
+
+
+class JsonObjectScanner:
+    """
+    Finds the first balanced top-level JSON object in text fed chunk by
+    chunk, tracking strings so braces inside them don't count.
+    """
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+        self._depth = 0
+        self._quote: Optional[str] = None
+        self._escaped = False
+        self.started = False
+        self.complete = False
+        self.outside_chars = 0  # non-whitespace characters before / after the object
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume one chunk; True once the object has closed (anything after it is ignored)."""
+        if self.complete:
+            self.outside_chars += len(chunk.strip())
+            return True
+        start = 0
+        if not self.started:
+            start = chunk.find("{")
+            if start < 0:
+                self.outside_chars += len(chunk.strip())
+                return False
+            self.outside_chars += len(chunk[:start].strip())
+            self.started = True
+
+        for i in range(start, len(chunk)):
+            ch = chunk[i]
+            if self._quote is not None:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == self._quote:
+                    self._quote = None
+            elif ch in _QUOTES:
+                self._quote = _QUOTES[ch]
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[start:i + 1])
+                    self.complete = True
+                    self.outside_chars += len(chunk[i + 1:].strip())
+                    return True
+        self._parts.append(chunk[start:])
+        return False
+
+
+def _read_string(text: str, i: int, close: str, repairs: Set[str]) -> Tuple[str, int, bool]:
+    """Decode a string body starting after its opening quote: (value, next index, closed)."""
+    chars: List[str] = []
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "\\" and i + 1 < n:
+            nxt = text[i + 1]
+            if nxt in _ESCAPES:
+                chars.append(_ESCAPES[nxt])
+                i += 2
+            elif nxt == "u" and _HEX4.fullmatch(text, i + 2, i + 6):
+                chars.append(chr(int(text[i + 2:i + 6], 16)))
+                i += 6
+            else:
+                repairs.add(INVALID_ESCAPE)
+                chars.append(nxt)
+                i += 2
+            continue
+        if ch == close:
+            rest = text[i + 1:].lstrip()
+            # A quote not followed by a delimiter is an unescaped quote inside the string
+            if close == '"' and rest and rest[0] not in ",:}]":
+                repairs.add(INNER_QUOTE)
+                chars.append(ch)
+                i += 1
+                continue
+            return "".join(chars), i + 1, True
+        if ch < " ":
+            repairs.add(CONTROL_CHAR)
+        chars.append(ch)
+        i += 1
+    return "".join(chars), i, False
+
+
+def _normalize_number(word: str) -> str:
+    """JSON spelling of a number: `.9` -> `0.9`, `7.` -> `7.0`, `07` -> `7`."""
+    sign = "-" if word.startswith("-") else ""
+    mantissa, e, exponent = word[len(sign):].partition("e" if "e" in word else "E")
+    whole, dot, fraction = mantissa.partition(".")
+    whole = whole.lstrip("0") or "0"
+    if dot:
+        fraction = fraction or "0"
+    return f"{sign}{whole}{dot}{fraction}{e}{exponent}"
+
+
+def _last_token(out: List[str], skip: int = 0) -> Tuple[int, Optional[str]]:
+    """Index and value of the last non-whitespace output token (after skipping `skip` of them)."""
+    for index in range(len(out) - 1, -1, -1):
+        if out[index].strip():
+            if skip == 0:
+                return index, out[index]
+            skip -= 1
+    return -1, None
+
+
+def _drop_trailing_comma(out: List[str], repairs: Set[str]) -> None:
+    index, token = _last_token(out)
+    if token == ",":
+        del out[index]
+        repairs.add(TRAILING_COMMA)
+
+
+def _close_truncated(out: List[str], stack: List[str]) -> None:
+    """Drop a dangling key / comma and close every open container."""
+    index, token = _last_token(out)
+    if token == ":":
+        out.append("null")
+    elif token is not None and token.startswith('"') and stack[-1] == "{":
+        _, before = _last_token(out, skip=1)
+        if before in ("{", ","):  # a key without its value
+            del out[index:]
+    _, token = _last_token(out)
+    if token == ",":
+        _drop_trailing_comma(out, set())
+    out.extend("}" if opener == "{" else "]" for opener in reversed(stack))
+
+
+def repair_json(fragment: str) -> Tuple[str, List[str]]:
+    """Rewrite a JSON-ish fragment into valid JSON text: (text, sorted repair kinds)."""
+    out: List[str] = []
+    repairs: Set[str] = set()
+    stack: List[str] = []
+    i, n = 0, len(fragment)
+
+    while i < n:
+        ch = fragment[i]
+        if ch in _QUOTES:
+            if ch == "'":
+                repairs.add(SINGLE_QUOTES)
+            elif ch != '"':
+                repairs.add(SMART_QUOTES)
+            value, i, closed = _read_string(fragment, i + 1, _QUOTES[ch], repairs)
+            if not closed:
+                repairs.add(TRUNCATED)
+            out.append(json.dumps(value))
+        elif ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+            i += 1
+        elif ch in "}]":
+            _drop_trailing_comma(out, repairs)
+            if stack:
+                stack.pop()
+            out.append(ch)
+            i += 1
+        elif fragment.startswith("//", i):
+            end = fragment.find("\n", i)
+            i = n if end < 0 else end
+            repairs.add(COMMENT)
+        elif fragment.startswith("/*", i):
+            end = fragment.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            repairs.add(COMMENT)
+        elif ch.isspace() or ch in ",:":
+            out.append(ch)
+            i += 1
+        else:
+            match = _BARE.match(fragment, i)
+            if match is None:  # stray "/" and the like
+                i += 1
+                continue
+            word = match.group(0)
+            i = match.end()
+            if word in _LITERALS:
+                if word != _LITERALS[word]:
+                    repairs.add(PYTHON_LITERAL)
+                out.append(_LITERALS[word])
+            elif _NUMBER.fullmatch(word):
+                number = _normalize_number(word)
+                if number != word:
+                    repairs.add(NUMBER_FORMAT)
+                out.append(number)
+            else:
+                is_key = fragment[i:].lstrip().startswith(":")
+                repairs.add(UNQUOTED_KEY if is_key else UNQUOTED_STRING)
+                out.append(json.dumps(word))
+
+    if stack:
+        repairs.add(TRUNCATED)
+        _close_truncated(out, stack)
+    return "".join(out), sorted(repairs)
+
+
+def extract_json(text: str) -> Tuple[Any, List[str]]:
+    """
+    Parse the JSON object in an LLM answer: (value, repair kinds applied).
+    Raises ValueError if nothing parseable can be recovered.
+    """
+    stripped = text.strip()
+    try:
+        return _loads(stripped), []
+    except ValueError:
+        pass
+
+    fence = _FENCE.search(stripped)
+    if fence is not None:
+        stripped = fence.group(1).strip()
+        try:
+            return _loads(stripped), []
+        except ValueError:
+            pass
+
+    offset = stripped.find("{")
+    if offset < 0:
+        raise ValueError("no JSON object in the answer")
+    error: Optional[ValueError] = None
+    while offset >= 0:
+        scanner = JsonObjectScanner()
+        scanner.feed(stripped[offset:])
+        repairs = [PROSE_WRAPPED] if offset or scanner.outside_chars else []
+
+        if scanner.complete:
+            try:
+                return _loads(scanner.text), repairs
+            except ValueError:
+                pass
+        repaired, fixed = repair_json(scanner.text)
+        try:
+            return _loads(repaired), repairs + fixed
+        except ValueError as exc:
+            error = exc
+        if not scanner.complete:
+            break
+        # Braces in the prose before the answer: try the next object
+        offset = stripped.find("{", offset + len(scanner.text))
+    raise ValueError(f"unrepairable JSON ({error})") from error
+
+
+class TolerantJsonOutputParser(JsonOutputParser):
+    """JsonOutputParser that extracts and repairs instead of failing on the first defect."""
+
+    def parse_result(self, result, *, partial: bool = False) -> Any:
+        if partial:
+            return super().parse_result(result, partial=True)
+        text = result[0].text
+        node = current_node()
+        try:
+            parsed, repairs = extract_json(text)
+        except ValueError as exc:
+            llm_json_parses.inc(node=node, outcome="failed")
+            raise OutputParserException(f"Invalid json output: {exc}", llm_output=text) from exc
+        for repair in repairs:
+            llm_json_repairs.inc(node=node, repair=repair)
+        llm_json_parses.inc(node=node, outcome="repaired" if repairs else "clean")
+        return parsed
+
+
+_REEMIT_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", JSON_REEMIT_SYSTEM_PROMPT),
+        ("user", JSON_REEMIT_USER_PROMPT),
+    ]
+)
+
+
+async def reemit_json(answer: str, parser: BaseOutputParser, llm: Runnable = routed_llm) -> Any:
+    """
+    Ask the model to re-emit `answer` as JSON only, and parse that with `parser`.
+    `llm` should carry the same bindings (max_tokens) as the call that produced
+    `answer`, or a long answer is cut off again.
+    """
+    node = current_node()
+    try:
+        result = await (_REEMIT_PROMPT | llm | parser).ainvoke({"answer": answer})
+    except Exception:
+        llm_json_reemits.inc(node=node, outcome="failed")
+        raise
+    llm_json_reemits.inc(node=node, outcome="ok")
+    return result
+
+
+async def ainvoke_with_reemit(
+    chain: Any, inputs: Dict[str, Any], parser: BaseOutputParser, llm: Runnable = routed_llm
+) -> Any:
+    """
+    `chain.ainvoke(inputs)`; if the chain's answer could not be parsed even
+    after repair, one reemit_json() call through `llm` (the chain's LLM
+    step) instead of failing.
+    """
+    try:
+        return await chain.ainvoke(inputs)
+    except OutputParserException as exc:
+        if not (llm_config.llm_json_reemit_enabled and exc.llm_output):
+            raise
+        logger.info("Unparseable answer in %s; asking for a JSON-only re-emit", current_node())
+        return await reemit_json(exc.llm_output, parser, llm)
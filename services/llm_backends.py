@@ -0,0 +1,128 @@
+# backend/services/llm_backends.py
+
+"""
+Registry of LLM backends reachable through an OpenAI-compatible API.
+
+- openrouter: the hosted default (config/llm_config.py).
+- ollama:     a local Ollama daemon via its /v1 endpoint (config/settings.py).
+              That endpoint ignores per-request `options`, so the context
+              window is set on the Ollama side: `PARAMETER num_ctx 8192` in
+              a Modelfile (`ollama create`), or OLLAMA_CONTEXT_LENGTH on the
+              server. Ollama's default context truncates long synopses.
+- local:      any OpenAI-compatible server (vLLM, llama.cpp, LM Studio, or
+              benchmarks/standin_server.py for zero-cost load tests).
+
+LLM_BACKEND picks the deployment default; LLM_PARAMETER_BACKENDS
+("momentum=ollama,summary=local") routes individual graph nodes. Every
+backend gets its own HTTP pool, concurrency limiter and call policy.
+"""
+
+import os
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from config.llm_config import llm_config
+from config.settings import settings
+
+OPENROUTER = "openrouter"
+OLLAMA = "ollama"
+LOCAL = "local"
+BACKENDS = (OPENROUTER, OLLAMA, LOCAL)
+
+
+@dataclass(frozen=True)
+class BackendSpec:
+    name: str
+    base_url: str
+    api_key: str
+    model: str
+    temperature: float
+    max_connections: int
+    max_keepalive: int
+    initial_concurrency: int
+    max_concurrency: int
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    prompt_cache_hints: bool = False
+    small_model: str = ""  # model cascade small tier on this backend ("" = no cascade)
+    headers: Dict[str, str] = field(default_factory=dict)
+    extra_body: Dict[str, Any] = field(default_factory=dict)
+
+
+def _openrouter_headers() -> Dict[str, str]:
+    headers = {}
+    http_referer = os.getenv("OPENROUTER_HTTP_REFERER")
+    title = os.getenv("OPENROUTER_X_TITLE")
+    if http_referer:
+        headers["HTTP-Referer"] = http_referer
+    if title:
+        headers["X-Title"] = title
+    return headers
+
+
+def backend_spec(name: str) -> BackendSpec:
+    if name == OPENROUTER:
+        return BackendSpec(
+            name=OPENROUTER,
+            base_url=llm_config.base_url,
+            api_key=llm_config.openrouter_api_key,
+            model=llm_config.model,
+            temperature=llm_config.temperature,
+            max_connections=llm_config.llm_http_max_connections,
+            max_keepalive=llm_config.llm_http_max_keepalive,
+            initial_concurrency=llm_config.llm_concurrency_initial,
+            max_concurrency=llm_config.llm_concurrency_max,
+            requests_per_minute=llm_config.llm_rate_limit_rpm,
+            tokens_per_minute=llm_config.llm_rate_limit_tpm,
+            prompt_cache_hints=llm_config.llm_prompt_cache_hints,
+            small_model=llm_config.llm_cascade_small_model,
+            headers=_openrouter_headers(),
+        )
+    if name == OLLAMA:
+        return BackendSpec(
+            name=OLLAMA,
+            base_url=settings.OLLAMA_BASE_URL.rstrip("/") + "/v1",
+            api_key="ollama",  # required by the SDK, ignored by Ollama
+            model=settings.OLLAMA_MODEL,
+            temperature=settings.LLM_TEMPERATURE,
+            max_connections=settings.OLLAMA_MAX_CONCURRENCY * 2,
+            max_keepalive=settings.OLLAMA_MAX_CONCURRENCY,
+            initial_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+            max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+            small_model=settings.OLLAMA_CASCADE_SMALL_MODEL,
+        )
+    if name == LOCAL:
+        return BackendSpec(
+            name=LOCAL,
+            base_url=settings.LOCAL_LLM_BASE_URL,
+            api_key=settings.LOCAL_LLM_API_KEY,
+            model=settings.LOCAL_LLM_MODEL,
+            temperature=settings.LLM_TEMPERATURE,
+            max_connections=settings.LOCAL_LLM_MAX_CONCURRENCY * 2,
+            max_keepalive=settings.LOCAL_LLM_MAX_CONCURRENCY,
+            initial_concurrency=settings.LOCAL_LLM_MAX_CONCURRENCY,
+            max_concurrency=settings.LOCAL_LLM_MAX_CONCURRENCY,
+            small_model=settings.LOCAL_LLM_CASCADE_SMALL_MODEL,
+        )
+    raise ValueError(f"Unknown LLM backend: {name!r} (expected one of {BACKENDS})")
+
+
+@lru_cache(maxsize=1)
+def parameter_backends() -> Dict[str, str]:
+    """Parse LLM_PARAMETER_BACKENDS ("node=backend,node=backend")."""
+    routes: Dict[str, str] = {}
+    for item in llm_config.llm_parameter_backends.split(","):
+        if not item.strip():
+            continue
+        node, _, backend = item.partition("=")
+        backend = backend.strip()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown LLM backend {backend!r} for {node.strip()!r}")
+        routes[node.strip()] = backend
+    return routes
+
+
+def backend_for_node(node: str) -> str:
+    """Backend serving a graph node (parameter id, "summary", ...)."""
+    return parameter_backends().get(node, llm_config.llm_backend)
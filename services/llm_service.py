@@ -1,46 +1,284 @@
-from typing import Optional, List, Any
-import os
+from typing import Optional, List, Any, AsyncIterator, Dict, Iterator, Tuple
+import asyncio
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 
-from openai import OpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
-from langchain_core.outputs import ChatResult, ChatGeneration
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+from langchain_core.runnables import Runnable
 
 from config.llm_config import llm_config
+from services.cache import CacheBackend, build_cache, content_hash
+from services.call_policy import CallPolicy
+from services.llm_backends import BackendSpec, backend_for_node, backend_spec
+from services.metrics import llm_calls_cancelled
+from services.provider_batch import active_provider_batch
+from services.rate_limiter import AdaptiveLimiter
+from services import tracing
+from services.usage_recorder import LLMCallRecord, current_node, usage_recorder
 
 
 class OpenRouterLLM(BaseChatModel):
     """Custom LangChain-compatible LLM wrapper for OpenRouter API."""
-    
+
     client: Any = None
+    async_client: Any = None
+    response_cache: Any = None
+    limiter: Any = None
+    call_policy: Any = None
+    backend: str = "openrouter"
+    extra_body: Dict[str, Any] = {}
     model: str = ""
     temperature: float = 0.7
     max_tokens: int = 4096
+    prompt_cache_hints: bool = True
 
     class Config:
         arbitrary_types_allowed = True
 
-    def __init__(self, client: OpenAI, model: str, temperature: float, max_tokens: int, **kwargs) -> None:
+    def __init__(
+        self,
+        client: OpenAI,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        async_client: Optional[AsyncOpenAI] = None,
+        response_cache: Optional[CacheBackend] = None,
+        prompt_cache_hints: bool = True,
+        limiter: Optional[AdaptiveLimiter] = None,
+        call_policy: Optional[CallPolicy] = None,
+        backend: str = "openrouter",
+        extra_body: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(**kwargs)
         self.client = client
+        self.async_client = async_client
+        self.response_cache = response_cache
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.prompt_cache_hints = prompt_cache_hints
+        self.limiter = limiter
+        self.call_policy = call_policy
+        self.backend = backend
+        self.extra_body = extra_body or {}
+
+    def _message_content(self, msg: BaseMessage) -> Any:
+        """
+        Plain content, or a single text part carrying `cache_control` when the
+        prompt marked this message as the end of a cacheable prefix.
+        """
+        cache_control = msg.additional_kwargs.get("cache_control")
+        if cache_control and self.prompt_cache_hints and isinstance(msg.content, str):
+            return [{"type": "text", "text": msg.content, "cache_control": cache_control}]
+        return msg.content
 
     def _convert_messages(self, messages: List[BaseMessage]) -> List[dict]:
         """Convert LangChain messages to OpenAI format."""
         result = []
         for msg in messages:
             if isinstance(msg, SystemMessage):
-                result.append({"role": "system", "content": msg.content})
+                result.append({"role": "system", "content": self._message_content(msg)})
             elif isinstance(msg, HumanMessage):
-                result.append({"role": "user", "content": msg.content})
+                result.append({"role": "user", "content": self._message_content(msg)})
             elif isinstance(msg, AIMessage):
                 result.append({"role": "assistant", "content": msg.content})
             else:
                 result.append({"role": "user", "content": str(msg.content)})
         return result
 
+    def _request_params(
+        self, messages: List[BaseMessage], stop: Optional[List[str]], **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Build the chat.completions.create kwargs shared by sync and async paths.
+
+        `temperature` / `max_tokens` can be overridden per call via `llm.bind(...)`.
+        """
+        params = {
+            "model": self.model,
+            "temperature": kwargs.get("temperature", self.temperature),
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
+            "messages": self._convert_messages(messages),
+            "stop": stop,
+        }
+        if self.extra_body:
+            # Backend-specific request fields the OpenAI SDK has no parameter for
+            params["extra_body"] = self.extra_body
+        return params
+
+    # ---- response cache helpers ----
+
+    def _cache_key(self, params: Dict[str, Any]) -> Optional[str]:
+        """Content address of a request: model, sampling params and rendered messages."""
+        if self.response_cache is None:
+            return None
+        return content_hash(params)
+
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            return None
+        return json.loads(cached)["content"]
+
+    def _cache_set(self, cache_key: Optional[str], content: str) -> None:
+        # Empty completions are almost always provider hiccups; don't pin them
+        if cache_key is None or not content:
+            return
+        self.response_cache.set(cache_key, json.dumps({"content": content}))
+
+    async def _acache_get(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        cached = await self.response_cache.aget(cache_key)
+        if cached is None:
+            return None
+        return json.loads(cached)["content"]
+
+    async def _acache_set(self, cache_key: Optional[str], content: str) -> None:
+        if cache_key is None or not content:
+            return
+        await self.response_cache.aset(cache_key, json.dumps({"content": content}))
+
+    # ---- rate limiting ----
+
+    @staticmethod
+    def _estimate_tokens(params: Dict[str, Any]) -> int:
+        """Rough TPM reservation (~4 chars/token + max completion); settled against real usage."""
+        chars = 0
+        for msg in params["messages"]:
+            content = msg["content"]
+            if isinstance(content, list):
+                chars += sum(len(part.get("text", "")) for part in content)
+            else:
+                chars += len(str(content))
+        return chars // 4 + (params.get("max_tokens") or 0)
+
+    def _limit(self, params: Dict[str, Any]):
+        if self.limiter is None:
+            return nullcontext(None)
+        return self.limiter.limit(self._estimate_tokens(params))
+
+    def _limit_sync(self, params: Dict[str, Any]):
+        if self.limiter is None:
+            return nullcontext(None)
+        return self.limiter.limit_sync(self._estimate_tokens(params))
+
+    @staticmethod
+    def _settle(permit: Any, usage_metadata: Optional[Dict[str, Any]]) -> float:
+        """Report actual token usage to the limiter; returns the queue wait for this call."""
+        if permit is None:
+            return 0.0
+        if usage_metadata:
+            permit.used_tokens = usage_metadata.get("total_tokens")
+        return permit.queue_wait_s
+
+    def _latency_key(self, run_manager: Optional[Any]) -> str:
+        """Hedge window of this call: cascade tiers, fused and summary calls have very different latencies."""
+        return f"{self.model}/{current_node(run_manager)}"
+
+    # ---- single provider request (one limiter slot, one timeout) ----
+
+    def _http_span(self, timeout: Optional[float]):
+        return tracing.span(
+            "http chat.completions",
+            kind="client",
+            **{"llm.backend": self.backend, "llm.model": self.model, "http.timeout_s": timeout},
+        )
+
+    @staticmethod
+    def _trace_usage(span: Any, usage_metadata: Optional[Dict[str, Any]], queue_wait: float) -> None:
+        usage_metadata = usage_metadata or {}
+        span.set_attributes({
+            "llm.queue_wait_s": queue_wait,
+            "llm.prompt_tokens": usage_metadata.get("input_tokens", 0),
+            "llm.completion_tokens": usage_metadata.get("output_tokens", 0),
+            "llm.cached_tokens": usage_metadata.get("input_token_details", {}).get("cache_read", 0),
+        })
+
+    def _call(self, params: Dict[str, Any], timeout: Optional[float]) -> Tuple[Any, float]:
+        with self._http_span(timeout) as span, self._limit_sync(params) as permit:
+            extra = {"timeout": timeout} if timeout is not None else {}
+            response = self.client.chat.completions.create(**params, **extra)
+            usage_metadata = self._usage_metadata(getattr(response, "usage", None))
+            queue_wait = self._settle(permit, usage_metadata)
+            self._trace_usage(span, usage_metadata, queue_wait)
+            return response, queue_wait
+
+    async def _acall(self, params: Dict[str, Any], timeout: Optional[float]) -> Tuple[Any, float]:
+        with self._http_span(timeout) as span:
+            async with self._limit(params) as permit:
+                try:
+                    response = await asyncio.wait_for(
+                        self.async_client.chat.completions.create(**params), timeout
+                    )
+                except asyncio.CancelledError:
+                    # Cancelling the await closes the provider connection, aborting the request
+                    llm_calls_cancelled.inc(node=current_node(), model=self.model)
+                    raise
+                usage_metadata = self._usage_metadata(getattr(response, "usage", None))
+                queue_wait = self._settle(permit, usage_metadata)
+                self._trace_usage(span, usage_metadata, queue_wait)
+                return response, queue_wait
+
+    @staticmethod
+    def _usage_metadata(usage: Any) -> Optional[Dict[str, Any]]:
+        """Map an OpenAI `usage` block onto LangChain's usage_metadata shape."""
+        if usage is None:
+            return None
+        input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        output_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": getattr(usage, "total_tokens", None) or input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cached_tokens},
+        }
+
+    def _record_usage(
+        self,
+        run_manager: Optional[Any],
+        usage_metadata: Optional[Dict[str, Any]],
+        started: float,
+        ttft: Optional[float] = None,
+        local_cache_hit: bool = False,
+        queue_wait: float = 0.0,
+    ) -> None:
+        """Append one per-call record (keyed by the LangGraph node that made the call)."""
+        usage_metadata = usage_metadata or {}
+        usage_recorder.record(
+            LLMCallRecord(
+                node=current_node(run_manager),
+                model=self.model,
+                prompt_tokens=usage_metadata.get("input_tokens", 0),
+                cached_tokens=usage_metadata.get("input_token_details", {}).get("cache_read", 0),
+                completion_tokens=usage_metadata.get("output_tokens", 0),
+                latency_s=time.perf_counter() - started,
+                ttft_s=ttft,
+                queue_wait_s=queue_wait,
+                local_cache_hit=local_cache_hit,
+            )
+        )
+
+    def _to_result(self, content: str, usage: Any = None) -> ChatResult:
+        usage_metadata = self._usage_metadata(usage)
+        message = AIMessage(content=content, usage_metadata=usage_metadata)
+        generation = ChatGeneration(message=message)
+        return ChatResult(
+            generations=[generation],
+            llm_output={"model_name": self.model, "token_usage": usage_metadata or {}},
+        )
+
     def _generate(
         self,
         messages: List[BaseMessage],
@@ -49,54 +287,371 @@ class OpenRouterLLM(BaseChatModel):
         **kwargs: Any,
     ) -> ChatResult:
         """Generate a chat response from the OpenRouter API."""
-        openai_messages = self._convert_messages(messages)
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            messages=openai_messages,
-            stop=stop,
-        )
-        
+        started = time.perf_counter()
+        params = self._request_params(messages, stop, **kwargs)
+        cache_key = self._cache_key(params)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._record_usage(run_manager, None, started, local_cache_hit=True)
+            return self._to_result(cached)
+
+        with tracing.activate(tracing.span_for_run(getattr(run_manager, "run_id", None))):
+            if self.call_policy is not None:
+                response, queue_wait = self.call_policy.run(
+                    lambda timeout: self._call(params, timeout), latency_key=self._latency_key(run_manager)
+                )
+            else:
+                response, queue_wait = self._call(params, None)
+
         content = response.choices[0].message.content or ""
-        message = AIMessage(content=content)
-        generation = ChatGeneration(message=message)
-        
-        return ChatResult(generations=[generation])
+        result = self._to_result(content, getattr(response, "usage", None))
+
+        self._cache_set(cache_key, content)
+        self._record_usage(run_manager, result.llm_output["token_usage"], started, queue_wait=queue_wait)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        Native async generation on the pooled AsyncOpenAI client, so graph
+        nodes awaiting the LLM never occupy a thread-pool worker.
+        """
+        if self.async_client is None:
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        started = time.perf_counter()
+        params = self._request_params(messages, stop, **kwargs)
+        cache_key = self._cache_key(params)
+        cached = await self._acache_get(cache_key)
+        if cached is not None:
+            self._record_usage(run_manager, None, started, local_cache_hit=True)
+            return self._to_result(cached)
+
+        provider_batch = active_provider_batch()
+        with tracing.activate(tracing.span_for_run(getattr(run_manager, "run_id", None))):
+            if provider_batch is not None:
+                # Non-urgent run: answered by the next provider batch, outside limiter and call policy
+                response, queue_wait = await provider_batch.submit(self.backend, self.async_client, params), 0.0
+            elif self.call_policy is not None:
+                response, queue_wait = await self.call_policy.arun(
+                    lambda timeout: self._acall(params, timeout), latency_key=self._latency_key(run_manager)
+                )
+            else:
+                response, queue_wait = await self._acall(params, None)
+
+        content = response.choices[0].message.content or ""
+        result = self._to_result(content, getattr(response, "usage", None))
+
+        await self._acache_set(cache_key, content)
+        self._record_usage(run_manager, result.llm_output["token_usage"], started, queue_wait=queue_wait)
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Stream completion tokens as they arrive from the provider."""
+        if self.async_client is None:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        if active_provider_batch() is not None:
+            # Batch answers arrive whole: deliver the completion as a single chunk
+            result = await self._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            message = result.generations[0].message
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=message.content, usage_metadata=message.usage_metadata)
+            )
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(message.content, chunk=chunk)
+            yield chunk
+            return
+
+        started = time.perf_counter()
+        params = self._request_params(messages, stop, **kwargs)
+        cache_key = self._cache_key(params)
+        cached = await self._acache_get(cache_key)
+        if cached is not None:
+            # Replay a cached completion as a single chunk
+            self._record_usage(run_manager, None, started, local_cache_hit=True)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=cached))
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(cached, chunk=chunk)
+            yield chunk
+            return
+
+        parts: List[str] = []
+        ttft: Optional[float] = None
+        usage_metadata: Optional[Dict[str, Any]] = None
+        attempt = 0
+        parent_span = tracing.span_for_run(getattr(run_manager, "run_id", None))
+        while True:
+            timeout = self.call_policy.call_timeout() if self.call_policy is not None else None
+            # Not a `with` block: the span stays open across the yields below
+            http_span = tracing.open_span(
+                "http chat.completions",
+                kind="client",
+                parent=parent_span,
+                **{"llm.backend": self.backend, "llm.model": self.model, "http.timeout_s": timeout, "http.stream": True},
+            )
+            try:
+                # The limiter slot is held until the stream is fully drained
+                async with self._limit(params) as permit:
+                    stream = await asyncio.wait_for(
+                        self.async_client.chat.completions.create(
+                            stream=True,
+                            stream_options={"include_usage": True},
+                            **params,
+                        ),
+                        timeout,
+                    )
+                    # Closing the stream on the way out (also when cancelled) releases its connection
+                    async with stream:
+                        async for event in stream:
+                            if getattr(event, "usage", None) is not None:
+                                # Final chunk (include_usage) carries token counts and no choices
+                                usage_metadata = self._usage_metadata(event.usage)
+                            if not event.choices:
+                                continue
+                            delta = event.choices[0].delta.content or ""
+                            if not delta:
+                                continue
+                            if ttft is None:
+                                ttft = time.perf_counter() - started
+                            parts.append(delta)
+                            chunk = ChatGenerationChunk(message=AIMessageChunk(content=delta))
+                            if run_manager is not None:
+                                await run_manager.on_llm_new_token(delta, chunk=chunk)
+                            yield chunk
+                    queue_wait = self._settle(permit, usage_metadata)
+                self._trace_usage(http_span, usage_metadata, queue_wait)
+                break
+            except (asyncio.CancelledError, GeneratorExit):
+                # Cancelled mid-request, or the consumer abandoned the stream between tokens
+                llm_calls_cancelled.inc(node=current_node(run_manager), model=self.model)
+                raise
+            except Exception as exc:
+                http_span.record_error(exc)
+                # Tokens already reached the caller: a retry would duplicate them
+                if parts or self.call_policy is None:
+                    raise
+                delay = self.call_policy.retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+            finally:
+                http_span.end()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        await self._acache_set(cache_key, "".join(parts))
+        self._record_usage(run_manager, usage_metadata, started, ttft=ttft, queue_wait=queue_wait)
+        if usage_metadata is not None:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage_metadata))
 
     @property
     def _llm_type(self) -> str:
-        """Return type of LLM."""
-        return "openrouter"
+        """Return type of LLM (the backend it talks to)."""
+        return self.backend
 
 
-_llm: Optional[OpenRouterLLM] = None
+_llm: Optional[OpenRouterLLM] = None  # default backend, default model
+_backend_llms: Dict[str, OpenRouterLLM] = {}
+_model_llms: Dict[Tuple[str, str], OpenRouterLLM] = {}
+_model_override: ContextVar[Optional[str]] = ContextVar("llm_model_override", default=None)
+_response_cache: Optional[CacheBackend] = None
+_installed_llm: Optional[BaseChatModel] = None  # FakeLLM / RecordingLLM for offline runs
 
 
-def get_llm() -> OpenRouterLLM:
-    global _llm
-    if _llm is not None:
-        return _llm
+def _http_limits(spec: BackendSpec) -> httpx.Limits:
+    """Connection-pool limits for one backend (shared by its sync and async clients)."""
+    return httpx.Limits(
+        max_connections=spec.max_connections,
+        max_keepalive_connections=spec.max_keepalive,
+        keepalive_expiry=llm_config.llm_http_keepalive_expiry,
+    )
 
-    headers = {}
-    http_referer = os.getenv("OPENROUTER_HTTP_REFERER")
-    title = os.getenv("OPENROUTER_X_TITLE")
-    if http_referer:
-        headers["HTTP-Referer"] = http_referer
-    if title:
-        headers["X-Title"] = title
 
+def _build_limiter(spec: BackendSpec) -> Optional[AdaptiveLimiter]:
+    """Per-backend limiter: RPM/TPM buckets + AIMD window capped at the backend's concurrency."""
+    if not llm_config.llm_limiter_enabled:
+        return None
+    return AdaptiveLimiter(
+        requests_per_minute=spec.requests_per_minute,
+        tokens_per_minute=spec.tokens_per_minute,
+        initial_window=spec.initial_concurrency,
+        min_window=llm_config.llm_concurrency_min,
+        max_window=spec.max_concurrency,
+        decrease_factor=llm_config.llm_concurrency_backoff,
+    )
+
+
+def _build_call_policy() -> CallPolicy:
+    """Retry/timeout/hedging policy; one per backend so each tracks its own latency."""
+    return CallPolicy(
+        max_retries=llm_config.llm_max_retries,
+        base_delay_s=llm_config.llm_retry_base_delay_s,
+        max_delay_s=llm_config.llm_retry_max_delay_s,
+        timeout_s=llm_config.llm_call_timeout_s,
+        hedge_enabled=llm_config.llm_hedge_enabled,
+        hedge_quantile=llm_config.llm_hedge_quantile,
+        hedge_min_samples=llm_config.llm_hedge_min_samples,
+        hedge_min_delay_s=llm_config.llm_hedge_min_delay_s,
+    )
+
+
+def _get_response_cache() -> Optional[CacheBackend]:
+    """One response cache for every backend (the model name is part of the key)."""
+    global _response_cache
+    if _response_cache is None and llm_config.llm_cache_enabled:
+        _response_cache = build_cache(
+            max_entries=llm_config.llm_cache_max_entries,
+            ttl_seconds=llm_config.llm_cache_ttl_seconds,
+            sqlite_path=llm_config.llm_cache_sqlite_path,
+            sqlite_table="llm_responses",
+            sqlite_max_entries=llm_config.llm_cache_sqlite_max_entries,
+        )
+    return _response_cache
+
+
+def _build_llm(spec: BackendSpec) -> OpenRouterLLM:
     client = OpenAI(
-        base_url=llm_config.base_url,
-        api_key=llm_config.openrouter_api_key,
-        default_headers=headers or None,
+        base_url=spec.base_url,
+        api_key=spec.api_key,
+        default_headers=spec.headers or None,
+        max_retries=0,  # retries are owned by CallPolicy
+        http_client=DefaultHttpxClient(limits=_http_limits(spec)),
+    )
+
+    async_client = AsyncOpenAI(
+        base_url=spec.base_url,
+        api_key=spec.api_key,
+        default_headers=spec.headers or None,
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(limits=_http_limits(spec)),
     )
 
-    _llm = OpenRouterLLM(
+    return OpenRouterLLM(
         client=client,
-        model=llm_config.model,
-        temperature=llm_config.temperature,
+        async_client=async_client,
+        response_cache=_get_response_cache(),
+        model=spec.model,
+        temperature=spec.temperature,
         max_tokens=llm_config.max_tokens,
+        prompt_cache_hints=spec.prompt_cache_hints,
+        limiter=_build_limiter(spec),
+        call_policy=_build_call_policy(),
+        backend=spec.name,
+        extra_body=spec.extra_body,
     )
-    return _llm
+
+
+def get_backend_llm(backend: Optional[str] = None) -> OpenRouterLLM:
+    """Default-model LLM of a backend (LLM_BACKEND if not given); built once per process."""
+    global _llm
+    backend = backend or llm_config.llm_backend
+    if backend == llm_config.llm_backend:
+        if _llm is None:
+            _llm = _build_llm(backend_spec(backend))
+        return _llm
+    if backend not in _backend_llms:
+        _backend_llms[backend] = _build_llm(backend_spec(backend))
+    return _backend_llms[backend]
+
+
+@contextmanager
+def use_model(model: Optional[str]) -> Iterator[None]:
+    """Route every get_llm() call made inside the block to `model` (e.g. a cascade tier)."""
+    token = _model_override.set(model)
+    try:
+        yield
+    finally:
+        _model_override.reset(token)
+
+
+def install_llm(llm: Optional[BaseChatModel]) -> None:
+    """Serve every get_llm() call from `llm` (see services/fake_llm.py); None restores the backends."""
+    global _installed_llm
+    _installed_llm = llm
+
+
+def get_llm() -> BaseChatModel:
+    """
+    LLM for the calling graph node: the backend routed to it by
+    LLM_PARAMETER_BACKENDS (else LLM_BACKEND), running either the backend's
+    model or the one selected by an enclosing `use_model`.
+    """
+    if _installed_llm is not None:
+        return _installed_llm
+    base = get_backend_llm(backend_for_node(current_node()))
+
+    model = _model_override.get()
+    if not model or model == base.model:
+        return base
+    key = (base.backend, model)
+    if key not in _model_llms:
+        # Same pool, cache, limiter and call policy as the backend's default model
+        _model_llms[key] = base.model_copy(update={"model": model})
+    return _model_llms[key]
+
+
+class RoutedLLM(Runnable):
+    """
+    Chain step standing in for get_llm(): the LLM is resolved on every call,
+    so a chain compiled once still follows use_model, per-node backend
+    routing and install_llm.
+    """
+
+    def invoke(self, input: Any, config: Optional[Any] = None, **kwargs: Any) -> Any:
+        return get_llm().invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[Any] = None, **kwargs: Any) -> Any:
+        return await get_llm().ainvoke(input, config, **kwargs)
+
+
+routed_llm = RoutedLLM()
+
+
+def _initialised_llms() -> List[OpenRouterLLM]:
+    llms = [_llm] if _llm is not None else []
+    return llms + list(_backend_llms.values())
+
+
+def disable_response_cache() -> None:
+    """Switch the response cache off for every backend and model, including ones built later."""
+    global _response_cache
+    llm_config.llm_cache_enabled = False
+    _response_cache = None
+    for llm in _initialised_llms() + list(_model_llms.values()):
+        llm.response_cache = None
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the LLM response cache (empty if disabled or unused)."""
+    if _response_cache is None:
+        return {"enabled": llm_config.llm_cache_enabled, "initialised": False}
+    return {"enabled": True, "initialised": True, **_response_cache.stats()}
+
+
+def get_limiter_stats() -> Dict[str, Any]:
+    """Per backend: concurrency window, throttling counters and queue-wait distribution."""
+    return {
+        llm.backend: ({"enabled": True, **llm.limiter.stats()} if llm.limiter else {"enabled": False})
+        for llm in _initialised_llms()
+    }
+
+
+def get_call_policy_stats() -> Dict[str, Any]:
+    """Per backend: retry / timeout / hedge counters and the latency quantiles driving the hedge."""
+    return {
+        llm.backend: llm.call_policy.stats()
+        for llm in _initialised_llms()
+        if llm.call_policy is not None
+    }
@@ -0,0 +1,156 @@
+# backend/services/log_pipeline.py
+
+"""
+Non-blocking structured logging.
+
+configure_logging() routes every logger through a bounded in-memory queue;
+a QueueListener thread formats records (JSON by default) and writes them
+to stdout, so request handlers never block on a slow pipe. When the queue
+is full new records are dropped and counted rather than stalling the
+event loop.
+
+Each record carries the current correlation id (X-Request-ID of the API
+request, or the job id for background evaluations) and, when tracing is
+on, the trace id. Keyword data passed as `extra={...}` is emitted as
+top-level JSON fields.
+
+    LOG_LEVEL       DEBUG | INFO | WARNING | ...   (default INFO)
+    LOG_FORMAT      json | text                     (default json)
+    LOG_QUEUE_MAX   queued records before dropping  (default 10000)
+"""
+
+import copy
+import json
+import logging
+import queue
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator, Optional
+
+from config.app_config import app_config
+from services.tracing import current_span
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("log_correlation_id", default=None)
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "correlation_id", "trace_id"}
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str]) -> Iterator[str]:
+    """Tag every log record emitted inside the block (and tasks it spawns) with `correlation_id`."""
+    correlation_id = correlation_id or new_correlation_id()
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Stamps correlation / trace ids on the record in the emitting task, before it is queued."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get()
+        span = current_span()
+        record.trace_id = span.trace.trace_id if span is not None else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "correlation_id", None):
+            payload["correlation_id"] = record.correlation_id
+        if getattr(record, "trace_id", None):
+            payload["trace_id"] = record.trace_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(correlation_id)s] %(message)s")
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: records are dropped (and counted) when the queue is full."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (args may not be picklable / stable
+        # later) but leave formatting to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def configure_logging() -> None:
+    """Install the queue-backed pipeline on the root logger (idempotent)."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(TextFormatter() if app_config.log_format == "text" else JsonFormatter())
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=app_config.log_queue_max)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(app_config.log_level.upper())
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
@@ -0,0 +1,323 @@
+# backend/services/metrics.py
+
+"""
+Prometheus instrumentation for graph nodes and LLM calls, served as text
+exposition format on GET /metrics.
+
+- Graph nodes are timed by GraphMetricsHandler, a callback handler bound
+  to every compiled graph in build_graph (so no call site has to pass it).
+  The same handler counts JSON parse failures and failed LLM calls.
+- Successful LLM calls (latency, queue wait, tokens incl. cached, cost) are
+  fed from usage_recorder, which every LLM implementation already reports to.
+- Retries and hedges are counted by CallPolicy.
+- JSON parse outcomes, repairs and re-emit calls are counted by
+  services/json_repair.py.
+
+Counters and histograms are a minimal in-process implementation of the
+exposition format; labels are free-form keyword arguments.
+"""
+
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+
+from config.llm_config import llm_config
+from models.evaluation_models import ParameterEvaluation
+from services.rate_limiter import error_status
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List["_Metric"] = []
+
+    def register(self, metric: "_Metric") -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], registry: Registry = REGISTRY) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        return tuple((name, str(labels.get(name, ""))) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every label combination."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = DURATION_BUCKETS, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label key -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelKey, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        lines = []
+        for key, (counts, total, count) in values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+# ---- metric definitions ----
+
+node_duration = Histogram(
+    "scriptwise_node_duration_seconds", "Wall time of a graph node.", ["node", "outcome"],
+)
+llm_call_duration = Histogram(
+    "scriptwise_llm_call_duration_seconds", "Latency of an LLM call, including retries.", ["node", "model", "outcome"],
+)
+llm_queue_wait = Histogram(
+    "scriptwise_llm_queue_wait_seconds", "Time an LLM call waited for the outbound limiter.", ["node", "model"],
+    buckets=QUEUE_WAIT_BUCKETS,
+)
+llm_tokens = Counter(
+    "scriptwise_llm_tokens_total", "Tokens reported by the provider (kind=prompt|completion|cached).",
+    ["node", "model", "kind"],
+)
+llm_cost = Counter(
+    "scriptwise_llm_cost_usd_total", "Estimated LLM spend at the configured per-1M-token prices.", ["node", "model"],
+)
+llm_parse_failures = Counter(
+    "scriptwise_llm_parse_failures_total", "LLM outputs that failed JSON parsing.", ["node"],
+)
+llm_json_parses = Counter(
+    "scriptwise_llm_json_parses_total",
+    "JSON answers by parse outcome (outcome=clean|repaired|failed).", ["node", "outcome"],
+)
+llm_json_repairs = Counter(
+    "scriptwise_llm_json_repairs_total", "Defects fixed by the tolerant JSON parser, per kind.", ["node", "repair"],
+)
+llm_json_reemits = Counter(
+    "scriptwise_llm_json_reemits_total",
+    "'Re-emit JSON only' calls made after a parse failure (outcome=ok|failed).", ["node", "outcome"],
+)
+llm_retries = Counter(
+    "scriptwise_llm_retries_total", "LLM calls retried by the call policy.", ["node", "reason"],
+)
+llm_hedges = Counter(
+    "scriptwise_llm_hedges_total", "Hedged duplicate LLM requests (outcome=fired|won).", ["node", "outcome"],
+)
+revision_parameters = Counter(
+    "scriptwise_revision_parameters_total",
+    "Parameters of revision evaluations by outcome (reevaluated|reused).", ["outcome"],
+)
+llm_provider_batches = Counter(
+    "scriptwise_llm_provider_batches_total",
+    "Provider batch-API submissions by final status (completed|failed|expired|cancelled|error).", ["backend", "status"],
+)
+llm_provider_batch_requests = Counter(
+    "scriptwise_llm_provider_batch_requests_total",
+    "Chat completion requests sent through the provider batch API (outcome=ok|error).", ["backend", "outcome"],
+)
+llm_calls_cancelled = Counter(
+    "scriptwise_llm_calls_cancelled_total",
+    "In-flight provider requests aborted by cancellation (client disconnect, losing hedge, quorum cut-off).",
+    ["node", "model"],
+)
+evaluations_cancelled = Counter(
+    "scriptwise_evaluations_cancelled_total",
+    "Evaluations cancelled because the HTTP client disconnected before the response.", ["endpoint"],
+)
+
+
+def failure_reason(exc: BaseException) -> str:
+    """Coarse failure label shared by the retry and LLM-call metrics."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    status = error_status(exc)
+    if status == 429:
+        return "rate_limited"
+    if status is not None and status >= 500:
+        return "server_error"
+    return "error"
+
+
+def model_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD estimate: cascade small-model prices for that model, the large-model prices otherwise."""
+    if llm_config.llm_cascade_enabled and model == llm_config.llm_cascade_small_model:
+        price_in, price_out = llm_config.llm_cascade_small_price_in, llm_config.llm_cascade_small_price_out
+    else:
+        price_in, price_out = llm_config.llm_cascade_large_price_in, llm_config.llm_cascade_large_price_out
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def record_llm_call(rec: Any) -> None:
+    """Export one successful LLMCallRecord (called by usage_recorder)."""
+    outcome = "cache_hit" if rec.local_cache_hit else "ok"
+    llm_call_duration.observe(rec.latency_s, node=rec.node, model=rec.model, outcome=outcome)
+    if rec.local_cache_hit:
+        return
+    llm_queue_wait.observe(rec.queue_wait_s, node=rec.node, model=rec.model)
+    llm_tokens.inc(rec.prompt_tokens, node=rec.node, model=rec.model, kind="prompt")
+    llm_tokens.inc(rec.completion_tokens, node=rec.node, model=rec.model, kind="completion")
+    llm_tokens.inc(rec.cached_tokens, node=rec.node, model=rec.model, kind="cached")
+    llm_cost.inc(model_cost(rec.model, rec.prompt_tokens, rec.completion_tokens), node=rec.node, model=rec.model)
+
+
+def _node_outcome(node: str, outputs: Any) -> str:
+    if not isinstance(outputs, dict):
+        return "ok"
+    if outputs.get("parameter_errors"):
+        return "degraded"
+    # Imported here: the parameter nodes import this module (through services/json_repair.py)
+    from graph.nodes.parameter_node import is_failed_parameter
+
+    param_eval = (outputs.get("parameter_results") or {}).get(node)
+    if isinstance(param_eval, ParameterEvaluation) and is_failed_parameter(param_eval):
+        return "failed"
+    return "ok"
+
+
+class GraphMetricsHandler(BaseCallbackHandler):
+    """Times graph nodes and counts parse failures / failed LLM calls."""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._runs: Dict[UUID, Tuple[str, str, Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, kind: str, node: str, model: Optional[str] = None) -> None:
+        with self._lock:
+            self._runs[run_id] = (kind, node, model, time.perf_counter())
+
+    def _pop(self, run_id: UUID) -> Optional[Tuple[str, str, Optional[str], float]]:
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node is None:
+            return
+        name = kwargs.get("name") or ""
+        if name == node:
+            self._start(run_id, "node", node)
+        elif kwargs.get("run_type") == "parser" or name.endswith("OutputParser"):
+            self._start(run_id, "parser", node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs: Any) -> None:
+        run = self._pop(run_id)
+        if run is not None and run[0] == "node":
+            node_duration.observe(time.perf_counter() - run[3], node=run[1], outcome=_node_outcome(run[1], outputs))
+
+    def on_chain_error(self, error, *, run_id, **kwargs: Any) -> None:
+        run = self._pop(run_id)
+        if run is None:
+            return
+        kind, node, _, started = run
+        if kind == "node":
+            node_duration.observe(time.perf_counter() - started, node=node, outcome="error")
+        elif isinstance(error, OutputParserException):
+            llm_parse_failures.inc(node=node)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        self._start(run_id, "llm", metadata.get("langgraph_node", "unknown"), metadata.get("ls_model_name"))
+
+    def on_llm_end(self, response, *, run_id, **kwargs: Any) -> None:
+        # Successful calls are exported from usage_recorder (it knows queue wait / cache hits)
+        self._pop(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs: Any) -> None:
+        run = self._pop(run_id)
+        if run is None:
+            return
+        _, node, model, started = run
+        llm_call_duration.observe(
+            time.perf_counter() - started, node=node, model=model or "unknown", outcome=failure_reason(error),
+        )
+
+
+graph_metrics_handler = GraphMetricsHandler()
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
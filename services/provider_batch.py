@@ -0,0 +1,243 @@
+# backend/services/provider_batch.py
+
+"""
+Provider batch-API transport for non-urgent evaluations.
+
+Inside provider_batch_scope(batch), OpenRouterLLM does not call
+/chat/completions itself: it hands the rendered request body to the
+ProviderBatch and awaits the answer. The ProviderBatch collects the
+requests of every node of every graph run in the scope and, once no new
+request has arrived for LLM_BATCH_COLLECT_WINDOW_S (or LLM_BATCH_MAX_WAIT_S
+after the first one, or at LLM_BATCH_MAX_REQUESTS), submits them as one
+OpenAI-format batch per backend:
+
+    POST /files    (purpose=batch, one {"custom_id", "method", "url", "body"} line per request)
+    POST /batches  (endpoint=/v1/chat/completions)
+    GET  /batches/{id}            every LLM_BATCH_POLL_INTERVAL_S until terminal
+    GET  /files/{output_file_id}/content   (and the error file)
+
+Each answer resolves its caller as an ordinary ChatCompletion, so parsing,
+re-emits, aggregate_scores and the usage records work unchanged. A graph
+advances one batch per LLM round (parameters, then summary), so the
+scope only pays off with many scripts in flight; see the --provider-batch
+option of services/batch_runner.py.
+
+Requests the batch could not answer (error file, expired or failed batch)
+raise ProviderBatchError in the node that made them, which reports that
+parameter as failed like any other model failure.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from openai.types.chat import ChatCompletion
+
+from config.llm_config import llm_config
+from services.metrics import llm_provider_batch_requests, llm_provider_batches
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+_active: ContextVar[Optional["ProviderBatch"]] = ContextVar("provider_batch", default=None)
+
+
+class ProviderBatchError(RuntimeError):
+    """A request submitted through the provider batch API got no usable answer."""
+
+
+@dataclass
+class _Pending:
+    custom_id: str
+    body: Dict[str, Any]
+    future: asyncio.Future
+
+
+@contextmanager
+def provider_batch_scope(batch: Optional["ProviderBatch"]) -> Iterator[None]:
+    """Route every LLM call made inside the block (and the tasks it starts) through `batch`."""
+    token = _active.set(batch)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def active_provider_batch() -> Optional["ProviderBatch"]:
+    return _active.get()
+
+
+def _batch_body(params: Dict[str, Any]) -> Dict[str, Any]:
+    """chat.completions.create() kwargs -> JSON request body (extra_body merged in, None dropped)."""
+    body = {key: value for key, value in params.items() if key != "extra_body" and value is not None}
+    body.update(params.get("extra_body") or {})
+    return body
+
+
+class ProviderBatch:
+    """Collects chat completion requests and submits them through the provider's batch API."""
+
+    def __init__(
+        self,
+        collect_window_s: Optional[float] = None,
+        max_wait_s: Optional[float] = None,
+        max_requests: Optional[int] = None,
+        poll_interval_s: Optional[float] = None,
+        completion_window: Optional[str] = None,
+    ) -> None:
+        self.collect_window_s = llm_config.llm_batch_collect_window_s if collect_window_s is None else collect_window_s
+        self.max_wait_s = llm_config.llm_batch_max_wait_s if max_wait_s is None else max_wait_s
+        self.max_requests = max(1, max_requests or llm_config.llm_batch_max_requests)
+        self.poll_interval_s = llm_config.llm_batch_poll_interval_s if poll_interval_s is None else poll_interval_s
+        self.completion_window = completion_window or llm_config.llm_batch_completion_window
+        self._ids = itertools.count(1)
+        # backend -> requests waiting for the next submission / the client to submit them with
+        self._pending: Dict[str, List[_Pending]] = {}
+        self._clients: Dict[str, Any] = {}
+        self._first_pending_at: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._submissions: set = set()
+        self.stats = {"batches": 0, "requests": 0, "failed_requests": 0}
+
+    async def submit(self, backend: str, client: Any, params: Dict[str, Any]) -> ChatCompletion:
+        """Queue one chat completion request for the next batch and wait for its answer."""
+        if client is None:
+            raise ProviderBatchError(f"Backend {backend!r} has no async client to submit batches with")
+        loop = asyncio.get_running_loop()
+        pending = _Pending(f"req-{next(self._ids)}", _batch_body(params), loop.create_future())
+        self._clients[backend] = client
+        queued = self._pending.setdefault(backend, [])
+        queued.append(pending)
+        if self._first_pending_at is None:
+            self._first_pending_at = loop.time()
+
+        if len(queued) >= self.max_requests:
+            self._flush()
+        else:
+            self._schedule_flush(loop)
+        return await pending.future
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        """(Re)arm the flush timer: quiet window since the last request, capped by max_wait_s."""
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = self.collect_window_s
+        if self._first_pending_at is not None:
+            delay = min(delay, self._first_pending_at + self.max_wait_s - loop.time())
+        self._timer = loop.call_later(max(0.0, delay), self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._first_pending_at = None
+        pending, self._pending = self._pending, {}
+        for backend, entries in pending.items():
+            # Pending requests whose caller gave up (cancelled node) aren't worth submitting
+            entries = [entry for entry in entries if not entry.future.done()]
+            if not entries:
+                continue
+            task = asyncio.get_running_loop().create_task(
+                self._run_batch(backend, self._clients[backend], entries)
+            )
+            self._submissions.add(task)
+            task.add_done_callback(self._submissions.discard)
+
+    async def _run_batch(self, backend: str, client: Any, entries: List[_Pending]) -> None:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            batch = await self._create_batch(client, entries)
+            logger.info("Submitted provider batch %s (%d requests to %s)", batch.id, len(entries), backend)
+            while batch.status not in TERMINAL_STATUSES:
+                await asyncio.sleep(self.poll_interval_s)
+                batch = await client.batches.retrieve(batch.id)
+            status = batch.status
+
+            answers: Dict[str, Dict[str, Any]] = {}
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    answers.update(await self._read_results(client, file_id))
+            self._resolve(backend, entries, answers, status)
+            logger.info(
+                "Provider batch %s %s after %.1fs (%d answered)",
+                batch.id, status, time.perf_counter() - started, len(answers),
+            )
+        except Exception as exc:
+            logger.warning("Provider batch to %s failed: %s", backend, exc)
+            for entry in entries:
+                if not entry.future.done():
+                    entry.future.set_exception(ProviderBatchError(f"Provider batch failed: {exc}"))
+            llm_provider_batch_requests.inc(len(entries), backend=backend, outcome="error")
+            self.stats["failed_requests"] += len(entries)
+        finally:
+            llm_provider_batches.inc(backend=backend, status=status)
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(entries)
+
+    async def _create_batch(self, client: Any, entries: List[_Pending]) -> Any:
+        lines = [
+            json.dumps({"custom_id": entry.custom_id, "method": "POST", "url": ENDPOINT, "body": entry.body})
+            for entry in entries
+        ]
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        uploaded = await client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        return await client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=ENDPOINT,
+            completion_window=self.completion_window,
+        )
+
+    @staticmethod
+    async def _read_results(client: Any, file_id: str) -> Dict[str, Dict[str, Any]]:
+        """custom_id -> result line of a batch output / error file."""
+        content = await client.files.content(file_id)
+        results: Dict[str, Dict[str, Any]] = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping unreadable line in batch file %s", file_id)
+                continue
+            results[record.get("custom_id", "")] = record
+        return results
+
+    def _resolve(
+        self, backend: str, entries: List[_Pending], answers: Dict[str, Dict[str, Any]], status: str
+    ) -> None:
+        for entry in entries:
+            if entry.future.done():
+                continue
+            record = answers.get(entry.custom_id)
+            response = (record or {}).get("response") or {}
+            try:
+                if record is None:
+                    raise ProviderBatchError(f"No answer in the {status} batch")
+                if record.get("error") or response.get("status_code") != 200:
+                    detail = record.get("error") or response.get("body")
+                    raise ProviderBatchError(f"Batch request failed ({response.get('status_code')}): {detail}")
+                entry.future.set_result(ChatCompletion.model_validate(response["body"]))
+                llm_provider_batch_requests.inc(backend=backend, outcome="ok")
+            except Exception as exc:
+                entry.future.set_exception(
+                    exc if isinstance(exc, ProviderBatchError) else ProviderBatchError(str(exc))
+                )
+                llm_provider_batch_requests.inc(backend=backend, outcome="error")
+                self.stats["failed_requests"] += 1
+
+    async def aclose(self) -> None:
+        """Submit anything still queued and wait for the outstanding batches."""
+        if any(self._pending.values()):
+            self._flush()
+        if self._submissions:
+            await asyncio.gather(*self._submissions, return_exceptions=True)
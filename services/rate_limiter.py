@@ -0,0 +1,308 @@
+# backend/services/rate_limiter.py
+
+"""
+Process-wide limiter for outbound LLM calls.
+
+- TokenBucket:     requests-per-minute / tokens-per-minute budgets.
+- AdaptiveLimiter: AIMD concurrency window on top of the buckets. The
+                   window grows by ~1 per window of successful calls and
+                   is cut multiplicatively on 429 / 5xx (honouring
+                   Retry-After), so throughput settles at the provider's
+                   ceiling instead of collapsing into errors.
+
+State is guarded by a threading.Lock so the same limiter serves the async
+graph nodes and the sync `_generate` path (and survives multiple event
+loops, e.g. repeated asyncio.run in benchmarks).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+
+class TokenBucket:
+    """
+    Reservation-style bucket: `reserve` always succeeds and returns how long
+    the caller must wait, letting the balance go negative. This keeps FIFO
+    fairness without a waiter list per bucket.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single request larger than the bucket would otherwise never fit
+        self._tokens -= min(amount, self.capacity)
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    @property
+    def available(self) -> float:
+        return self._tokens
+
+
+class LimiterPermit:
+    """Handed to the caller for one LLM call; set `used_tokens` once usage is known."""
+
+    def __init__(self, estimated_tokens: int, queue_wait_s: float) -> None:
+        self.estimated_tokens = estimated_tokens
+        self.queue_wait_s = queue_wait_s
+        self.used_tokens: Optional[int] = None
+
+
+class _Waiter:
+    """A queued caller: an asyncio future (async path) or a threading.Event (sync path)."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = threading.Event() if loop is None else None
+
+    def wake(self) -> None:
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status of a provider error (openai.APIStatusError and friends), if any."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        initial_window: int = 16,
+        min_window: int = 1,
+        max_window: int = 64,
+        decrease_factor: float = 0.5,
+        decrease_cooldown_s: float = 2.0,
+        throttle_pause_s: float = 1.0,
+        wait_samples: int = 2048,
+    ) -> None:
+        self.min_window = max(1, min_window)
+        self.max_window = max(self.min_window, max_window)
+        self.window = float(min(max(initial_window, self.min_window), self.max_window))
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown_s = decrease_cooldown_s
+        self.throttle_pause_s = throttle_pause_s
+
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")  # the first error always counts
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+
+        self._acquired = 0
+        self._succeeded = 0
+        self._throttled = 0
+        self._server_errors = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._waits: Deque[float] = deque(maxlen=wait_samples)
+
+    # ---- concurrency window ----
+
+    def _has_capacity(self) -> bool:
+        return self._in_flight < int(self.window)
+
+    def _wake_locked(self) -> None:
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            waiter.wake()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._wake_locked()
+
+    async def _acquire_slot(self) -> None:
+        with self._lock:
+            if self._has_capacity() and not self._waiters:
+                self._in_flight += 1
+                return
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    handed_slot = False
+                else:
+                    handed_slot = True
+            if handed_slot:
+                self._release()
+            raise
+
+    def _acquire_slot_sync(self) -> None:
+        with self._lock:
+            if self._has_capacity() and not self._waiters:
+                self._in_flight += 1
+                return
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+        waiter.event.wait()
+
+    # ---- rate budgets ----
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Book this call against the RPM/TPM buckets; returns the required delay."""
+        now = time.monotonic()
+        with self._lock:
+            delay = max(0.0, self._paused_until - now)
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(estimated_tokens, now))
+        return delay
+
+    def _settle_tokens(self, permit: LimiterPermit) -> None:
+        if self._tokens is None or permit.used_tokens is None:
+            return
+        with self._lock:
+            self._tokens.refund(permit.estimated_tokens - permit.used_tokens, time.monotonic())
+
+    # ---- AIMD feedback ----
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._succeeded += 1
+            self.window = min(float(self.max_window), self.window + 1.0 / self.window)
+            self._wake_locked()
+
+    def _on_error(self, exc: BaseException) -> None:
+        status = error_status(exc)
+        if status is None or (status != 429 and status < 500):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if status == 429:
+                self._throttled += 1
+                # Hold back new calls for Retry-After (or a short default pause)
+                retry_after = retry_after_seconds(exc) or self.throttle_pause_s
+                self._paused_until = max(self._paused_until, now + retry_after)
+            else:
+                self._server_errors += 1
+            # One burst of 429s is a single congestion signal, not N of them
+            if now - self._last_decrease >= self.decrease_cooldown_s:
+                self.window = max(float(self.min_window), self.window * self.decrease_factor)
+                self._last_decrease = now
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self._acquired += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._waits.append(waited)
+
+    def _finish(self, permit: LimiterPermit, exc: Optional[BaseException]) -> None:
+        self._settle_tokens(permit)
+        if exc is None:
+            self._on_success()
+        else:
+            self._on_error(exc)
+        self._release()
+
+    # ---- public API ----
+
+    @asynccontextmanager
+    async def limit(self, estimated_tokens: int = 0) -> AsyncIterator[LimiterPermit]:
+        """Hold one concurrency slot (and RPM/TPM budget) for the duration of an async call."""
+        started = time.perf_counter()
+        await self._acquire_slot()
+        try:
+            delay = self._reserve(estimated_tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._release()
+            raise
+        permit = LimiterPermit(estimated_tokens, time.perf_counter() - started)
+        self._record_wait(permit.queue_wait_s)
+        try:
+            yield permit
+        except BaseException as exc:
+            self._finish(permit, exc)
+            raise
+        self._finish(permit, None)
+
+    @contextmanager
+    def limit_sync(self, estimated_tokens: int = 0) -> Iterator[LimiterPermit]:
+        """Blocking counterpart of `limit` for the sync `_generate` path."""
+        started = time.perf_counter()
+        self._acquire_slot_sync()
+        try:
+            delay = self._reserve(estimated_tokens)
+            if delay > 0:
+                time.sleep(delay)
+        except BaseException:
+            self._release()
+            raise
+        permit = LimiterPermit(estimated_tokens, time.perf_counter() - started)
+        self._record_wait(permit.queue_wait_s)
+        try:
+            yield permit
+        except BaseException as exc:
+            self._finish(permit, exc)
+            raise
+        self._finish(permit, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            data: Dict[str, Any] = {
+                "window": round(self.window, 2),
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "acquired": self._acquired,
+                "succeeded": self._succeeded,
+                "throttled": self._throttled,
+                "server_errors": self._server_errors,
+                "queue_wait_avg_s": self._wait_total / self._acquired if self._acquired else 0.0,
+                "queue_wait_max_s": self._wait_max,
+                "requests_available": self._requests.available if self._requests else None,
+                "tokens_available": self._tokens.available if self._tokens else None,
+            }
+        for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            data[f"queue_wait_{label}_s"] = waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+        return data
@@ -0,0 +1,179 @@
+# backend/services/revision_service.py
+
+"""
+Revision-aware re-evaluation of a new draft of an already evaluated script.
+
+Every draft evaluated through evaluate_revision() is stored (script,
+per-parameter ParameterEvaluations, overall score) under its fingerprint.
+When the next draft names that fingerprint as its previous draft, the two
+are diffed (services/draft_diff.py) and only the parameters the edits can
+move are re-run: the fanout graph fans out to `rerun_parameters` alone,
+and the other parameters' previous results are seeded into
+parameter_results, so the aggregator and summary see a complete set.
+
+Previous results are not reused if they were failures (0.0 score and
+confidence) or were produced under different model / prompt settings.
+Partly reused evaluations are kept out of the whole-evaluation cache.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from config.app_config import app_config
+from graph.graph_builder import FANOUT_MODE
+from graph.nodes.parameter_node import is_failed_parameter
+from models.evaluation_models import ParameterEvaluation
+from models.io_models import ParameterDelta, RevisionEvaluationResponse, ScriptInput
+from prompts.parameter_specs import PARAMETER_SPECS
+from services.cache import CacheBackend, build_cache
+from services.call_policy import deadline_scope
+from services.draft_diff import affected_parameters, diff_drafts
+from services.evaluation_service import (
+    build_evaluation_response,
+    discard_checkpoint,
+    evaluation_config,
+    evaluation_input,
+    get_graph,
+    script_fingerprint,
+)
+from services.metrics import revision_parameters
+
+logger = logging.getLogger(__name__)
+
+_EMPTY_SCRIPT = ScriptInput(title="", logline="", content="", genre="")
+
+
+@dataclass
+class StoredDraft:
+    script: ScriptInput
+    parameter_results: Dict[str, ParameterEvaluation]
+    overall_score: float
+    settings: str
+
+
+def _settings_key() -> str:
+    """Fingerprint of the model / prompt settings alone (results from other settings aren't reused)."""
+    return script_fingerprint(_EMPTY_SCRIPT, FANOUT_MODE)
+
+
+_draft_store: Optional[CacheBackend] = None
+
+
+def get_draft_store() -> CacheBackend:
+    global _draft_store
+    if _draft_store is None:
+        _draft_store = build_cache(
+            max_entries=app_config.revision_store_max_entries,
+            ttl_seconds=app_config.revision_store_ttl_seconds,
+            sqlite_path=app_config.revision_store_sqlite_path,
+            sqlite_table="drafts",
+        )
+    return _draft_store
+
+
+async def load_draft(fingerprint: str) -> Optional[StoredDraft]:
+    raw = await get_draft_store().aget(fingerprint)
+    if raw is None:
+        return None
+    record = json.loads(raw)
+    return StoredDraft(
+        script=ScriptInput.model_validate(record["script"]),
+        parameter_results={
+            param_id: ParameterEvaluation.model_validate(result)
+            for param_id, result in record["parameter_results"].items()
+        },
+        overall_score=record["overall_score"],
+        settings=record["settings"],
+    )
+
+
+async def store_draft(
+    fingerprint: str, script: ScriptInput, parameter_results: Dict[str, ParameterEvaluation], overall_score: float
+) -> None:
+    record = {
+        "script": script.model_dump(),
+        "parameter_results": {param_id: result.model_dump() for param_id, result in parameter_results.items()},
+        "overall_score": overall_score,
+        "settings": _settings_key(),
+    }
+    await get_draft_store().aset(fingerprint, json.dumps(record, ensure_ascii=False))
+
+
+def _deltas(
+    previous: Optional[StoredDraft], results: Dict[str, ParameterEvaluation], reevaluated: List[str]
+) -> Dict[str, ParameterDelta]:
+    deltas = {}
+    for param_id, result in results.items():
+        before = previous.parameter_results.get(param_id) if previous is not None else None
+        previous_score = before.raw_score if before is not None else None
+        deltas[param_id] = ParameterDelta(
+            previous_score=previous_score,
+            score=result.raw_score,
+            delta=round(result.raw_score - previous_score, 4) if previous_score is not None else None,
+            reevaluated=param_id in reevaluated,
+        )
+    return deltas
+
+
+async def evaluate_revision(
+    script: ScriptInput, previous_fingerprint: Optional[str], evaluation_id: str
+) -> RevisionEvaluationResponse:
+    """
+    Evaluate `script` as a revision of the draft stored under
+    `previous_fingerprint` (a full evaluation if there is none), and store
+    it for the next revision.
+    """
+    fingerprint = script_fingerprint(script, FANOUT_MODE)
+    previous = await load_draft(previous_fingerprint) if previous_fingerprint else None
+    if previous_fingerprint and previous is None:
+        logger.info("Previous draft %s not found; evaluating %s in full", previous_fingerprint, fingerprint)
+    elif previous is not None and previous.settings != _settings_key():
+        logger.info("Previous draft %s was evaluated under other settings; evaluating in full", previous_fingerprint)
+        previous = None
+
+    rerun = list(PARAMETER_SPECS)
+    reused: Dict[str, ParameterEvaluation] = {}
+    changes = None
+    if previous is not None:
+        diff = diff_drafts(previous.script, script)
+        changes = diff.as_dict()
+        affected = set(affected_parameters(diff))
+        reused = {
+            param_id: result
+            for param_id, result in previous.parameter_results.items()
+            if param_id in PARAMETER_SPECS and param_id not in affected and not is_failed_parameter(result)
+        }
+        rerun = [param_id for param_id in PARAMETER_SPECS if param_id not in reused]
+        logger.info(
+            "Revision %s of %s: %s changed; re-running %d of %d parameters",
+            fingerprint, previous_fingerprint, ", ".join(changes["kinds"]) or "nothing",
+            len(rerun), len(PARAMETER_SPECS),
+        )
+
+    config = evaluation_config(script, evaluation_id, FANOUT_MODE)
+    graph_input, deadline = await evaluation_input(script, config)
+    if graph_input is not None:  # not resuming from a checkpoint
+        graph_input["rerun_parameters"] = rerun
+        graph_input["parameter_results"] = dict(reused)
+    with deadline_scope(deadline):
+        state_out = await get_graph(FANOUT_MODE).ainvoke(graph_input, config)
+    await discard_checkpoint(config)
+
+    result = build_evaluation_response(script, state_out)
+    results: Dict[str, ParameterEvaluation] = state_out.get("parameter_results") or {}
+    await store_draft(fingerprint, script, results, result.overall.score)
+    revision_parameters.inc(len(rerun), outcome="reevaluated")
+    revision_parameters.inc(len(reused), outcome="reused")
+
+    return RevisionEvaluationResponse(
+        **result.model_dump(),
+        fingerprint=fingerprint,
+        previous_fingerprint=previous_fingerprint if previous is not None else None,
+        reevaluated_parameters=rerun,
+        reused_parameters=list(reused),
+        parameter_deltas=_deltas(previous, results, rerun),
+        overall_delta=round(result.overall.score - previous.overall_score, 4) if previous is not None else None,
+        changes=changes,
+    )
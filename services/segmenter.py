@@ -0,0 +1,122 @@
+# backend/services/segmenter.py
+
+"""
+Streaming scene segmenter for full-length screenplays.
+
+Splits screenplay text on sluglines (INT. / EXT. / INT./EXT. / I/E) and
+tracks page breaks (form feeds), yielding one Scene at a time so a 300-page
+script never has to be held as a list of scenes. Scenes are then packed
+into bounded-size chunks for the map stage.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List
+
+# Optional leading scene number, then the slug prefix ("INT.", "EXT.", "INT./EXT.", "I/E", ...)
+SLUGLINE_RE = re.compile(
+    r"^\s*(?:\d+[A-Z]?\s+)?(?:INT\.?/EXT\.?|EXT\.?/INT\.?|I/E\.?|INT\.|EXT\.)\s",
+    re.IGNORECASE,
+)
+PAGE_BREAK = "\f"
+
+
+@dataclass
+class Scene:
+    index: int
+    heading: str
+    page: int
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def __len__(self) -> int:
+        return sum(len(line) + 1 for line in self.lines)
+
+
+@dataclass
+class Chunk:
+    index: int
+    first_page: int
+    last_page: int
+    scene_count: int
+    text: str
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Lazily iterate lines of a (possibly huge) string without splitlines()."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        yield text[start:end].rstrip("\r")
+        start = end + 1
+
+
+def iter_scenes(lines: Iterable[str], max_scene_chars: int = 8000) -> Iterator[Scene]:
+    """
+    Yield scenes in order. Text before the first slugline becomes scene 0
+    ("PREAMBLE"); overlong scenes are split so no Scene exceeds max_scene_chars.
+    """
+    page = 1
+    index = 0
+    current = Scene(index=0, heading="PREAMBLE", page=page)
+    size = 0
+
+    for line in lines:
+        if PAGE_BREAK in line:
+            page += line.count(PAGE_BREAK)
+            line = line.replace(PAGE_BREAK, "")
+
+        if SLUGLINE_RE.match(line):
+            if current.lines:
+                yield current
+                index += 1
+            current = Scene(index=index, heading=line.strip(), page=page, lines=[line.strip()])
+            size = len(line) + 1
+            continue
+
+        if size + len(line) + 1 > max_scene_chars and current.lines:
+            yield current
+            index += 1
+            current = Scene(index=index, heading=f"{current.heading} (cont.)", page=page)
+            size = 0
+
+        current.lines.append(line)
+        size += len(line) + 1
+
+    if current.lines and any(line.strip() for line in current.lines):
+        yield current
+
+
+def iter_chunks(scenes: Iterable[Scene], max_chunk_chars: int) -> Iterator[Chunk]:
+    """Pack consecutive scenes into chunks of at most max_chunk_chars (one scene minimum)."""
+    buffer: List[Scene] = []
+    size = 0
+    index = 0
+
+    for scene in scenes:
+        scene_size = len(scene)
+        if buffer and size + scene_size > max_chunk_chars:
+            yield _make_chunk(index, buffer)
+            index += 1
+            buffer, size = [], 0
+        buffer.append(scene)
+        size += scene_size
+
+    if buffer:
+        yield _make_chunk(index, buffer)
+
+
+def _make_chunk(index: int, scenes: List[Scene]) -> Chunk:
+    return Chunk(
+        index=index,
+        first_page=scenes[0].page,
+        last_page=scenes[-1].page,
+        scene_count=len(scenes),
+        text="\n\n".join(scene.text for scene in scenes),
+    )
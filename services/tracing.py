@@ -0,0 +1,376 @@
+# backend/services/tracing.py
+
+"""
+Lightweight OpenTelemetry-style span tracing.
+
+    POST /api/evaluate            (server span, routes_evaluate)
+      graph                       (TraceCallbackHandler, bound in build_graph)
+        node:<name>
+          llm                     model, token counts
+            http chat.completions (OpenRouterLLM, one per provider attempt)
+          parse                   JSON output parsing
+
+Spans use OTel-shaped ids (32-hex trace id, 16-hex span id) and are
+exported when the root span ends, off the event loop:
+
+- TRACING_EXPORTER=console|file writes a sampled share of traces
+  (TRACING_SAMPLE_RATE) as an indented tree to stderr or as JSONL;
+- TRACING_SLOW_THRESHOLD_S > 0 dumps the full span tree of every slower
+  trace (sampled by TRACING_SLOW_SAMPLE_RATE) to TRACING_SLOW_DIR.
+
+No collector is needed. With both off, span() yields a no-op span and the
+graph handler is not bound at all.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from config.app_config import app_config
+
+logger = logging.getLogger(__name__)
+
+CONSOLE_EXPORTER = "console"
+FILE_EXPORTER = "file"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("trace_current_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return app_config.tracing_exporter in (CONSOLE_EXPORTER, FILE_EXPORTER) or app_config.tracing_slow_threshold_s > 0
+
+
+class Trace:
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List["Span"] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: "Span") -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        root = spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "duration_ms": root.duration_ms,
+            "spans": [span.to_dict() for span in spans],
+        }
+
+
+class Span:
+    def __init__(self, name: str, trace: Trace, parent: Optional["Span"] = None, kind: str = "internal") -> None:
+        self.name = name
+        self.kind = kind
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.attributes: Dict[str, Any] = {}
+        trace.add(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(exc).__name__
+        self.attributes["error.message"] = str(exc)[:500]
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.parent_id is None:
+            _finish_trace(self.trace)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded by span() while tracing is off, so call sites never check for None."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_error(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, kind: str = "internal", parent: Optional[Span] = None) -> Span:
+    """Child of `parent` (default: the current span), or the root of a new trace."""
+    parent = parent if parent is not None else _current_span.get()
+    trace = parent.trace if parent is not None else Trace()
+    return Span(name, trace, parent, kind)
+
+
+def open_span(name: str, kind: str = "internal", parent: Optional[Span] = None, **attributes: Any) -> Any:
+    """Like span(), for code that cannot hold a context manager (e.g. across generator yields); call .end()."""
+    if not tracing_enabled():
+        return NOOP_SPAN
+    opened = start_span(name, kind, parent)
+    opened.set_attributes(attributes)
+    return opened
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Any]:
+    """Open a span, make it current for the block, and end it (recording any error)."""
+    if not tracing_enabled():
+        yield NOOP_SPAN
+        return
+    current = start_span(name, kind)
+    current.set_attributes(attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.record_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+@contextmanager
+def activate(current: Optional[Span]) -> Iterator[None]:
+    """Make an existing span (e.g. one opened by the graph handler) the parent of new spans."""
+    if current is None:
+        yield
+        return
+    token = _current_span.set(current)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+# ---- export (background thread, so the event loop never writes files) ----
+
+def _render_tree(trace: Dict[str, Any]) -> str:
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for item in trace["spans"]:
+        children.setdefault(item["parent_id"], []).append(item)
+
+    lines = [f"trace {trace['trace_id']} {trace['name']} {trace['duration_ms']:.1f}ms"]
+
+    def _walk(parent_id: Optional[str], depth: int) -> None:
+        for item in sorted(children.get(parent_id, []), key=lambda s: s["start_ns"]):
+            duration = item["duration_ms"]
+            attrs = " ".join(f"{k}={v}" for k, v in item["attributes"].items())
+            lines.append(
+                f"{'  ' * depth}{item['name']} "
+                f"{'%.1fms' % duration if duration is not None else 'unfinished'}"
+                f"{' [error]' if item['status'] == 'error' else ''} {attrs}".rstrip()
+            )
+            _walk(item["span_id"], depth + 1)
+
+    _walk(None, 1)
+    return "\n".join(lines)
+
+
+def _write(kind: str, trace: Dict[str, Any]) -> None:
+    if kind == CONSOLE_EXPORTER:
+        sys.stderr.write(_render_tree(trace) + "\n")
+    elif kind == FILE_EXPORTER:
+        with open(app_config.tracing_file_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(trace, ensure_ascii=False, default=str) + "\n")
+    else:  # slow-request dump
+        os.makedirs(app_config.tracing_slow_dir, exist_ok=True)
+        path = os.path.join(app_config.tracing_slow_dir, f"{int(time.time())}_{trace['trace_id']}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(trace, fh, ensure_ascii=False, indent=2, default=str)
+
+
+class _ExportWorker:
+    def __init__(self, max_queue: int = 1000) -> None:
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, kind: str, trace: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((kind, trace))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            kind, trace = self._queue.get()
+            try:
+                _write(kind, trace)
+            except Exception:
+                logger.exception("Trace export failed")
+
+
+_exporter = _ExportWorker()
+
+
+def _finish_trace(trace: Trace) -> None:
+    exporter = app_config.tracing_exporter
+    threshold = app_config.tracing_slow_threshold_s
+    export = exporter in (CONSOLE_EXPORTER, FILE_EXPORTER) and random.random() < app_config.tracing_sample_rate
+    root = trace.spans[0]
+    slow = threshold > 0 and root.duration_ms >= threshold * 1000 and random.random() < app_config.tracing_slow_sample_rate
+    if not (export or slow):
+        return
+    data = trace.to_dict()
+    if export:
+        _exporter.submit(exporter, data)
+    if slow:
+        _exporter.submit("slow", data)
+
+
+# ---- LangGraph callback handler ----
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """
+    Opens spans for the graph run, each node, each LLM call and each output
+    parser. Other runnables (prompts, sequences) only link their children
+    to the nearest span above them.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._spans: Dict[UUID, Span] = {}
+        self._parents: Dict[UUID, Optional[UUID]] = {}
+        self._lock = threading.Lock()
+
+    def span_for_run(self, run_id: Optional[UUID]) -> Optional[Span]:
+        with self._lock:
+            while run_id is not None:
+                found = self._spans.get(run_id)
+                if found is not None:
+                    return found
+                run_id = self._parents.get(run_id)
+        return None
+
+    def _open(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, kind: str = "internal") -> Span:
+        parent = self.span_for_run(parent_run_id) if parent_run_id is not None else None
+        opened = start_span(name, kind, parent)
+        with self._lock:
+            self._spans[run_id] = opened
+        return opened
+
+    def _close(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        with self._lock:
+            self._parents.pop(run_id, None)
+            closed = self._spans.pop(run_id, None)
+        if closed is not None:
+            if error is not None:
+                closed.record_error(error)
+            closed.end()
+        return closed
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        name = kwargs.get("name") or ""
+        if parent_run_id is None:
+            self._open(run_id, None, "graph")
+        elif node is not None and name == node:
+            self._open(run_id, parent_run_id, f"node:{node}").set_attribute("node", node)
+        elif kwargs.get("run_type") == "parser":
+            self._open(run_id, parent_run_id, "parse").set_attribute("parser", name)
+        else:
+            with self._lock:
+                self._parents[run_id] = parent_run_id
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs: Any) -> None:
+        self._close(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        opened = self._open(run_id, parent_run_id, "llm")
+        opened.set_attributes({
+            "llm.model": metadata.get("ls_model_name"),
+            "llm.provider": metadata.get("ls_provider"),
+            "node": metadata.get("langgraph_node"),
+        })
+
+    def on_llm_end(self, response, *, run_id, **kwargs: Any) -> None:
+        with self._lock:
+            opened = self._spans.get(run_id)
+        if opened is not None:
+            usage: Dict[str, Any] = {}
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+            opened.set_attributes({
+                "llm.prompt_tokens": usage.get("input_tokens", 0),
+                "llm.completion_tokens": usage.get("output_tokens", 0),
+                "llm.cached_tokens": (usage.get("input_token_details") or {}).get("cache_read", 0),
+            })
+        self._close(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs: Any) -> None:
+        self._close(run_id, error)
+
+
+trace_handler = TraceCallbackHandler()
+
+
+def span_for_run(run_id: Optional[UUID]) -> Optional[Span]:
+    """Span the graph handler opened for a LangChain run (e.g. an LLM call), if any."""
+    if run_id is None:
+        return None
+    return trace_handler.span_for_run(run_id)
@@ -0,0 +1,133 @@
+# backend/services/usage_recorder.py
+
+"""
+In-process record of per-call LLM usage.
+
+Every OpenRouterLLM call appends one record (graph node, model, prompt /
+cached / completion tokens, latency, time-to-first-token when streaming,
+time spent queued in the rate limiter),
+so we can confirm provider prefix-cache discounts per parameter node.
+Each record is also exported to the Prometheus metrics (services/metrics.py).
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from langgraph.config import get_config
+
+from services.metrics import record_llm_call
+
+
+def current_node(run_manager: Optional[Any] = None) -> str:
+    """Name of the LangGraph node making an LLM call ("unknown" outside a graph)."""
+    metadata = getattr(run_manager, "metadata", None) or {}
+    if "langgraph_node" not in metadata:
+        # Streaming calls don't receive a run manager; fall back to the graph's config
+        try:
+            metadata = get_config().get("metadata") or {}
+        except RuntimeError:
+            metadata = {}
+    return metadata.get("langgraph_node", "unknown")
+
+
+@dataclass
+class LLMCallRecord:
+    node: str
+    model: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    latency_s: float = 0.0
+    ttft_s: Optional[float] = None
+    queue_wait_s: float = 0.0
+    local_cache_hit: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+_capture: ContextVar[Optional[List[LLMCallRecord]]] = ContextVar("llm_usage_capture", default=None)
+
+
+class UsageRecorder:
+    def __init__(self, max_records: int = 1000) -> None:
+        self._records: Deque[LLMCallRecord] = deque(maxlen=max_records)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, rec: LLMCallRecord) -> None:
+        sink = _capture.get()
+        if sink is not None:
+            sink.append(rec)
+        with self._lock:
+            self._records.append(rec)
+            totals = self._totals.setdefault(
+                rec.node,
+                {
+                    "calls": 0,
+                    "local_cache_hits": 0,
+                    "prompt_tokens": 0,
+                    "cached_tokens": 0,
+                    "completion_tokens": 0,
+                    "latency_s": 0.0,
+                    "ttft_s": 0.0,
+                    "ttft_samples": 0,
+                    "queue_wait_s": 0.0,
+                },
+            )
+            totals["calls"] += 1
+            totals["local_cache_hits"] += int(rec.local_cache_hit)
+            totals["prompt_tokens"] += rec.prompt_tokens
+            totals["cached_tokens"] += rec.cached_tokens
+            totals["completion_tokens"] += rec.completion_tokens
+            totals["latency_s"] += rec.latency_s
+            totals["queue_wait_s"] += rec.queue_wait_s
+            if rec.ttft_s is not None:
+                totals["ttft_s"] += rec.ttft_s
+                totals["ttft_samples"] += 1
+        record_llm_call(rec)
+
+    @contextmanager
+    def capture(self) -> Iterator[List[LLMCallRecord]]:
+        """Also collect the records of every LLM call made inside the block."""
+        sink: List[LLMCallRecord] = []
+        token = _capture.set(sink)
+        try:
+            yield sink
+        finally:
+            _capture.reset(token)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            records = list(self._records)[-limit:]
+        return [asdict(rec) for rec in records]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            totals = {node: dict(values) for node, values in self._totals.items()}
+        summary = {}
+        for node, t in totals.items():
+            summary[node] = {
+                "calls": t["calls"],
+                "local_cache_hits": t["local_cache_hits"],
+                "prompt_tokens": t["prompt_tokens"],
+                "cached_tokens": t["cached_tokens"],
+                "completion_tokens": t["completion_tokens"],
+                "cached_token_ratio": (
+                    t["cached_tokens"] / t["prompt_tokens"] if t["prompt_tokens"] else 0.0
+                ),
+                "avg_latency_s": t["latency_s"] / t["calls"] if t["calls"] else 0.0,
+                "avg_queue_wait_s": t["queue_wait_s"] / t["calls"] if t["calls"] else 0.0,
+                "avg_ttft_s": (
+                    t["ttft_s"] / t["ttft_samples"] if t["ttft_samples"] else None
+                ),
+            }
+        return summary
+
+
+usage_recorder = UsageRecorder()
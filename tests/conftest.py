@@ -0,0 +1,34 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+# Keep the process-wide SQLite stores out of the working tree (read when config is first imported)
+_STATE_DIR = tempfile.mkdtemp(prefix="scriptwise-tests-")
+os.environ.setdefault("JOBS_SQLITE_PATH", os.path.join(_STATE_DIR, "jobs.db"))
+os.environ.setdefault("CHECKPOINT_SQLITE_PATH", os.path.join(_STATE_DIR, "checkpoints.db"))
+
+
+@pytest.fixture
+def make_param_eval():
+    """Factory for ParameterEvaluation results (a 0.0 score with 0.0 confidence is a failed node)."""
+    from models.evaluation_models import ParameterEvaluation
+
+    def make(param_id: str = "story_engine", raw_score: float = 7.0, confidence: float = 0.8) -> ParameterEvaluation:
+        return ParameterEvaluation(
+            parameter_id=param_id,
+            parameter_name=param_id.replace("_", " ").title(),
+            raw_score=raw_score,
+            normalized_score=raw_score / 10,
+            confidence=confidence,
+            reasoning="test",
+        )
+
+    return make
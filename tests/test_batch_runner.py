@@ -0,0 +1,31 @@
+# backend/tests/test_batch_runner.py
+
+import json
+
+from services.batch_runner import ERROR, OK, completed_lines
+
+
+def write_output(path, *records, tail=""):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records) + tail, encoding="utf-8")
+
+
+def test_missing_output_has_no_completed_lines(tmp_path):
+    assert completed_lines(str(tmp_path / "out.jsonl")) == set()
+
+
+def test_ok_and_error_records_count_as_done(tmp_path):
+    out = tmp_path / "out.jsonl"
+    write_output(out, {"line": 1, "status": OK}, {"line": 3, "status": ERROR})
+    assert completed_lines(str(out)) == {1, 3}
+
+
+def test_retry_failed_leaves_error_lines_to_run_again(tmp_path):
+    out = tmp_path / "out.jsonl"
+    write_output(out, {"line": 1, "status": OK}, {"line": 3, "status": ERROR})
+    assert completed_lines(str(out), retry_failed=True) == {1}
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    out = tmp_path / "out.jsonl"
+    write_output(out, {"line": 1, "status": OK}, tail='{"line": 2, "sta')
+    assert completed_lines(str(out)) == {1}
@@ -0,0 +1,132 @@
+# backend/tests/test_call_policy.py
+
+import asyncio
+import time
+
+import pytest
+
+from services.call_policy import CallPolicy, DeadlineExceeded, deadline_scope
+
+
+class FakeCall:
+    """Provider call stand-in: each attempt takes the next (delay, outcome) step."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.timeouts = []
+        self.cancelled = 0
+
+    async def __call__(self, timeout):
+        self.timeouts.append(timeout)
+        delay, outcome = self.steps.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    @property
+    def attempts(self):
+        return len(self.timeouts)
+
+
+def policy(**overrides):
+    options = dict(max_retries=2, base_delay_s=0.0, timeout_s=5.0, hedge_enabled=True,
+                   hedge_min_samples=3, hedge_min_delay_s=0.02)
+    options.update(overrides)
+    return CallPolicy(**options)
+
+
+def warm(call_policy, key="", seconds=0.02, samples=3):
+    for _ in range(samples):
+        call_policy.latency(key).record(seconds)
+
+
+def test_retries_retryable_errors():
+    call_policy = policy()
+    call = FakeCall((0, TimeoutError("slow")), (0, "ok"))
+    assert asyncio.run(call_policy.arun(call)) == "ok"
+    assert call.attempts == 2
+    assert call_policy.retries == 1
+    assert call_policy.timeouts == 1
+
+
+def test_gives_up_after_max_retries():
+    call_policy = policy(max_retries=1)
+    call = FakeCall((0, TimeoutError("1")), (0, TimeoutError("2")), (0, "never"))
+    with pytest.raises(TimeoutError, match="2"):
+        asyncio.run(call_policy.arun(call))
+    assert call.attempts == 2
+
+
+def test_does_not_retry_other_errors():
+    call_policy = policy()
+    call = FakeCall((0, ValueError("bad request")), (0, "never"))
+    with pytest.raises(ValueError):
+        asyncio.run(call_policy.arun(call))
+    assert call.attempts == 1
+    assert call_policy.retries == 0
+
+
+def test_passes_the_call_timeout():
+    call = FakeCall((0, "ok"))
+    asyncio.run(policy(timeout_s=7.0).arun(call))
+    assert call.timeouts == [7.0]
+
+
+def test_expired_deadline_fails_without_calling():
+    call_policy = policy()
+    call = FakeCall((0, "never"))
+    with deadline_scope(time.time() - 1), pytest.raises(DeadlineExceeded):
+        asyncio.run(call_policy.arun(call))
+    assert call.attempts == 0
+    assert call_policy.deadline_exceeded == 1
+
+
+def test_no_hedge_until_the_latency_window_fills():
+    call_policy = policy()
+    warm(call_policy, samples=2)
+    call = FakeCall((0.1, "primary"), (0, "hedge"))
+    assert asyncio.run(call_policy.arun(call)) == "primary"
+    assert call_policy.hedges_fired == 0
+
+
+def test_hedge_wins_over_a_slow_primary():
+    call_policy = policy()
+    warm(call_policy)
+    call = FakeCall((5, "primary"), (0, "hedge"))
+    started = time.perf_counter()
+    assert asyncio.run(call_policy.arun(call)) == "hedge"
+    assert time.perf_counter() - started < 1
+    assert call_policy.hedges_fired == call_policy.hedges_won == 1
+    assert call.cancelled == 1  # the losing primary
+
+
+def test_primary_that_beats_the_hedge_delay_is_not_hedged():
+    call_policy = policy(hedge_min_delay_s=0.5)
+    warm(call_policy)
+    call = FakeCall((0, "primary"), (0, "hedge"))
+    assert asyncio.run(call_policy.arun(call)) == "primary"
+    assert call.attempts == 1
+
+
+def test_hedge_disabled_per_call():
+    call_policy = policy()
+    warm(call_policy)
+    call = FakeCall((0.1, "primary"), (0, "hedge"))
+    assert asyncio.run(call_policy.arun(call, hedge=False)) == "primary"
+    assert call_policy.hedges_fired == 0
+
+
+def test_latency_windows_are_per_key():
+    call_policy = policy()
+    warm(call_policy, key="small/momentum")
+    assert call_policy.hedge_delay("small/momentum") == 0.02
+    assert call_policy.hedge_delay("large/momentum") is None
+    call = FakeCall((0.1, "primary"), (0, "hedge"))
+    assert asyncio.run(call_policy.arun(call, latency_key="large/momentum")) == "primary"
+    assert call_policy.hedges_fired == 0
+    assert call_policy.latency("large/momentum").quantile(0.5) is not None
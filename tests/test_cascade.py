@@ -0,0 +1,71 @@
+# backend/tests/test_cascade.py
+
+import asyncio
+
+from config.llm_config import llm_config
+from graph.node_wrappers import with_cascade
+from services.cascade import escalation_reason
+
+
+def reason(param_eval, min_confidence=0.6, band_margin=0.5, **kwargs):
+    return escalation_reason(param_eval, min_confidence, band_margin, **kwargs)
+
+
+def test_confident_result_away_from_cutoffs_is_kept(make_param_eval):
+    assert reason(make_param_eval(raw_score=6.0, confidence=0.9)) is None
+
+
+def test_failed_result_escalates(make_param_eval):
+    assert reason(make_param_eval(raw_score=0.0, confidence=0.0)) == "failed"
+
+
+def test_low_confidence_escalates(make_param_eval):
+    assert reason(make_param_eval(raw_score=6.0, confidence=0.5)) == "low_confidence"
+
+
+def test_low_confidence_wins_over_near_cutoff(make_param_eval):
+    assert reason(make_param_eval(raw_score=7.0, confidence=0.5)) == "low_confidence"
+
+
+def test_score_near_a_verdict_cutoff_escalates(make_param_eval):
+    assert reason(make_param_eval(raw_score=7.2, confidence=0.9)) == "near_cutoff_7.0"
+    assert reason(make_param_eval(raw_score=8.1, confidence=0.9)) == "near_cutoff_8.5"
+    assert reason(make_param_eval(raw_score=4.6, confidence=0.9)) == "near_cutoff_5.0"
+
+
+def test_band_margin_is_exclusive(make_param_eval):
+    assert reason(make_param_eval(raw_score=7.5, confidence=0.9)) is None
+    assert reason(make_param_eval(raw_score=7.5, confidence=0.9), band_margin=0.6) == "near_cutoff_7.0"
+
+
+def test_custom_cutoffs(make_param_eval):
+    assert reason(make_param_eval(raw_score=6.0, confidence=0.9), cutoffs=(6.2,)) == "near_cutoff_6.2"
+    assert reason(make_param_eval(raw_score=7.0, confidence=0.9), cutoffs=()) is None
+
+
+def run_cascade(monkeypatch, make_param_eval, backend, confidence):
+    """Models the wrapped node ran on (None = the backend's default model)."""
+    from services.llm_service import _model_override
+
+    monkeypatch.setattr(llm_config, "llm_cascade_enabled", True)
+    monkeypatch.setattr(llm_config, "llm_backend", backend)
+    models = []
+
+    async def node(state):
+        models.append(_model_override.get())
+        return {"parameter_results": {"momentum": make_param_eval("momentum", 6.0, confidence)}}
+
+    asyncio.run(with_cascade(node, "momentum")({}))
+    return models
+
+
+def test_cascade_escalates_to_the_backend_model(monkeypatch, make_param_eval):
+    assert run_cascade(monkeypatch, make_param_eval, "openrouter", 0.9) == [llm_config.llm_cascade_small_model]
+    assert run_cascade(monkeypatch, make_param_eval, "openrouter", 0.5) == [
+        llm_config.llm_cascade_small_model,
+        llm_config.model,
+    ]
+
+
+def test_cascade_is_skipped_on_a_backend_without_a_small_model(monkeypatch, make_param_eval):
+    assert run_cascade(monkeypatch, make_param_eval, "ollama", 0.5) == [None]
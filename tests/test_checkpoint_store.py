@@ -0,0 +1,102 @@
+# backend/tests/test_checkpoint_store.py
+
+import asyncio
+import operator
+from typing import Annotated, Dict, List, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from models.evaluation_models import ParameterEvaluation
+from services.checkpoint_store import SQLiteCheckpointSaver
+
+
+class State(TypedDict, total=False):
+    content: str
+    calls: Annotated[List[str], operator.add]
+    parameter_results: Dict[str, ParameterEvaluation]
+
+
+def build(saver, make_param_eval, fail_second=None):
+    """first -> second; `second` raises while fail_second["on"] is set."""
+
+    def first(state: State) -> dict:
+        return {"calls": ["first"], "parameter_results": {"story_engine": make_param_eval(raw_score=8.0)}}
+
+    def second(state: State) -> dict:
+        if fail_second and fail_second["on"]:
+            raise RuntimeError("provider down")
+        return {"calls": ["second"]}
+
+    graph = StateGraph(State)
+    graph.add_node("first", first)
+    graph.add_node("second", second)
+    graph.add_edge(START, "first")
+    graph.add_edge("first", "second")
+    graph.add_edge("second", END)
+    return graph.compile(checkpointer=saver)
+
+
+@pytest.fixture
+def saver(tmp_path):
+    return SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"), compress_min_bytes=64)
+
+
+def config(thread_id="fanout:eval-1"):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_state_round_trips_through_sqlite(saver, make_param_eval):
+    content = "INT. HARBOUR - NIGHT\n" * 50  # above compress_min_bytes
+    out = build(saver, make_param_eval).invoke({"content": content}, config())
+    assert out["calls"] == ["first", "second"]
+    types = {row[0] for row in saver._conn.execute("SELECT type FROM checkpoint_blobs")}
+    assert any(type_.endswith("+zlib") for type_ in types)
+
+    # A fresh saver on the same file sees the same checkpoint
+    reopened = SQLiteCheckpointSaver(saver.path)
+    state = build(reopened, make_param_eval).get_state(config())
+    assert state.values["content"] == content
+    assert state.values["calls"] == ["first", "second"]
+    result = state.values["parameter_results"]["story_engine"]
+    assert isinstance(result, ParameterEvaluation) and result.raw_score == 8.0
+    assert len(list(reopened.list(config()))) >= 3
+
+
+def test_async_api_round_trip(saver, make_param_eval):
+    graph = build(saver, make_param_eval)
+    out = asyncio.run(graph.ainvoke({"content": "x"}, config()))
+    assert out["calls"] == ["first", "second"]
+    checkpoint = asyncio.run(saver.aget_tuple(config()))
+    assert checkpoint is not None
+    assert checkpoint.checkpoint["channel_values"]["calls"] == ["first", "second"]
+
+
+def test_interrupted_run_resumes_without_rerunning_finished_nodes(saver, make_param_eval):
+    fail = {"on": True}
+    graph = build(saver, make_param_eval, fail_second=fail)
+    with pytest.raises(RuntimeError):
+        graph.invoke({"content": "x"}, config())
+
+    fail["on"] = False
+    out = graph.invoke(None, config())
+    assert out["calls"] == ["first", "second"]  # "first" ran once
+
+
+def test_delete_thread_only_drops_that_thread(saver, make_param_eval):
+    graph = build(saver, make_param_eval)
+    graph.invoke({"content": "a"}, config("fanout:a"))
+    graph.invoke({"content": "b"}, config("fanout:b"))
+    assert saver.thread_count() == 2
+
+    asyncio.run(saver.adelete_thread("fanout:a"))
+    assert saver.get_tuple(config("fanout:a")) is None
+    assert saver.get_tuple(config("fanout:b")) is not None
+    assert saver.thread_count() == 1
+
+
+def test_expire_drops_stale_threads(saver, make_param_eval):
+    build(saver, make_param_eval).invoke({"content": "a"}, config())
+    assert saver.expire(3600) == 0
+    assert saver.expire(0) == 1
+    assert saver.thread_count() == 0
@@ -0,0 +1,114 @@
+# backend/tests/test_draft_diff.py
+
+from models.io_models import ScriptInput
+from prompts.parameter_specs import PARAMETER_SPECS
+from services.draft_diff import DraftDiff, REVISION_IMPACT, affected_parameters, diff_drafts
+
+SCENES = 12
+
+
+def scene(n, body=None):
+    body = body or (
+        f"Maren walks to window {n} and looks out over the dark harbour for a long while.\n\n"
+        "MAREN\nWe leave at dawn, all of us."
+    )
+    return f"INT. HARBOUR OFFICE {n} - DAY\n\n{body}\n"
+
+
+def draft(scenes=None, **fields):
+    values = {"title": "The Last Ferry", "logline": "A town must leave.", "genre": "Drama"}
+    values.update(fields)
+    scenes = scenes if scenes is not None else [scene(n) for n in range(SCENES)]
+    return ScriptInput(content="\n".join(scenes), **values)
+
+
+def edited(index, old, new):
+    scenes = [scene(n) for n in range(SCENES)]
+    scenes[index] = scenes[index].replace(old, new)
+    return draft(scenes)
+
+
+def test_identical_drafts_have_no_changes():
+    diff = diff_drafts(draft(), draft())
+    assert diff.unchanged
+    assert affected_parameters(diff) == []
+
+
+def test_whitespace_reflow_is_not_an_edit():
+    reflowed = [scene(n).replace("\n\n", "\n  \n\n").replace(" a long", "  a\tlong") for n in range(SCENES)]
+    assert diff_drafts(draft(), draft(reflowed)).unchanged
+
+
+def test_metadata_changes():
+    diff = diff_drafts(draft(), draft(title="Last Ferry Out", genre="drama"))
+    assert diff.title_changed and not diff.genre_changed  # genre compares case-insensitively
+    assert diff.kinds == {"title"}
+    assert affected_parameters(diff) == ["hook_recall", "audience_market"]
+
+
+def test_dialogue_edit_in_the_ending():
+    diff = diff_drafts(draft(), edited(SCENES - 1, "We leave at dawn", "We stay"))
+    assert diff.kinds == {"dialogue", "ending"}
+    assert (diff.scenes_changed, diff.paragraphs_changed) == (1, 1)
+    assert affected_parameters(diff) == [
+        param_id for param_id in PARAMETER_SPECS
+        if param_id in REVISION_IMPACT["dialogue"] + REVISION_IMPACT["ending"]
+    ]
+
+
+def test_action_edit_in_the_opening():
+    diff = diff_drafts(draft(), edited(0, "looks out", "stares out"))
+    assert diff.kinds == {"action", "opening"}
+    assert "hook_recall" in affected_parameters(diff)
+    assert "relationships" not in affected_parameters(diff)
+
+
+def test_added_scene_is_structural():
+    scenes = [scene(n) for n in range(SCENES)]
+    scenes.insert(6, scene(99, "The ferry horn sounds across the empty quay."))
+    diff = diff_drafts(draft(), draft(scenes))
+    assert diff.scenes_added == 1 and diff.scenes_removed == 0
+    assert {"structure", "middle"} <= diff.kinds
+
+
+def test_removed_final_scene_is_located_at_the_end():
+    diff = diff_drafts(draft(), draft([scene(n) for n in range(SCENES - 1)]))
+    assert diff.scenes_removed == 1
+    assert {"structure", "ending"} <= diff.kinds
+
+
+def test_removed_dialogue_is_classified_and_located():
+    scenes = [f"INT. KITCHEN {n} - DAY\n\nJohn pours the coffee.\n\nJOHN\nMorning.\n\nMARY\nGood.\n" for n in range(4)]
+
+    def without_reply(index):
+        revised = list(scenes)
+        revised[index] = revised[index].replace("\nMARY\nGood.\n", "")
+        return diff_drafts(draft(scenes), draft(revised))
+
+    assert without_reply(1).kinds == {"dialogue", "middle"}
+    assert {"relationships", "emotional_truth"} <= set(affected_parameters(without_reply(1)))
+    # Cut from the end of the first scene: still the opening, not the start of the next scene
+    assert without_reply(0).kinds == {"dialogue", "opening"}
+
+
+def test_edits_are_located_in_the_new_draft():
+    # Every scene cut down to a short one: the last one is still the ending
+    diff = diff_drafts(draft(), draft([scene(n, "Rain.") for n in range(SCENES)]))
+    assert {"opening", "middle", "ending"} <= diff.kinds
+
+
+def test_large_rewrites_rerun_everything():
+    diff = diff_drafts(draft(), draft([scene(n, f"Something else entirely happens here, take {n}.") for n in range(SCENES)]))
+    assert diff.changed_share >= 0.3
+    assert affected_parameters(diff) == list(PARAMETER_SPECS)
+
+
+def test_affected_parameters_follow_the_impact_table():
+    assert affected_parameters(DraftDiff(kinds={"setting"}, changed_share=0.01)) == ["world_specificity"]
+    assert affected_parameters(DraftDiff(kinds={"unknown"}, changed_share=0.01)) == []
+
+
+def test_as_dict_is_json_friendly():
+    data = diff_drafts(draft(), edited(5, "looks out", "stares out")).as_dict()
+    assert data["kinds"] == sorted(data["kinds"])
+    assert data["scenes_changed"] == 1
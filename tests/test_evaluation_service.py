@@ -0,0 +1,57 @@
+# backend/tests/test_evaluation_service.py
+
+from services.evaluation_service import etag_for, etag_matches, is_cacheable
+
+ETAG = etag_for("abc123")
+
+
+def test_etag_is_a_quoted_fingerprint():
+    assert ETAG == '"abc123"'
+
+
+def test_etag_matches_missing_header():
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+
+
+def test_etag_matches_exact_weak_and_wildcard():
+    assert etag_matches('"abc123"', ETAG)
+    assert etag_matches('W/"abc123"', ETAG)
+    assert etag_matches(" * ", ETAG)
+
+
+def test_etag_matches_any_tag_in_a_list():
+    assert etag_matches('"other", W/"abc123"', ETAG)
+    assert not etag_matches('"other", "abc"', ETAG)
+
+
+def test_etag_matches_requires_quotes():
+    assert not etag_matches("abc123", ETAG)
+
+
+def test_is_cacheable_complete_run(make_param_eval):
+    state = {"parameter_results": {"story_engine": make_param_eval()}, "parameter_errors": {}}
+    assert is_cacheable(state)
+
+
+def test_is_cacheable_rejects_empty_results():
+    assert not is_cacheable({})
+    assert not is_cacheable({"parameter_results": {}})
+
+
+def test_is_cacheable_rejects_partial_runs(make_param_eval):
+    state = {
+        "parameter_results": {"story_engine": make_param_eval()},
+        "parameter_errors": {"momentum": "pending"},
+    }
+    assert not is_cacheable(state)
+
+
+def test_is_cacheable_rejects_failed_parameters(make_param_eval):
+    state = {
+        "parameter_results": {
+            "story_engine": make_param_eval(),
+            "momentum": make_param_eval("momentum", raw_score=0.0, confidence=0.0),
+        }
+    }
+    assert not is_cacheable(state)
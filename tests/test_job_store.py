@@ -0,0 +1,82 @@
+# backend/tests/test_job_store.py
+
+import pytest
+
+from models.io_models import JobStatus, ScriptInput
+from services.job_store import JobStore
+
+LEASE_S = 60.0
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+def create(store):
+    return store.create(ScriptInput(title="The Last Ferry", logline="A town must leave.", genre="Drama", content="..."))
+
+
+def age(store, job_id, seconds):
+    """Move a job's heartbeat and last update `seconds` into the past."""
+    store._conn.execute(
+        "UPDATE jobs SET heartbeat = heartbeat - ?, updated_at = updated_at - ? WHERE id = ?",
+        (seconds, seconds, job_id),
+    )
+    store._conn.commit()
+
+
+def heartbeat_of(store, job_id):
+    return store._conn.execute("SELECT heartbeat FROM jobs WHERE id = ?", (job_id,)).fetchone()["heartbeat"]
+
+
+def test_a_job_is_claimed_once(db_path):
+    first, second = JobStore(db_path, owner="a"), JobStore(db_path, owner="b")
+    job_id = create(first)
+    assert first.claim(job_id)
+    assert not second.claim(job_id)
+    assert not first.claim(job_id)
+    assert first.get(job_id)["status"] == JobStatus.RUNNING
+
+
+def test_requeue_stale_only_takes_running_jobs_with_expired_leases(db_path):
+    store = JobStore(db_path)
+    expired, alive, queued = create(store), create(store), create(store)
+    store.claim(expired)
+    store.claim(alive)
+    age(store, expired, LEASE_S + 1)
+    age(store, queued, LEASE_S + 1)
+
+    assert store.requeue_stale(LEASE_S) == [expired]
+    assert store.get(expired)["status"] == JobStatus.QUEUED
+    assert store.get(alive)["status"] == JobStatus.RUNNING
+    assert store.requeue_stale(LEASE_S) == []
+
+
+def test_heartbeat_renews_only_this_owners_running_jobs(db_path):
+    mine, theirs = JobStore(db_path, owner="a"), JobStore(db_path, owner="b")
+    own_job, other_job, finished = create(mine), create(mine), create(mine)
+    mine.claim(own_job)
+    theirs.claim(other_job)
+    mine.claim(finished)
+    mine.mark_failed(finished, "boom")
+    for job_id in (own_job, other_job, finished):
+        age(mine, job_id, LEASE_S + 1)
+    before = {job_id: heartbeat_of(mine, job_id) for job_id in (other_job, finished)}
+
+    mine.heartbeat()
+
+    assert mine.requeue_stale(LEASE_S) == [other_job]
+    assert heartbeat_of(mine, own_job) > before[other_job] + LEASE_S
+    assert heartbeat_of(mine, finished) == before[finished]
+
+
+def test_queued_job_ids_older_than_skips_recent_jobs(db_path):
+    store = JobStore(db_path)
+    old, recent, running = create(store), create(store), create(store)
+    store.claim(running)
+    age(store, old, LEASE_S + 1)
+    age(store, running, LEASE_S + 1)
+
+    assert store.queued_job_ids() == [old, recent]
+    assert store.queued_job_ids(older_than=LEASE_S) == [old]
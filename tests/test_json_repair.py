@@ -0,0 +1,96 @@
+# backend/tests/test_json_repair.py
+
+import json
+
+import pytest
+
+from services.json_repair import JsonObjectScanner, extract_json, repair_json
+
+
+def test_clean_json_needs_no_repair():
+    assert extract_json('{"raw_score": 7, "confidence": 0.9}') == ({"raw_score": 7, "confidence": 0.9}, [])
+
+
+def test_code_fence_is_unwrapped():
+    assert extract_json('```json\n{"raw_score": 7}\n```') == ({"raw_score": 7}, [])
+
+
+def test_prose_around_the_object():
+    value, repairs = extract_json('Here is my evaluation: {"raw_score": 7} Hope this helps!')
+    assert value == {"raw_score": 7}
+    assert repairs == ["prose_wrapped"]
+
+
+def test_braces_in_prose_before_the_answer():
+    value, repairs = extract_json('The score {which is high}: {"raw_score": 8, "confidence": 0.7}')
+    assert value == {"raw_score": 8, "confidence": 0.7}
+    assert "prose_wrapped" in repairs
+
+
+def test_python_dict_with_leading_dot_number():
+    value, repairs = extract_json("{'raw_score': 7, 'confidence': .9, 'evidence': ['a', 'b',], 'ok': True}")
+    assert value == {"raw_score": 7, "confidence": 0.9, "evidence": ["a", "b"], "ok": True}
+    assert set(repairs) == {"single_quotes", "number_format", "trailing_comma", "python_literal"}
+
+
+def test_truncated_answer_is_closed():
+    value, repairs = extract_json('{"raw_score": 6, "evidence": ["the opening')
+    assert value == {"raw_score": 6, "evidence": ["the opening"]}
+    assert "truncated" in repairs
+
+
+def test_no_object_raises():
+    with pytest.raises(ValueError, match="no JSON object"):
+        extract_json("I cannot evaluate this script.")
+
+
+@pytest.mark.parametrize("constant", ["NaN", "Infinity", "-Infinity"])
+def test_non_finite_constants_are_not_numbers(constant):
+    value, repairs = extract_json(f'{{"raw_score": {constant}, "confidence": 0.9}}')
+    assert value == {"raw_score": constant, "confidence": 0.9}
+    assert "unquoted_string" in repairs
+
+
+def test_unrepairable_object_raises():
+    with pytest.raises(ValueError, match="unrepairable"):
+        extract_json("{a b c}")
+
+
+@pytest.mark.parametrize(
+    "number, expected",
+    [(".9", "0.9"), ("-.5", "-0.5"), ("7.", "7.0"), ("07", "7"), ("1.5e3", "1.5e3"), ("-2.E1", "-2.0E1"), ("0", "0")],
+)
+def test_numbers_are_normalised(number, expected):
+    text, _ = repair_json(f"[{number}]")
+    assert text == f"[{expected}]"
+    json.loads(text)
+
+
+@pytest.mark.parametrize(
+    "fragment, expected, repair",
+    [
+        ('{"a": 1,}', {"a": 1}, "trailing_comma"),
+        ('{"a": 1 // note\n}', {"a": 1}, "comment"),
+        ('{"a": /* note */ 1}', {"a": 1}, "comment"),
+        ("{“a”: “b”}", {"a": "b"}, "smart_quotes"),
+        ('{a: 1}', {"a": 1}, "unquoted_key"),
+        ('{"a": high}', {"a": "high"}, "unquoted_string"),
+        ('{"a": None}', {"a": None}, "python_literal"),
+        ('{"a": "say "hi" now"}', {"a": 'say "hi" now'}, "inner_quote"),
+        ('{"a": "line\nbreak"}', {"a": "line\nbreak"}, "control_char"),
+        ('{"a": "\\q"}', {"a": "q"}, "invalid_escape"),
+        ('{"a": [1, {"b": ', {"a": [1, {"b": None}]}, "truncated"),
+    ],
+)
+def test_repair_json(fragment, expected, repair):
+    text, repairs = repair_json(fragment)
+    assert json.loads(text) == expected
+    assert repair in repairs
+
+
+def test_scanner_across_chunks_ignores_braces_in_strings():
+    scanner = JsonObjectScanner()
+    assert not scanner.feed('Sure: {"a": "}{", ')
+    assert scanner.feed('"b": [1]} trailing')
+    assert json.loads(scanner.text) == {"a": "}{", "b": [1]}
+    assert scanner.outside_chars == len("Sure:") + len("trailing")
@@ -0,0 +1,36 @@
+# backend/tests/test_parameter_node.py
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+
+from graph.nodes.parameter_node import (
+    DEFAULT_CONFIDENCE,
+    failed_parameter,
+    is_failed_parameter,
+    normalize_parameter_result,
+)
+
+
+def test_score_and_confidence_are_clamped():
+    result = normalize_parameter_result({"score": 12, "confidence": "85%", "evidence": "one line"})
+    assert result["score"] == 10.0
+    assert result["confidence"] == 0.85
+    assert result["evidence"] == ["one line"]
+
+
+@pytest.mark.parametrize("score", [float("nan"), float("inf"), float("-inf"), "NaN"])
+def test_non_finite_score_is_rejected(score):
+    with pytest.raises(OutputParserException):
+        normalize_parameter_result({"score": score, "confidence": 0.8})
+
+
+@pytest.mark.parametrize("confidence", [float("nan"), float("inf")])
+def test_non_finite_confidence_falls_back_to_default(confidence):
+    result = normalize_parameter_result({"score": 6, "confidence": confidence})
+    assert result["confidence"] == DEFAULT_CONFIDENCE
+    assert result["score"] == 6.0
+
+
+def test_failure_marker(make_param_eval):
+    assert is_failed_parameter(failed_parameter("momentum", "boom"))
+    assert not is_failed_parameter(make_param_eval("momentum", raw_score=0.0, confidence=0.4))
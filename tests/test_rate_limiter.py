@@ -0,0 +1,84 @@
+# backend/tests/test_rate_limiter.py
+
+import pytest
+
+from services.rate_limiter import AdaptiveLimiter, LimiterPermit, TokenBucket
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def limiter(**kwargs):
+    kwargs.setdefault("initial_window", 16)
+    return AdaptiveLimiter(throttle_pause_s=0.0, **kwargs)
+
+
+def test_success_grows_the_window_additively():
+    lim = limiter(initial_window=4, max_window=5)
+    for _ in range(4):
+        lim._on_success()
+    assert lim.window == pytest.approx(5.0, abs=0.1)
+    for _ in range(20):
+        lim._on_success()
+    assert lim.window == 5.0
+    assert lim.stats()["succeeded"] == 24
+
+
+def test_a_burst_of_429s_halves_the_window_once():
+    lim = limiter(decrease_cooldown_s=60.0)
+    for _ in range(5):
+        lim._on_error(ProviderError(429))
+    assert lim.window == 8.0
+    assert lim.stats()["throttled"] == 5
+
+
+def test_server_errors_decrease_after_the_cooldown():
+    lim = limiter(decrease_cooldown_s=0.0)
+    lim._on_error(ProviderError(503))
+    lim._on_error(ProviderError(500))
+    assert lim.window == 4.0
+    assert lim.stats()["server_errors"] == 2
+
+
+def test_window_never_drops_below_min_window():
+    lim = limiter(initial_window=4, min_window=3, decrease_cooldown_s=0.0)
+    for _ in range(3):
+        lim._on_error(ProviderError(429))
+    assert lim.window == 3.0
+
+
+@pytest.mark.parametrize("exc", [ProviderError(400), ProviderError(404), ValueError("bad json")])
+def test_client_errors_do_not_decrease(exc):
+    lim = limiter(decrease_cooldown_s=0.0)
+    lim._on_error(exc)
+    assert lim.window == 16.0
+    assert lim.stats()["throttled"] == lim.stats()["server_errors"] == 0
+
+
+def test_bucket_reserves_then_refills_over_time():
+    bucket = TokenBucket(per_minute=60)  # one per second
+    now = bucket._updated
+    assert bucket.reserve(60, now) == 0.0
+    assert bucket.reserve(2, now) == pytest.approx(2.0)  # balance -2: wait two seconds
+    bucket._refill(now + 5.0)
+    assert bucket.available == pytest.approx(3.0)
+    bucket._refill(now + 600.0)
+    assert bucket.available == 60.0  # capped at capacity
+
+
+def test_oversized_request_is_capped_at_capacity():
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(1000, bucket._updated) == 0.0
+    assert bucket.available == 0.0
+
+
+def test_token_budget_is_refunded_to_actual_usage():
+    lim = limiter(tokens_per_minute=1000)
+    lim._reserve(800)
+    permit = LimiterPermit(estimated_tokens=800, queue_wait_s=0.0)
+    permit.used_tokens = 300
+    lim._settle_tokens(permit)
+    assert lim.stats()["tokens_available"] == pytest.approx(700, abs=1)
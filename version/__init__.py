@@ -1,2 +1,2 @@
 """Version package - API version and build info."""
-from .metadata import API_VERSION, BUILD_INFO
+from .metadata import API_VERSION, PROMPT_VERSION, BUILD_INFO
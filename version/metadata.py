@@ -4,8 +4,13 @@ API version and build information.
 
 API_VERSION = "1.0.0"
 
+# Bump whenever prompts/rubrics change in a way that should invalidate
+# memoized evaluations (it is part of the evaluation fingerprint).
+PROMPT_VERSION = "2"  # 2: goal_stakes scored with the shared rubric prompts
+
 BUILD_INFO = {
     "version": API_VERSION,
+    "prompt_version": PROMPT_VERSION,
     "name": "Scriptwise Multiagent Backend",
     "description": "Script evaluation API using LangGraph multi-agent system",
     "author": "Scriptwise Team",